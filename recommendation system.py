@@ -26,16 +26,18 @@
 
 import numpy as np # linear algebra
 import pandas as pd # data processing, CSV file I/O (e.g. pd.read_csv)
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import tensorflow as tf
-from sklearn.model_selection import train_test_split
 
-# Import visualization libraries
-import matplotlib.pyplot as plt
-import seaborn as sns
-import re
-from collections import Counter
+# Komponen sistem rekomendasi dari paket recommender. TensorFlow, scikit-learn,
+# matplotlib dan seaborn hanya di-import oleh fungsi yang membutuhkannya.
+from recommender import eda
+from recommender.data import DATA_DIR, load_movies, load_ratings
+from recommender.features import build_tfidf
+from recommender.index import build_movie_id_to_row, build_user_rating_index
+from recommender.similarity import build_topk_similarity, normalize_features
+from recommender.content import (recommend_content, recommend_for_user, recommend_for_users,
+                                 evaluate_content_predictions)
+from recommender.collaborative import recommend_movies, extract_embeddings, recommend_movies_fast
+from recommender.ann import IVFInnerProductIndex
 
 # Ignore warnings
 import warnings
@@ -59,10 +61,12 @@ for dirname, _, filenames in os.walk('/kaggle/input'):
 # Pada bagian ini, kita akan memuat dataset MovieLens yang berisi informasi film dan peringkat pengguna. Dataset MovieLens terdiri dari beberapa file, namun pada proyek ini kita akan fokus pada dua file utama: file film (movies.csv) dan file peringkat (ratings.csv).
 # 
 # Langkah pertama yang kita lakukan adalah mendefinisikan path atau jalur menuju file dataset. 
+# 
+# Fungsi `load_movies()` dan `load_ratings()` dari `recommender/data.py` hanya mem-parse CSV pada pemanggilan pertama. Setiap kolom kemudian disimpan sebagai file `.npy` di `data/.cache/` dengan tipe data ringkas: `userId` dan `movieId` sebagai int32, `rating` sebagai float32, dan `genres` sebagai kategori. Pemanggilan berikutnya langsung memuat array tersebut. Cache dibangun ulang secara otomatis jika ukuran, waktu modifikasi, dan hash SHA-256 file CSV berubah.
 
 # %%
-movie_path = '/kaggle/input/movie-lens-small-latest-dataset/movies.csv'
-rating_path = '/kaggle/input/movie-lens-small-latest-dataset/ratings.csv'
+movie_path = os.path.join(DATA_DIR, 'movies.csv')
+rating_path = os.path.join(DATA_DIR, 'ratings.csv')
 
 # %% [markdown]
 # ## Memuat Data Film
@@ -71,7 +75,7 @@ rating_path = '/kaggle/input/movie-lens-small-latest-dataset/ratings.csv'
 
 # %%
 # Memuat data film
-movies_df = pd.read_csv(movie_path)
+movies_df = load_movies(movie_path)
 print(f"Number of movies: {len(movies_df)}")
 movies_df.head()
 
@@ -89,7 +93,7 @@ movies_df.head()
 
 # %%
 # Memuat data rating
-ratings_df = pd.read_csv(rating_path)
+ratings_df = load_ratings(rating_path)
 print(f"Number of ratings: {len(ratings_df)}")
 ratings_df.head()
 
@@ -175,20 +179,20 @@ print(ratings_df.isna().sum())
 # Pada bagian ini, kita akan melakukan serangkaian langkah untuk mempersiapkan data sebelum masuk ke tahap analisis mendalam dan pemodelan. Tahap preprocessing data sangat penting dalam proyek machine learning untuk memastikan data bersih, terstruktur, dan siap digunakan.
 
 # %% [markdown]
-# ## 3.1 Penggabungan Data
+# ## 3.1 Penghubungan Data Rating dan Film
+# 
+# Untuk analisis yang lebih komprehensif, kita perlu menghubungkan informasi dari dataset film dengan dataset rating. Dengan begitu, kita dapat menganalisis hubungan antara karakteristik film (seperti genre dan tahun rilis) dengan penilaian yang diberikan pengguna.
 # 
-# Untuk analisis yang lebih komprehensif, kita perlu menggabungkan informasi dari dataset film dengan dataset rating. Proses penggabungan ini memungkinkan kita menganalisis hubungan antara karakteristik film (seperti genre dan tahun rilis) dengan penilaian yang diberikan pengguna.
+# Kita tidak membuat tabel gabungan hasil `pd.merge` antara rating dan film. Tabel seperti itu menyalin judul dan string genre ke setiap baris rating. Sebagai gantinya, setiap rating cukup menyimpan posisi baris filmnya di `movies_df` (`rating_rows`). Fitur film dihitung sekali per film, lalu diambil untuk setiap rating melalui indeks integer tersebut.
 
 # %%
-# Menggabungkan dataset film dan rating berdasarkan movieId
-merged_df = pd.merge(ratings_df, movies_df, on='movieId', how='left')
-print(f"Jumlah baris setelah penggabungan: {len(merged_df)}")
+# Menghubungkan rating dengan film dan menghitung fitur tingkat film (recommender/eda.py)
+movie_id_to_row = build_movie_id_to_row(movies_df)  # movieId -> posisi baris di movies_df
+movie_stats, rating_rows, genre_names, genre_matrix, genres_count = eda.prepare_eda_data(movies_df, ratings_df, movie_id_to_row)
+print(f"Jumlah rating yang terhubung ke film: {len(rating_rows)}")
 
-# Melihat hasil penggabungan
-merged_df.head()
-
-# %% [markdown]
-# Penggabungan data dilakukan dengan metode `left join` menggunakan kolom `movieId` sebagai kunci penghubung. Ini memastikan bahwa semua data rating tetap dipertahankan, dan informasi film ditambahkan pada setiap rating yang sesuai. Hasil penggabungan ini akan memudahkan analisis preferensi pengguna terhadap film berdasarkan karakteristiknya pada tahap Exploratory Data Analysis.
+# Melihat fitur tingkat film
+movie_stats.head()
 
 # %% [markdown]
 # ## 3.2 Feature Engineering
@@ -196,54 +200,24 @@ merged_df.head()
 # Feature engineering adalah proses menciptakan fitur baru dari data yang ada untuk meningkatkan performa model. Pada bagian ini, kita akan menambahkan beberapa fitur penting yang dapat memperkaya analisis dataset.
 
 # %%
-# Feature engineering
-# Langkah 1: Ekstrak tahun dari judul film
-def extract_year(title):
-    # Memastikan tidak ada spasi di akhir judul
-    title = title.rstrip()
-    # Mencari pola tahun dalam format (YYYY) menggunakan ekspresi reguler
-    pattern = r'\((\d{4})\)'
-    match = re.search(pattern, title)
-    if match:
-        return int(match.group(1))  # Mengkonversi string tahun ke integer
-    else:
-        return None  # Jika tidak ditemukan tahun
-
-# Menerapkan fungsi ekstraksi tahun ke kolom 'title'
-merged_df['year'] = merged_df['title'].apply(extract_year)
-movies_df['year'] = movies_df['title'].apply(extract_year)
-movie_with_year = merged_df.groupby('movieId')['year'].agg('count').reset_index()
-print(f"Tahun diekstraksi untuk {movie_with_year['year'].count()} film dari {len(movies_df)}")
-
-# Langkah 2: Menambahkan informasi rating rata-rata ke dataframe film
-# Mengelompokkan rating berdasarkan movieId dan menghitung rata-rata serta jumlah rating
-movie_ratings = merged_df.groupby('movieId')['rating'].agg(['mean', 'count']).reset_index()
-# Menggabungkan informasi rating dengan dataframe film berdasarkan movieId
-movies_with_ratings = pd.merge(merged_df, movie_ratings, on='movieId', how='left')
-
-# Langkah 3: Menghitung jumlah genre untuk setiap film
-# Genre dipisahkan oleh karakter '|', sehingga kita hitung jumlah genre dengan memisahkan string
-merged_df['genre_count'] = merged_df['genres'].apply(lambda x: len(x.split('|')))
-
-# Langkah 4: Membuat daftar dari semua genre yang ada dalam dataset
-# Ini berguna untuk analisis distribusi genre
-all_genres = []
-for genres in merged_df['genres']:
-    # Memisahkan string genre dan menambahkannya ke daftar all_genres
-    all_genres.extend(genres.split('|'))
-# Menghitung frekuensi kemunculan setiap genre
-genres_count = Counter(all_genres)
+# Feature engineering (lihat recommender/features.py)
+# Langkah 1: Ekstrak tahun dari judul film secara vektor dengan str.extract
+print(f"Tahun diekstraksi untuk {movie_stats['year'].notna().sum()} film dari {len(movies_df)}")
 
+# Langkah 2: Rating rata-rata dan jumlah rating per film tersedia di kolom movie_stats['mean'] dan movie_stats['count']
+# Langkah 3: Jumlah genre setiap film adalah jumlah baris matriks multi-hot genre (movie_stats['genre_count'])
+# Langkah 4: Frekuensi kemunculan setiap genre dihitung dari matriks genre yang dibobot jumlah rating
 print(f"Ditemukan {len(genres_count)} genre unik")
+print(f"Dimensi matriks genre: {genre_matrix.shape}")
 
 # %% [markdown]
 # Pada langkah feature engineering di atas, kita telah melakukan beberapa transformasi data penting:
 # 
 # 1. **Ekstraksi Tahun** - Mengekstrak tahun rilis film dari judul menggunakan ekspresi reguler untuk analisis tren dan pola berdasarkan waktu.
 # 
-# 2. **Penambahan Rating Rata-rata** - Menghitung rating rata-rata dan jumlah rating untuk setiap film, lalu menggabungkannya dengan dataset film. Ini membantu dalam mengidentifikasi film populer dan yang disukai pengguna.
+# 2. **Penambahan Rating Rata-rata** - Menghitung rating rata-rata dan jumlah rating untuk setiap film dengan `np.bincount` atas indeks baris film, lalu menyimpannya sebagai fitur tingkat film. Ini membantu dalam mengidentifikasi film populer dan yang disukai pengguna.
 # 
-# 3. **Perhitungan Jumlah Genre** - Menambahkan fitur yang menunjukkan berapa banyak genre yang dimiliki oleh setiap film. Film dengan genre lebih banyak mungkin memiliki karakteristik berbeda dengan film dengan genre tunggal.
+# 3. **Perhitungan Jumlah Genre** - Membangun matriks multi-hot film × genre, lalu menghitung berapa banyak genre yang dimiliki oleh setiap film. Film dengan genre lebih banyak mungkin memiliki karakteristik berbeda dengan film dengan genre tunggal.
 # 
 # 4. **Analisis Genre** - Membuat daftar semua genre yang ada dalam dataset dan menghitung frekuensinya untuk distribusi genre dalam koleksi film.
 # 
@@ -256,8 +230,7 @@ print(f"Ditemukan {len(genres_count)} genre unik")
 
 # %%
 # TF-IDF pada data genre film
-tfidf = TfidfVectorizer(token_pattern=r'[^|]+') # karena genre dipisahkan dengan karakter "|"
-tfidf_matrix = tfidf.fit_transform(movies_df['genres'])
+tfidf, tfidf_matrix = build_tfidf(movies_df['genres'])  # token_pattern=r'[^|]+' karena genre dipisahkan dengan karakter "|"
 
 # Melihat dimensi matriks TF-IDF
 print(f"Dimensi matriks TF-IDF: {tfidf_matrix.shape}")
@@ -271,6 +244,37 @@ print(f"Dimensi matriks TF-IDF: {tfidf_matrix.shape}")
 # 
 # Hasil matrix TF-IDF ini akan digunakan pada tahap pembuatan model untuk Content-Based Filtering.
 
+# %% [markdown]
+# ## 3.4 Indeks Rating per Pengguna
+# 
+# Banyak bagian proyek ini membutuhkan seluruh rating milik satu pengguna, misalnya fungsi rekomendasi, evaluasi, dan analisis preferensi genre. Menyaring `ratings_df` dengan `ratings_df['userId'] == user_id` berarti memindai sekitar 100 ribu baris setiap kali dipanggil. Oleh karena itu, kita membangun indeks rating per pengguna dalam format CSR (Compressed Sparse Row):
+# 
+# - Rating diurutkan berdasarkan userId, lalu indeks film (posisi baris di `movies_df`) dan nilai rating disimpan dalam dua array berurutan.
+# - Array `indptr` menyimpan posisi awal dan akhir rating setiap pengguna di dalam kedua array tersebut.
+# - Dictionary `user_pos` memetakan userId ke posisi pengguna, sehingga pencarian rating satu pengguna hanya membutuhkan O(1) ditambah jumlah rating pengguna tersebut.
+
+# %%
+# UserRatingIndex dan build_user_rating_index didefinisikan di recommender/index.py
+user_index = build_user_rating_index(ratings_df, movie_id_to_row)
+print(f"Indeks rating dibangun untuk {len(user_index)} pengguna dan {len(user_index.items)} rating")
+
+# %% [markdown]
+# Untuk data rating yang lebih besar dari memori (misalnya MovieLens 25M atau log rating sendiri), `ingest_ratings()` dari `recommender/ingest.py` membaca `ratings.csv` per chunk. Setiap chunk langsung diperbarui ke:
+# 
+# - Pemetaan userId dan movieId ke indeks berurutan (urutan kemunculan pertama, sama seperti `ratings_df['userId'].unique()`)
+# - Agregat per pengguna dan per film: jumlah rating, rata-rata, dan simpangan baku
+# - Matriks interaksi sparse pengguna × film bertipe float32
+# 
+# DataFrame rating utuh maupun hasil penggabungan dengan data film tidak pernah dibuat.
+
+# %%
+from recommender.ingest import ingest_ratings
+
+interactions = ingest_ratings(rating_path, chunksize=1_000_000)
+interaction_memory = interactions.matrix.data.nbytes + interactions.matrix.indices.nbytes + interactions.matrix.indptr.nbytes
+print(f"Matriks interaksi: {interactions.matrix.shape} dengan {interactions.matrix.nnz} rating ({interaction_memory / 1024**2:.1f} MB)")
+interactions.movie_stats().sort_values('count', ascending=False).head()
+
 # %% [markdown]
 # # 4. Exploratory Data Analysis (EDA)
 # 
@@ -318,34 +322,23 @@ ratings_df.describe()
 #     - Sebagian besar aktivitas rating dilakukan antara timestamp 1.019.124.000 hingga 1.435.994.000, yang jika dikonversi, menunjukkan aktivitas pengguna yang dominan terjadi dalam kurun waktu antara tahun 2002 hingga 2015.
 
 # %%
-# Statistik deskriptif untuk dataset gabungan
-print("Statistik deskriptif untuk dataset gabungan:")
-merged_df.describe()
+# Statistik deskriptif untuk fitur tingkat film
+print("Statistik deskriptif untuk fitur tingkat film:")
+movie_stats.describe()
 
 # %% [markdown]
-# Berdasarkan hasil statistik deskriptif yang ditampilkan, terdapat beberapa informasi penting yang dapat diambil mengenai kolom-kolom numerik dalam dataset gabungan:
+# Berdasarkan hasil statistik deskriptif yang ditampilkan, terdapat beberapa informasi penting yang dapat diambil mengenai fitur tingkat film:
 # 
-# 1. **userId**
-#     - ID pengguna berkisar antara 1 hingga 610, dengan rata-rata user ID berada di angka 326.
-#     - Sebagian besar pengguna memiliki ID dalam rentang 177 hingga 477.
-# 
-# 2. **movieId**
-#     - ID film yang diberi rating oleh pengguna berkisar antara 1 hingga 193609, dengan rata-rata 19.435.
-#     - Sebagian besar film yang diberi rating berada dalam ID 1.199 hingga 8.122, menunjukkan bahwa film-film dengan ID lebih kecil cenderung lebih populer atau lebih banyak di-rating.
-# 
-# 3. **rating**
-#     - Rating yang diberikan pengguna berkisar antara 0.5 hingga 5, dengan rata-rata rating sebesar 3.50.
-#     - Sebagian besar rating berada pada rentang 3.0 hingga 4.0, menunjukkan adanya kecenderungan pengguna memberikan rating yang cukup positif terhadap film yang mereka tonton.
-# 
-# 4. **timestamp**
-#     - Nilai timestamp berkisar antara 828.124.600 hingga 1.537.799.579 (dalam format Unix time), dengan rata-rata sekitar 1.205.946.000.
-#     - Sebagian besar aktivitas rating dilakukan antara timestamp 1.019.124.000 hingga 1.435.994.000, yang jika dikonversi, menunjukkan aktivitas pengguna yang dominan terjadi dalam kurun waktu antara tahun 2002 hingga 2015.
-# 5. **year**
+# 1. **year**
 #     - Tahun rilis film berkisar antara 1902 hingga 2018 dengan rata-rata tahun rilis adalah 1994.
 #     - Sebagian besar film dirilis antara tahun 1988 hingga 2008.
-# 6. **genre_count**
+# 2. **genre_count**
 #     - Jumlah genre yang dimiliki tiap film berkisar antara 1 hingga 10, dengan rata-rata sebanyak 2,27 genre per film.
 #     - Sebagian besar film memiliki 1 hingga 3 genre (kuartil ke-1 hingga kuartil ke-3).
+# 3. **mean**
+#     - Rating rata-rata per film berkisar antara 0.5 hingga 5, dengan median 3.42. Sebanyak 18 film belum memiliki rating sehingga nilainya kosong.
+# 4. **count**
+#     - Jumlah rating per film sangat timpang: median hanya 3 rating, sedangkan film terpopuler menerima 329 rating.
 
 # %% [markdown]
 # ## 4.2 Analisis Univariat
@@ -354,52 +347,25 @@ merged_df.describe()
 
 # %%
 # Pengaturan gaya visualisasi
-plt.style.use('ggplot')
-sns.set(style="whitegrid")
+# Seluruh grafik EDA didefinisikan di recommender/eda.py; matplotlib dan seaborn baru di-import di sini
+eda.set_style()
 
 # %% [markdown]
 # Sebelum memulai visualisasi, kita mengatur gaya tampilan grafik menggunakan ggplot dan whitegrid dari seaborn. Pengaturan ini akan memberikan visualisasi yang konsisten dan lebih mudah dibaca di seluruh analisis kita.
 
 # %%
 # Distribusi nilai rating
-plt.figure(figsize=(10, 6))
-sns.histplot(ratings_df['rating'], bins=10, kde=True)
-plt.title('Distribusi Rating Film', fontsize=16)
-plt.xlabel('Rating', fontsize=12)
-plt.ylabel('Frekuensi', fontsize=12)
-plt.xticks([0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5])
-plt.show()
-
-# Statistik ringkasan untuk rating
-print("Statistik Ringkasan Peringkat:")
-print(ratings_df['rating'].describe())
+eda.plot_rating_distribution(ratings_df)
 
 # %% [markdown]
 # Grafik distribusi rating film menunjukkan bahwa mayoritas pengguna cenderung memberikan rating positif, dengan puncak tertinggi pada rating 4.0 dengan frekuensi melebihi 40.000 pengguna, diikuti oleh 3.0 dan 5.0, sementara rating rendah seperti 0.5 hingga 2.0 jarang diberikan. Rata-rata rating berada di angka 3.5, dan sebagian besar rating berkisar antara 3.0 hingga 4.0, menunjukkan adanya kecenderungan pengguna untuk menilai film secara positif. Pola distribusi ini yang condong ke kanan mencerminkan bias positif dalam perilaku rating pengguna.
 
 # %%
 # Distribusi genre film
-plt.figure(figsize=(12, 8))
-top_genres = dict(sorted(genres_count.items(), key=lambda x: x[1], reverse=True))
-genre_df = pd.DataFrame({'genre': list(top_genres.keys()), 'count': list(top_genres.values())})
+genre_df = eda.genre_frequency_table(genres_count)
 
-# Visualisasi 15 genre teratas
-sns.barplot(x='count', y='genre', data=genre_df.head(15), palette='viridis')
-plt.title('15 Genre Film Teratas', fontsize=16)
-plt.xlabel('Jumlah Film', fontsize=12)
-plt.ylabel('Genre', fontsize=12)
-plt.tight_layout()
-plt.show()
-
-# Distribusi jumlah genre per film
-movie_with_genre_count = merged_df.groupby('movieId')['genre_count'].agg('first').reset_index()
-
-plt.figure(figsize=(10, 6))
-sns.countplot(x='genre_count', data=movie_with_genre_count, palette='viridis')
-plt.title('Jumlah Genre per Film', fontsize=16)
-plt.xlabel('Jumlah Genre', fontsize=12)
-plt.ylabel('Jumlah Film', fontsize=12)
-plt.show()
+# Visualisasi 15 genre teratas dan distribusi jumlah genre per film
+eda.plot_genre_distribution(genre_df, movie_stats)
 
 # %% [markdown]
 # Visualisasi di atas memberikan dua wawasan penting tentang genre film:
@@ -410,52 +376,14 @@ plt.show()
 
 # %%
 # Distribusi tahun rilis film
-plt.figure(figsize=(14, 6))
-sns.histplot(merged_df['year'].dropna(), bins=30, kde=True)
-plt.title('Distribusi Tahun Rilis Film', fontsize=16)
-plt.xlabel('Tahun Rilis', fontsize=12)
-plt.ylabel('Jumlah Film', fontsize=12)
-plt.xticks(rotation=45)
-plt.grid(True, alpha=0.3)
-plt.show()
-
-# Statistik ringkasan untuk tahun rilis
-
-
-print("Statistik Ringkasan Tahun Rilis:")
-print(movie_with_year.describe())
+eda.plot_release_year_distribution(movie_stats)
 
 # %% [markdown]
 # Grafik distribusi menggambarkan jumlah film yang dirilis per tahun dari awal abad ke-20 hingga sekitar tahun 2020. Terlihat bahwa produksi film mengalami peningkatan yang sangat signifikan sejak tahun 1970-an, dengan lonjakan tajam setelah tahun 1980 hingga mencapai puncaknya sekitar awal tahun 2000-an, di mana jumlah film per tahun melebihi 300 judul. Sebelum era 1970, jumlah film yang dirilis setiap tahun relatif rendah dan stabil, sebagian besar di bawah 50 film per tahun. Penurunan tajam setelah tahun 2015 kemungkinan disebabkan oleh data yang belum lengkap untuk tahun-tahun tersebut, bukan karena penurunan produksi aktual. Grafik ini menunjukkan tren pertumbuhan industri perfilman yang pesat, terutama dalam beberapa dekade terakhir.
 
 # %%
-# Distribusi aktivitas pengguna
-user_activity = ratings_df.groupby('userId').size().reset_index(name='ratings_count')
-
-plt.figure(figsize=(12, 6))
-sns.histplot(user_activity['ratings_count'], bins=30, kde=True)
-plt.title('Distribusi Peringkat per Pengguna', fontsize=16)
-plt.xlabel('Jumlah Rating', fontsize=12)
-plt.ylabel('Jumlah User', fontsize=12)
-plt.grid(True, alpha=0.3)
-plt.show()
-
-# Distribusi popularitas film
-movie_popularity = ratings_df.groupby('movieId').size().reset_index(name='ratings_count')
-
-plt.figure(figsize=(12, 6))
-sns.histplot(movie_popularity['ratings_count'], bins=30, kde=True)
-plt.title('Distribusi Rating per Film', fontsize=16)
-plt.xlabel('Jumlah Rating', fontsize=12)
-plt.ylabel('Jumlah Film', fontsize=12)
-plt.grid(True, alpha=0.3)
-plt.show()
-
-print("Ringkasan Aktivitas User:")
-print(user_activity['ratings_count'].describe())
-
-print("\nRingkasan Popularitas Film:")
-print(movie_popularity['ratings_count'].describe())
+# Distribusi aktivitas pengguna dan popularitas film
+eda.plot_activity_distribution(ratings_df)
 
 # %% [markdown]
 # Visualisasi di atas menampilkan dua aspek penting tentang interaksi pengguna-film dalam dataset kita:
@@ -471,29 +399,10 @@ print(movie_popularity['ratings_count'].describe())
 
 # %%
 # Rating rata-rata berdasarkan genre
-genre_ratings = []
-
-for genre in genres_count.keys():
-    # Mengambil semua film dengan genre tertentu
-    genre_movies = movies_df[movies_df['genres'].str.contains(genre)]['movieId']
-    # Menghitung rating rata-rata untuk film-film dalam genre tersebut
-    genre_mean_rating = ratings_df[ratings_df['movieId'].isin(genre_movies)]['rating'].mean()
-    # Menyimpan informasi genre, rating rata-rata, dan jumlah film
-    genre_ratings.append({'genre': genre, 'avg_rating': genre_mean_rating, 'movie_count': len(genre_movies)})
-
-# Membuat DataFrame dan mengurutkan berdasarkan rating rata-rata
-genre_ratings_df = pd.DataFrame(genre_ratings)
-genre_ratings_df = genre_ratings_df.sort_values(by='avg_rating', ascending=False)
+genre_ratings_df = eda.genre_rating_table(movie_stats, genre_names, genre_matrix, genres_count.keys())
 
 # Visualisasi rating rata-rata berdasarkan genre
-plt.figure(figsize=(12, 8))
-sns.barplot(x='avg_rating', y='genre', data=genre_ratings_df, palette='viridis')
-plt.title('Rating Rata-rata berdasarkan Genre', fontsize=16)
-plt.xlabel('Rating Rata-rata', fontsize=12)
-plt.ylabel('Genre', fontsize=12)
-plt.xlim(3, 4.5)  # Fokus pada rentang di mana sebagian besar nilai berada
-plt.grid(True, alpha=0.3)
-plt.show()
+eda.plot_genre_ratings(genre_ratings_df)
 
 # %% [markdown]
 # Visualisasi di atas menampilkan rating rata-rata untuk setiap genre film dalam dataset kita. Genre Film-Noir menempati posisi teratas dengan rata-rata rating tertinggi, disusul oleh War dan Documentary, yang semuanya memiliki nilai rata-rata di atas 4. 
@@ -503,20 +412,9 @@ plt.show()
 # Perhatikan bahwa skala pada sumbu x dibatasi untuk lebih fokus pada perbedaan rating antar genre, karena sebagian besar genre memiliki rating rata-rata antara 3 dan 4.5.
 
 # %%
-# Rating rata-rata berdasarkan tahun rilis
-# Menghitung rating rata-rata dan jumlah rating per tahun
-year_ratings = merged_df.groupby('year')['rating'].agg(['mean', 'count']).reset_index()
-# Memfilter tahun yang memiliki setidaknya 10 rating untuk hasil yang lebih andal
-year_ratings_filtered = year_ratings[year_ratings['count'] >= 10]
-
-# Visualisasi rating rata-rata berdasarkan tahun rilis
-plt.figure(figsize=(14, 6))
-sns.lineplot(x='year', y='mean', data=year_ratings_filtered)
-plt.title('Rating Rata-rata berdasarkan Tahun Rilis', fontsize=16)
-plt.xlabel('Tahun Rilis', fontsize=12)
-plt.ylabel('Rating Rata-rata', fontsize=12)
-plt.grid(True, alpha=0.3)
-plt.show()
+# Rating rata-rata berdasarkan tahun rilis (hanya tahun dengan setidaknya 10 rating)
+year_ratings = eda.year_rating_table(ratings_df, movie_stats, rating_rows, min_count=10)
+eda.plot_year_ratings(year_ratings)
 
 # %% [markdown]
 # Grafik menunjukkan rata-rata rating film berdasarkan tahun rilis dari 1920 hingga 2020. Terlihat bahwa film-film yang dirilis pada era sebelum 1980 umumnya memiliki rata-rata rating yang lebih tinggi, dengan beberapa tahun mencatat rating di atas 4.0. Namun, setelah tahun 1980, terjadi penurunan yang cukup konsisten dalam rata-rata rating, dengan nilai-nilai berkisar antara 3.3 hingga 3.6 pada dekade-dekade selanjutnya. Fluktuasi tajam di tahun-tahun awal kemungkinan disebabkan oleh jumlah film yang lebih sedikit, sehingga rating lebih mudah bervariasi. Secara keseluruhan, grafik ini mengindikasikan adanya kecenderungan penurunan kualitas persepsi terhadap film modern dibandingkan dengan film klasik menurut penilaian pengguna.
@@ -524,41 +422,15 @@ plt.show()
 # Perlu diperhatikan bahwa kita telah memfilter data untuk hanya menampilkan tahun dengan setidaknya 10 rating untuk memastikan hasil yang lebih andal dalam analisis rating rata-rata.
 
 # %%
-# Hubungan antara popularitas film dan rating rata-rata
-plt.figure(figsize=(10, 6))
-sns.scatterplot(x='count', y='mean', data=movies_with_ratings, alpha=0.5)
-plt.title('Popularitas Film vs Rating Rata-rata', fontsize=16)
-plt.xlabel('Jumlah Rating (Popularitas)', fontsize=12)
-plt.ylabel('Rating Rata-rata', fontsize=12)
-plt.xscale('log')  # Menggunakan skala logaritmik untuk visualisasi yang lebih baik
-plt.grid(True, alpha=0.3)
-plt.show()
-
-# Menghitung korelasi
-correlation = movies_with_ratings['count'].corr(movies_with_ratings['mean'])
-print(f"Korelasi antara jumlah rating dan rating rata-rata: {correlation:.4f}")
-
-# Hubungan antara aktivitas pengguna dan rating rata-rata yang diberikan
-user_avg_rating = ratings_df.groupby('userId').agg({'rating': ['mean', 'count']}).reset_index()
-user_avg_rating.columns = ['userId', 'avg_rating', 'num_ratings']
-
-plt.figure(figsize=(10, 6))
-sns.scatterplot(x='num_ratings', y='avg_rating', data=user_avg_rating, alpha=0.5)
-plt.title('Aktivitas Pengguna vs Rating Rata-rata yang Diberikan', fontsize=16)
-plt.xlabel('Jumlah Rating oleh Pengguna', fontsize=12)
-plt.ylabel('Rating Rata-rata yang Diberikan', fontsize=12)
-plt.xscale('log')  # Menggunakan skala logaritmik untuk visualisasi yang lebih baik
-plt.grid(True, alpha=0.3)
-plt.show()
-
-# Menghitung korelasi
-corr_user = user_avg_rating['num_ratings'].corr(user_avg_rating['avg_rating'])
-print(f"Korelasi antara aktivitas pengguna dan rating rata-rata yang diberikan: {corr_user:.4f}")
+# Hubungan antara popularitas film, aktivitas pengguna, dan rating rata-rata
+eda.plot_popularity_vs_rating(movie_stats, ratings_df)
 
 # %% [markdown]
 # ## 4.4 Analisis Multivariat
 # 
 # Analisis multivariat memungkinkan kita mengeksplorasi hubungan kompleks antara tiga atau lebih variabel sekaligus. Pada bagian ini, kita akan menganalisis tren genre sepanjang waktu, preferensi pengguna terhadap berbagai genre, dan pola kombinasi genre.
+# 
+# Seluruh agregasi per genre dihitung dari matriks insiden sparse film × genre (`genre_matrix`) yang dibangun pada tahap feature engineering. Setiap tabel diperoleh dari beberapa perkalian matriks sparse dan groupby, tanpa memindai `movies_df` dengan `str.contains` untuk setiap genre. Pencocokan genre juga dilakukan secara persis berdasarkan token genre, bukan berdasarkan pencocokan substring. Fungsi `eda.*_table` hanya mengembalikan tabel, sedangkan fungsi `eda.plot_*` menggambar grafiknya.
 
 # %% [markdown]
 # Visualisasi di atas menunjukkan dua hubungan penting dalam dataset kita:
@@ -573,132 +445,43 @@ print(f"Korelasi antara aktivitas pengguna dan rating rata-rata yang diberikan:
 # Tren genre sepanjang waktu
 # Fokus pada 5 genre teratas
 top_5_genres = list(genre_df.head(5)['genre'])
-genre_year_data = []
-
-# Untuk setiap genre teratas, ambil data film dan hitung jumlah per tahun
-for genre in top_5_genres:
-    genre_movies = movies_df[movies_df['genres'].str.contains(genre)]
-    year_count = genre_movies['year'].value_counts().reset_index()
-    year_count.columns = ['year', 'count']
-    year_count['genre'] = genre
-    genre_year_data.append(year_count)
-
-# Gabungkan semua data genre dan filter berdasarkan tahun
-genre_year_df = pd.concat(genre_year_data)
-# Filter untuk fokus pada tahun dengan data yang signifikan
-genre_year_df = genre_year_df[(genre_year_df['year'] >= 1980) & (genre_year_df['year'] <= 2000)]
+genre_year_df = eda.genre_year_table(movie_stats, genre_names, genre_matrix, top_5_genres, start_year=1980, end_year=2000)
 
 # Visualisasi tren genre sepanjang waktu
-plt.figure(figsize=(14, 8))
-sns.lineplot(x='year', y='count', hue='genre', data=genre_year_df)
-plt.title('Tren 5 Genre Teratas Sepanjang Waktu', fontsize=16)
-plt.xlabel('Tahun Rilis', fontsize=12)
-plt.ylabel('Jumlah Film', fontsize=12)
-plt.legend(title='Genre')
-plt.grid(True, alpha=0.3)
-plt.show()
+eda.plot_genre_trend(genre_year_df)
 
 # %% [markdown]
 # Visualisasi di atas menampilkan tren produksi film untuk lima genre paling populer sepanjang periode 1980-2000. Terlihat bahwa genre Drama dan Comedy mendominasi dalam jumlah produksi, dengan peningkatan signifikan sejak awal 1990-an, di mana Drama secara konsisten berada di posisi teratas menjelang akhir dekade. Genre Thriller, Action, dan Romance menunjukkan tren kenaikan yang lebih moderat namun tetap stabil selama periode tersebut. Secara keseluruhan, grafik ini mencerminkan pertumbuhan industri film dan perubahan preferensi genre dari waktu ke waktu, dengan peningkatan besar dalam jumlah produksi di semua genre menjelang akhir abad ke-20.
 
 # %%
 # Rating rata-rata genre teratas sepanjang waktu
-genre_rating_year_data = []
-
-# Untuk setiap genre teratas, analisis rating rata-rata per tahun
-for genre in top_5_genres:
-    genre_movies = movies_df[movies_df['genres'].str.contains(genre)][['movieId', 'year']]
-    merged = pd.merge(ratings_df, genre_movies, on='movieId')
-    year_rating = merged.groupby('year')['rating'].mean().reset_index()
-    year_rating['genre'] = genre
-    genre_rating_year_data.append(year_rating)
-
-# Gabungkan semua data rating genre dan filter berdasarkan tahun
-genre_rating_year_df = pd.concat(genre_rating_year_data)
-# Filter untuk fokus pada tahun dengan data yang signifikan
-genre_rating_year_df = genre_rating_year_df[(genre_rating_year_df['year'] >= 1980) & 
-                                          (genre_rating_year_df['year'] <= 2000)]
+genre_rating_year_df = eda.genre_rating_year_table(movie_stats, genre_names, genre_matrix, top_5_genres,
+                                                   start_year=1980, end_year=2000)
 
 # Visualisasi rating rata-rata genre sepanjang waktu
-plt.figure(figsize=(14, 8))
-sns.lineplot(x='year', y='rating', hue='genre', data=genre_rating_year_df)
-plt.title('Rating Rata-rata 5 Genre Teratas Sepanjang Waktu', fontsize=16)
-plt.xlabel('Tahun Rilis', fontsize=12)
-plt.ylabel('Rating Rata-rata', fontsize=12)
-plt.legend(title='Genre')
-plt.grid(True, alpha=0.3)
-plt.show()
+eda.plot_genre_rating_trend(genre_rating_year_df)
 
 # %% [markdown]
 # Grafik di atas menunjukkan tren rata-rata rating dari lima genre film terpopuler—Drama, Comedy, Thriller, Action, dan Romance—selama periode 1980 hingga 2000. Terlihat bahwa semua genre mengalami fluktuasi dari tahun ke tahun tanpa pola peningkatan atau penurunan yang konsisten. Genre Drama umumnya mempertahankan rating yang stabil dan cenderung lebih tinggi dibandingkan genre lain. Sebaliknya, Comedy dan Action cenderung memiliki rating yang lebih rendah dan lebih fluktuatif. Thriller menunjukkan beberapa lonjakan tajam, seperti pada awal 1990-an, sedangkan Romance relatif stabil di kisaran 3.3 hingga 3.6. Grafik ini mengindikasikan bahwa kualitas persepsi terhadap genre tertentu tidak selalu sejalan dengan jumlah produksinya, serta dipengaruhi oleh faktor-faktor tahunan yang dapat memengaruhi penerimaan penonton.
 
 # %%
 # Analisis preferensi genre berdasarkan pengguna
-# Membuat matriks pengguna-genre
 # Mengambil sampel pengguna untuk visualisasi yang lebih baik
 sample_users = np.random.choice(ratings_df['userId'].unique(), size=20, replace=False)
-sample_ratings = ratings_df[ratings_df['userId'].isin(sample_users)]
-
-# Untuk setiap pengguna, hitung rating rata-rata per genre
-user_genre_ratings = []
-
-for user_id in sample_users:
-    user_movie_ratings = sample_ratings[sample_ratings['userId'] == user_id]
-    for genre in top_5_genres:
-        genre_movies = movies_df[movies_df['genres'].str.contains(genre)]['movieId']
-        genre_user_ratings = user_movie_ratings[user_movie_ratings['movieId'].isin(genre_movies)]
-        if len(genre_user_ratings) > 0:
-            avg_rating = genre_user_ratings['rating'].mean()
-            user_genre_ratings.append({
-                'userId': user_id,
-                'genre': genre,
-                'avg_rating': avg_rating,
-                'num_ratings': len(genre_user_ratings)
-            })
-
-user_genre_df = pd.DataFrame(user_genre_ratings)
+user_genre_df = eda.user_genre_table(user_index, genre_names, genre_matrix, sample_users, top_5_genres)
 
 # Membuat heatmap preferensi pengguna-genre
-pivot_df = user_genre_df.pivot(index='userId', columns='genre', values='avg_rating')
-
-plt.figure(figsize=(12, 10))
-sns.heatmap(pivot_df, annot=True, cmap='viridis', fmt='.1f', cbar_kws={'label': 'Rating Rata-rata'})
-plt.title('Heatmap Preferensi Genre Pengguna (Sampel 20 Pengguna)', fontsize=16)
-plt.ylabel('ID Pengguna', fontsize=12)
-plt.xlabel('Genre', fontsize=12)
-plt.tight_layout()
-plt.show()
+eda.plot_user_genre_heatmap(user_genre_df)
 
 # %% [markdown]
 # Heatmap di atas menggambarkan preferensi genre film dari 20 pengguna berdasarkan rata-rata rating yang mereka berikan untuk lima genre: Action, Comedy, Drama, Romance, dan Thriller. Warna yang lebih terang menunjukkan rating yang lebih tinggi, sedangkan warna lebih gelap menunjukkan rating yang lebih rendah. Terlihat bahwa sebagian besar pengguna memberikan rating yang cukup tinggi pada genre Drama dan Romance, dengan beberapa pengguna seperti ID 459 dan 491 memberikan rating mendekati atau sama dengan 5 pada beberapa genre. Sebaliknya, pengguna seperti ID 217 dan 262 memberikan rating rendah di hampir semua genre, yang mengindikasikan kecenderungan preferensi rendah atau sikap lebih kritis. Heatmap ini menyoroti variasi selera antar pengguna serta genre-genre yang secara umum mendapat respons positif lebih merata di antara pengguna yang ditampilkan.
 
 # %%
-# Analisis kombinasi genre
-# Membuat daftar kombinasi genre yang paling umum
-genre_combos = movies_df['genres'].value_counts().reset_index()
-genre_combos.columns = ['genre_combo', 'count']  # Memberikan nama kolom yang sesuai
-genre_combos = genre_combos.head(10)  # 10 kombinasi teratas
-
-# Untuk setiap kombinasi, dapatkan rating rata-rata
-for i, row in genre_combos.iterrows():
-    combo = row['genre_combo']
-    combo_movies = movies_df[movies_df['genres'] == combo]['movieId']
-    combo_ratings = ratings_df[ratings_df['movieId'].isin(combo_movies)]['rating']
-    genre_combos.loc[i, 'avg_rating'] = combo_ratings.mean() if len(combo_ratings) > 0 else np.nan
-    genre_combos.loc[i, 'num_ratings'] = len(combo_ratings)
-
-# Urutkan berdasarkan rating rata-rata
-genre_combos = genre_combos.sort_values(by='avg_rating', ascending=False)
+# Analisis kombinasi genre: 10 kombinasi teratas beserta rating rata-ratanya
+genre_combos = eda.genre_combo_table(movies_df, movie_stats, top=10)
 
 # Visualisasi rating rata-rata berdasarkan kombinasi genre
-plt.figure(figsize=(14, 8))
-sns.barplot(x='avg_rating', y='genre_combo', data=genre_combos, palette='viridis')
-plt.title('Rating Rata-rata berdasarkan 10 Kombinasi Genre Teratas', fontsize=16)
-plt.xlabel('Rating Rata-rata', fontsize=12)
-plt.ylabel('Kombinasi Genre', fontsize=12)
-plt.grid(True, alpha=0.3)
-plt.tight_layout()
-plt.show()
+eda.plot_genre_combos(genre_combos)
 
 # %% [markdown]
 # Visualisasi di atas menampilkan rating rata-rata untuk 10 kombinasi genre film paling umum, diurutkan dari rating tertinggi ke terendah. Kombinasi genre Documentary menempati posisi tertinggi dengan rata-rata rating mendekati 4, diikuti oleh Drama tunggal serta kombinasi Drama|Romance yang juga mendapat penilaian sangat baik dari penonton. Kombinasi genre yang melibatkan Drama, seperti Comedy|Drama, Drama|Thriller, dan Comedy|Drama|Romance, secara konsisten menunjukkan rating tinggi, mencerminkan daya tarik naratif dan emosional dari genre ini. Sebaliknya, genre yang mengandung Horror, baik tunggal maupun dikombinasikan dengan Thriller, menempati posisi terbawah dengan rating rata-rata mendekati 3. Hal ini menunjukkan bahwa genre drama dan dokumenter lebih disukai secara umum, sementara genre horor cenderung mendapat respons yang lebih rendah dari penonton.
@@ -750,45 +533,31 @@ plt.show()
 # Filtering berbasis konten merekomendasikan film yang mirip dengan film yang disukai pengguna di masa lalu, berdasarkan fitur film seperti genre, sutradara, atau aktor. Dalam proyek ini, kita fokus pada kesamaan genre sebagai fitur utama.
 # 
 # Pada tahap sebelumnya, kita telah melakukan ekstraksi fitur menggunakan TF-IDF pada data genre film. Langkah selanjutnya dalam pembuatan model berbasis konten adalah menghitung similaritas antar film menggunakan hasil ekstraksi fitur tersebut. Untuk mempermudah proses rekomendasi, kita perlu menyimpan indeks film dalam bentuk Series yang memetakan judul film ke indeks DataFrame. Hal ini memudahkan pencarian film berdasarkan judul. Selain itu, hasil perhitungan similaritas disimpan dalam matriks yang menjadi dasar untuk merekomendasikan film dengan genre serupa.
+# 
+# Matriks similaritas penuh berukuran (jumlah film × jumlah film) membutuhkan sekitar 760 MB untuk 9.742 film dan tumbuh secara kuadratik seiring bertambahnya katalog. Oleh karena itu, similaritas dihitung per blok baris dan setiap film hanya menyimpan 100 tetangga terdekatnya dalam matriks sparse (CSR) bertipe float32. Dengan cara ini, matriks padat tidak pernah terbentuk utuh di memori dan ukuran indeks hanya beberapa MB.
+# 
+# Indeks top-k hanya dipakai untuk mencari film yang mirip dengan satu film (`recommend_content`). Untuk profil pengguna, rata-rata baris indeks top-k bukan rata-rata similaritas yang sebenarnya: TF-IDF genre memiliki ribuan pasangan dengan similaritas 1,0 yang seri, dan hanya 100 di antaranya yang tersimpan. Oleh karena itu, `recommend_for_user`, `recommend_for_users`, dan prediksi rating menghitung skor secara eksak dari fitur TF-IDF yang dinormalisasi L2 (`genre_features`): rata-rata cosine terhadap film yang disukai sama dengan `mean(Xn[liked]) @ Xn.T`, yang tetap berupa perkalian sparse tanpa matriks film × film yang padat.
 
 # %%
 # Menyimpan indeks film untuk pencarian
 movie_indices = pd.Series(movies_df.index, index=movies_df['title'])
 
-# Menghitung similaritas kosinus antara semua film
-cosine_sim = cosine_similarity(tfidf_matrix)
+# Membangun indeks similaritas top-k secara bertahap per blok baris (recommender/similarity.py)
+cosine_sim = build_topk_similarity(tfidf_matrix, k=100)
+sim_memory = cosine_sim.data.nbytes + cosine_sim.indices.nbytes + cosine_sim.indptr.nbytes
 print(f"Dimensi matriks similaritas: {cosine_sim.shape}")
+print(f"Jumlah pasangan tersimpan  : {cosine_sim.nnz} ({sim_memory / 1024**2:.1f} MB)")
+
+# Fitur TF-IDF ternormalisasi L2 untuk skor profil pengguna yang eksak
+genre_features = normalize_features(tfidf_matrix)
+
+# Array judul dan genre film agar hasil rekomendasi dapat diambil tanpa .iloc per baris
+movie_titles = movies_df['title'].to_numpy()
+movie_genres = movies_df['genres'].to_numpy()
 
-def recommend_content(title, movies, cosine_sim=cosine_sim, movie_indices=movie_indices):
-    # Ambil index film input
-    idx = movie_indices[title]
-
-    # Ambil info genre film input
-    input_genre = movies.iloc[idx]['genres']
-    
-    # Tampilkan informasi film input
-    print(f"\nFilm input  : {title}")
-    print(f"Genre input : {input_genre}\n")
-    
-    # Hitung kemiripan
-    sim_scores = list(enumerate(cosine_sim[idx]))
-    sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
-    sim_scores = sim_scores[1:11]  # 10 teratas (selain dirinya sendiri)
-
-    # Ambil informasi film rekomendasi
-    results = []
-    for i, score in sim_scores:
-        row = movies.iloc[i]
-        results.append({
-            "Title": row['title'],
-            "Genres": row['genres'],
-            "Similarity": round(score, 3)
-        })
-
-    # Tampilkan sebagai DataFrame
-    return pd.DataFrame(results)
-
-recommend_content("Toy Story (1995)", movies=movies_df, cosine_sim=cosine_sim, movie_indices=movie_indices)
+# recommend_content didefinisikan di recommender/content.py; seleksi top-N memakai recommender/ranking.py
+recommend_content("Toy Story (1995)", movies=movies_df, cosine_sim=cosine_sim, movie_indices=movie_indices,
+                  movie_titles=movie_titles, movie_genres=movie_genres)
 
 # %% [markdown]
 # Fungsi `recommend_content` di atas memungkinkan kita merekomendasikan film berdasarkan kesamaan genre dengan film yang sudah diketahui. Mari kita bahas langkah-langkah yang dilakukan fungsi ini:
@@ -797,81 +566,102 @@ recommend_content("Toy Story (1995)", movies=movies_df, cosine_sim=cosine_sim, m
 # 
 # 2. **Mengambil Informasi Genre**: Fungsi mengambil daftar genre dari film input untuk memberikan konteks tentang rekomendasi yang akan diberikan.
 # 
-# 3. **Menghitung Skor Kemiripan**: Menggunakan matriks similaritas kosinus yang telah dihitung sebelumnya, fungsi mengambil nilai similaritas antara film input dan semua film lain dalam dataset.
+# 3. **Menghitung Skor Kemiripan**: Menggunakan indeks similaritas top-k yang telah dihitung sebelumnya, fungsi mengambil daftar tetangga film input beserta nilai similaritasnya, tanpa menyertakan film input itu sendiri.
 # 
-# 4. **Mengurutkan Hasil**: Film-film diurutkan berdasarkan skor kemiripan dari tertinggi ke terendah untuk mengidentifikasi film yang genrenya paling mirip dengan film input.
+# 4. **Mengurutkan Hasil**: Fungsi `top_n_indices` memilih kandidat dengan skor kemiripan tertinggi menggunakan `np.argpartition`, lalu hanya kandidat terpilih yang diurutkan. Cara ini jauh lebih cepat dibanding mengurutkan seluruh skor dengan `sorted` di Python.
 # 
-# 5. **Memilih Rekomendasi Teratas**: Fungsi mengambil 10 film teratas (mengecualikan film input itu sendiri yang akan selalu memiliki similaritas 1).
+# 5. **Memilih Rekomendasi Teratas**: Fungsi mengambil 10 film teratas dari daftar tetangga tersebut.
 # 
-# 6. **Memformat Hasil**: Hasil dikembalikan dalam bentuk DataFrame yang menampilkan judul film, genre, dan skor kemiripan untuk mempermudah interpretasi.
+# 6. **Memformat Hasil**: Judul dan genre diambil langsung dari array `movie_titles` dan `movie_genres`, lalu hasil dikembalikan dalam bentuk DataFrame yang menampilkan judul film, genre, dan skor kemiripan untuk mempermudah interpretasi.
 # 
 # Dari hasil yang ditampilkan, kita dapat melihat film-film yang memiliki kesamaan genre dengan "Toy Story (1995)" dengan nilai kemiripan sempurna (similarity = 1.0). Ini adalah rekomendasi berbasis konten dalam bentuk yang paling sederhana.
 
+# %% [markdown]
+# Judul yang sama sering diminta berulang kali, sehingga daftar tetangga setiap film dapat disiapkan sekali. `NeighborTable` menyimpan 50 tetangga terurut per film dalam array int32 (indeks film) dan float32 (similaritas), sekitar 4 MB untuk seluruh katalog. Seri similaritas diurutkan berdasarkan indeks film, sama seperti `recommend_content` tanpa tabel, sehingga keduanya mengembalikan film yang sama. Tabel diisi sekaligus saat startup dengan `warm()` atau per film saat pertama kali diminta. Dengan tabel ini, `recommend_content` cukup mengambil `top_n` elemen pertama tanpa seleksi ulang.
+# 
+# Beberapa judul muncul lebih dari sekali di dataset (misalnya film dengan judul dan tahun yang sama). Untuk judul seperti itu, `movie_indices[title]` mengembalikan Series, sehingga `recommend_content` memakai `resolve_title` yang memilih kemunculan pertama.
+
 # %%
-def recommend_for_user(user_id, movies, ratings, cosine_sim, top_n=10):
-    # Gabungkan movies dan ratings
-    user_data = ratings[ratings['userId'] == user_id]
-    
-    # Ambil film dengan rating tinggi
-    liked_movies = user_data[user_data['rating'] >= 3.5]
-    
-    if liked_movies.empty:
-        print("User belum memiliki rating cukup untuk rekomendasi.")
-        return pd.DataFrame()
-    
-    # Ambil indeks movie yang disukai user
-    liked_movie_indices = movies[movies['movieId'].isin(liked_movies['movieId'])].index
-    
-    # Ambil genre dari film yang disukai user
-    liked_genres = movies.loc[liked_movie_indices, 'genres']
-    all_genres = '|'.join(liked_genres)
-    genre_list = all_genres.split('|')
-    
-    # Hitung genre yang paling sering muncul
-    from collections import Counter
-    genre_count = Counter(genre_list)
-    top_genres = genre_count.most_common(5)
-    
-    # Tampilkan preferensi genre user
-    print(f"\nUser {user_id} menyukai genre:")
-    for genre, count in top_genres:
-        print(f"- {genre} ({count} film)")
-    
-    # Hitung kemiripan rata-rata antara film yang disukai user dengan semua film
-    sim_scores = cosine_sim[liked_movie_indices]
-    sim_scores = sim_scores.mean(axis=0)
-    
-    # Urutkan skor similarity
-    sim_scores = list(enumerate(sim_scores))
-    sim_scores = sorted(sim_scores, key=lambda x: x[1], reverse=True)
-    
-    # Siapkan list rekomendasi
-    watched_movie_ids = set(user_data['movieId'])
-    recommendations = []
-    
-    for idx, score in sim_scores:
-        movie_id = movies.iloc[idx]['movieId']
-        if movie_id not in watched_movie_ids:
-            recommendations.append({
-                'Title': movies.iloc[idx]['title'],
-                'Genres': movies.iloc[idx]['genres'],
-                'Similarity': round(score, 3)
-            })
-        if len(recommendations) >= top_n:
-            break
-    
-    return pd.DataFrame(recommendations)
+from recommender.similarity import NeighborTable
 
+# Daftar tetangga seluruh film disiapkan sekali
+neighbor_table = NeighborTable(cosine_sim, k=50).warm()
+print(f"Ukuran tabel tetangga: {(neighbor_table.indices.nbytes + neighbor_table.scores.nbytes) / 1024**2:.1f} MB")
+
+# Judul duplikat di dataset
+duplicate_titles = movies_df.loc[movies_df['title'].duplicated(), 'title'].tolist()
+print(f"Judul duplikat: {duplicate_titles}")
+
+recommend_content(duplicate_titles[0], movies=movies_df, cosine_sim=cosine_sim, movie_indices=movie_indices,
+                  movie_titles=movie_titles, movie_genres=movie_genres, neighbors=neighbor_table)
+
+# %% [markdown]
+# TF-IDF genre hanya menghasilkan sekitar 20 fitur, sehingga banyak film memiliki similaritas 1.0 dengan film input (seperti pada hasil "Toy Story (1995)" di atas) dan urutannya tidak bermakna. `ContentFeatureBuilder` (`recommender/features.py`) menggabungkan tiga kelompok fitur:
+# 
+# 1. **Genre**: Setiap genre menjadi token `genre=...`.
+# 2. **Tag Pengguna**: Tag dari `tags.csv` menjadi token `tag=...` (huruf kecil), dengan bobot `log1p` dari jumlah pengguna yang memberi tag tersebut.
+# 3. **Tahun Rilis**: Tahun dari `extract_years` menjadi token tahun dan dekade, sehingga film dari era yang sama sedikit lebih mirip.
+# 
+# Token di-hash ke jumlah kolom yang tetap (2^18) seperti `HashingVectorizer`, sehingga memori fitur tidak bergantung pada jumlah tag unik dan tag baru cukup ditambahkan dengan `add_tags` tanpa membangun ulang kosakata. Setiap kelompok dinormalisasi L2 lalu diberi bobot. Matriks hasilnya tetap sparse dan dapat langsung diberikan ke `build_topk_similarity`.
+# 
+# Dengan `n_jobs`, blok baris dihitung oleh beberapa proses. Matriks fitur dibagikan ke worker melalui shared memory (tanpa disalin per tugas), dan setiap worker langsung mereduksi bloknya menjadi top-k sebelum mengembalikan hasil. Memori puncak setiap worker dibatasi oleh `block_size × jumlah film`, dan waktu pembangunan turun hampir sebanding dengan jumlah core. Worker dijalankan dengan metode *spawn* yang mengimpor ulang skrip utama, sehingga pemanggil dengan `n_jobs != 1` harus berada di dalam blok `if __name__ == "__main__":`. Karena itu, notebook ini memakai `n_jobs=1`.
+
+# %%
+from recommender.data import load_tags
+from recommender.features import ContentFeatureBuilder
+
+tags_df = load_tags(os.path.join(DATA_DIR, 'tags.csv'))
+content_builder = ContentFeatureBuilder(movies_df)
+content_builder.add_tags(tags_df['movieId'], tags_df['tag'])
+content_features = content_builder.matrix()
+print(f"Dimensi matriks fitur: {content_features.shape}, elemen tidak nol: {content_features.nnz}")
+
+# Indeks similaritas top-k dari fitur gabungan, melalui jalur yang sama dengan TF-IDF genre.
+# Notebook ini tidak memiliki guard `if __name__ == "__main__"`, sehingga dihitung serial (n_jobs=1);
+# jalur paralel dipakai dari skrip yang memiliki guard, misalnya recommender/benchmark.py
+cosine_sim_tags = build_topk_similarity(content_features, k=100, n_jobs=1)
+recommend_content("Toy Story (1995)", movies=movies_df, cosine_sim=cosine_sim_tags, movie_indices=movie_indices,
+                  movie_titles=movie_titles, movie_genres=movie_genres)
+
+# %%
+# recommend_for_user didefinisikan di recommender/content.py
 user_id = 255
-recommendations = recommend_for_user(user_id, movies_df, ratings_df, cosine_sim)
+recommendations = recommend_for_user(user_id, movies_df, user_index, genre_features,
+                                     movie_titles=movie_titles, movie_genres=movie_genres)
 recommendations
 
+# %% [markdown]
+# Fungsi `recommend_for_user` memproses satu pengguna dalam setiap pemanggilan. Untuk membuat rekomendasi bagi seluruh pengguna sekaligus (misalnya pada job terjadwal setiap malam), pendekatan per pengguna menjadi lambat karena data rating harus difilter ulang untuk setiap pengguna. Oleh karena itu, kita membuat fungsi `recommend_for_users` yang bekerja secara batch:
+# 
+# 1. **Matriks Pengguna × Film yang Disukai**: Dibangun satu kali sebagai matriks sparse, di mana setiap baris berisi bobot 1/jumlah film yang disukai pengguna tersebut (rating >= 3.5).
+# 
+# 2. **Skor Profil**: Perkalian matriks tersebut dengan fitur ternormalisasi menghasilkan profil setiap pengguna, lalu perkalian profil dengan fitur seluruh film menghasilkan rata-rata similaritas eksak film yang disukai terhadap semua film untuk banyak pengguna sekaligus.
+# 
+# 3. **Seleksi Top-N per Baris**: Film yang sudah ditonton diberi skor `-inf`, kemudian `np.argpartition` memilih N film terbaik untuk setiap pengguna.
+# 
+# Hasilnya berupa dua array berukuran (jumlah pengguna, top_n): ID film yang direkomendasikan dan skor similaritasnya. Posisi yang tidak terisi (misalnya pengguna tanpa film yang disukai) bernilai -1 dan NaN.
+
+# %%
+# recommend_for_users didefinisikan di recommender/content.py
+# Membuat rekomendasi untuk seluruh pengguna sekaligus
+all_user_ids = user_index.user_ids
+batch_movie_ids, batch_scores = recommend_for_users(all_user_ids, movies_df, user_index, genre_features)
+print(f"Dimensi hasil rekomendasi batch: {batch_movie_ids.shape}")
+
+# Menampilkan hasil batch untuk user 255
+user_row = np.flatnonzero(all_user_ids == 255)[0]
+user_recs = pd.DataFrame({'movieId': batch_movie_ids[user_row], 'Similarity': batch_scores[user_row]})
+user_recs = user_recs[user_recs['movieId'] >= 0].merge(movies_df[['movieId', 'title', 'genres']], on='movieId')
+user_recs
+
 # %% [markdown]
 # ## 5.2 Collaborative Filtering
 # 
 # Filtering kolaboratif merekomendasikan item berdasarkan preferensi pengguna lain yang memiliki selera serupa. Pendekatan ini tidak memerlukan informasi tentang item itu sendiri, melainkan mengandalkan pola rating dari banyak pengguna. Pada proyek ini, kita akan mengimplementasikan model deep learning untuk filtering kolaboratif.
 
 # %%
+from sklearn.model_selection import train_test_split
+
 # Mendapatkan user dan film unik
 user_ids = ratings_df['userId'].unique().tolist()
 movie_ids = ratings_df['movieId'].unique().tolist()
@@ -913,18 +703,8 @@ print(f"rating testing data size     : {y_test.shape}")
 # Hasil dari proses ini adalah empat array: `x_train` dan `x_test` yang berisi pasangan (user_index, movie_index), serta `y_train` dan `y_test` yang berisi rating yang dinormalisasi. Array-array ini siap digunakan untuk melatih dan mengevaluasi model deep learning.
 
 # %%
-# Membangun Model RecommenderNet
-class RecommenderNet(tf.keras.Model):
-    def __init__(self, num_users, num_movies, embedding_size=50, **kwargs):
-        super(RecommenderNet, self).__init__(**kwargs)
-        self.user_embedding = tf.keras.layers.Embedding(num_users, embedding_size)
-        self.movie_embedding = tf.keras.layers.Embedding(num_movies, embedding_size)
-        self.dot = tf.keras.layers.Dot(axes=1)
-        
-    def call(self, inputs):
-        user_vector = self.user_embedding(inputs[:, 0])
-        movie_vector = self.movie_embedding(inputs[:, 1])
-        return self.dot([user_vector, movie_vector])
+# Membangun Model RecommenderNet (recommender/net.py); TensorFlow baru di-import pada sel ini
+from recommender.net import RecommenderNet
 
 # %% [markdown]
 # Pada langkah ini, kita mendefinisikan arsitektur model `RecommenderNet` menggunakan TensorFlow Keras. Model ini mengimplementasikan teknik matrix factorization yang merupakan pendekatan dasar dalam filtering kolaboratif. Mari kita bahas komponen utama dari arsitektur ini:
@@ -944,12 +724,17 @@ class RecommenderNet(tf.keras.Model):
 num_users = len(user_ids)
 num_movies = len(movie_ids)
 
-model = RecommenderNet(num_users, num_movies)
-model.compile(optimizer='adam', loss='mae', metrics=['mse'])
+# Data latih dan uji ditulis sekali ke shard biner, lalu dibaca oleh pipeline tf.data (recommender/training.py)
+from recommender.training import write_shards, train_recommender, scaled_learning_rate
 
-history = model.fit(x=x_train, y=y_train, 
-                    validation_data=(x_test, y_test),
-                    batch_size=64, epochs=10, verbose=1)
+train_files = write_shards(x_train, y_train, 'artifacts/shards/train', n_shards=8)
+test_files = write_shards(x_test, y_test, 'artifacts/shards/test', n_shards=2)
+
+BATCH_SIZE = 1024
+print(f"Learning rate untuk batch {BATCH_SIZE}: {scaled_learning_rate(BATCH_SIZE):.5f}")
+
+model = RecommenderNet(num_users, num_movies)
+history = train_recommender(model, train_files, test_files, batch_size=BATCH_SIZE, epochs=10, verbose=1)
 
 # %% [markdown]
 # Pada tahap ini, kita mengkompilasi dan melatih model RecommenderNet yang telah didefinisikan sebelumnya. Proses ini terdiri dari beberapa langkah penting:
@@ -959,14 +744,15 @@ history = model.fit(x=x_train, y=y_train,
 # 2. **Instansiasi Model**: Kita membuat instance dari kelas RecommenderNet dengan parameter jumlah pengguna dan film yang telah ditentukan. Ukuran embedding default adalah 50, yang berarti setiap pengguna dan film akan direpresentasikan sebagai vektor 50-dimensi.
 # 
 # 3. **Kompilasi Model**: Model dikompilasi dengan konfigurasi berikut:
-#    - **Optimizer**: Adam, sebuah optimizer yang efisien dan umum digunakan untuk deep learning yang mengadaptasi learning rate selama pelatihan.
+#    - **Optimizer**: Adam, sebuah optimizer yang efisien dan umum digunakan untuk deep learning yang mengadaptasi learning rate selama pelatihan. Learning rate dasar 0.001 untuk batch 64 diskalakan dengan akar rasio ukuran batch (`scaled_learning_rate`), sehingga batch yang lebih besar tetap konvergen.
 #    - **Loss Function**: MAE (Mean Absolute Error), untuk mengukur perbedaan absolut antara rating prediksi dan rating sebenarnya.
 #    - **Metrics**: MSE (Mean Squared Error), untuk mengukur error kuadrat rata-rata yang juga berguna sebagai metrik evaluasi.
 # 
 # 4. **Pelatihan Model**: Model dilatih dengan konfigurasi berikut:
-#    - **Data Pelatihan**: x_train (pasangan indeks pengguna-film) dan y_train (rating).
+#    - **Data Pelatihan**: x_train (pasangan indeks pengguna-film) dan y_train (rating), ditulis ke 8 shard biner berformat record tetap (int32 user, int32 movie, float32 rating).
+#    - **Pipeline Data**: shard dibaca paralel dengan `interleave`, record dikocok dengan buffer `shuffle`, di-batch, di-decode sekaligus per batch dengan `decode_raw`, lalu di-`prefetch` agar pembacaan data berjalan bersamaan dengan pelatihan.
 #    - **Data Validasi**: x_test dan y_test untuk memantau performa model pada data yang tidak digunakan dalam pelatihan.
-#    - **Batch Size**: 64, jumlah sampel yang diproses sebelum model memperbarui parameter.
+#    - **Batch Size**: 1024 (`BATCH_SIZE`), jumlah sampel yang diproses sebelum model memperbarui parameter. Dibandingkan batch 64, satu epoch membutuhkan jauh lebih sedikit langkah sehingga pelatihan sekitar 7 kali lebih cepat dengan MSE validasi yang hampir sama.
 #    - **Epochs**: 10, jumlah kali model akan melewati seluruh dataset pelatihan.
 #    - **Verbose**: 1, untuk menampilkan progress bar selama pelatihan.
 # 
@@ -975,30 +761,11 @@ history = model.fit(x=x_train, y=y_train,
 # Setelah pelatihan selesai, model telah mempelajari embedding vektor untuk setiap pengguna dan film yang merepresentasikan preferensi dan karakteristik mereka dalam ruang laten. Model ini sekarang dapat digunakan untuk memprediksi rating yang akan diberikan pengguna pada film yang belum mereka tonton.
 
 # %%
-# Membuat rekomendasi untuk pengguna
-def recommend_movies(user_id_original, model, movie_df, top_n=10):
-    user_idx = user_to_index[user_id_original]
-    
-    # Dapatkan semua indeks film
-    movie_indices = np.arange(len(movie_ids))
-    
-    # Buat kombinasi input antara pengguna dengan semua film
-    user_input = np.array([[user_idx, movie] for movie in movie_indices])
-    
-    # Prediksi rating
-    predicted_ratings = model.predict(user_input).flatten()
-    
-    # Urutkan berdasarkan rating
-    top_indices = predicted_ratings.argsort()[-top_n:][::-1]
-    top_movie_ids = [movie_ids[i] for i in top_indices]
-    
-    # Dapatkan judul film
-    recommended_titles = movie_df[movie_df['movieId'].isin(top_movie_ids)]['title'].tolist()
-    return recommended_titles
-
+# Membuat rekomendasi untuk pengguna (recommender/collaborative.py)
 # Uji dengan pengguna 255
 user_id = 255
-recommend_movies(user_id_original=user_id, model=model, movie_df=movies_df)
+recommend_movies(user_id_original=user_id, model=model, movie_df=movies_df,
+                 user_to_index=user_to_index, movie_ids=movie_ids)
 
 # %% [markdown]
 # Fungsi `recommend_movies` mengimplementasikan proses membuat rekomendasi film untuk pengguna menggunakan model filtering kolaboratif yang telah dilatih. Mari kita bahas langkah demi langkah proses yang dilakukan oleh fungsi ini:
@@ -1021,6 +788,187 @@ recommend_movies(user_id_original=user_id, model=model, movie_df=movies_df)
 # 
 # Hasil dari fungsi ini adalah daftar judul film yang direkomendasikan untuk pengguna berdasarkan pola rating yang dipelajari model dari semua pengguna dalam dataset. Rekomendasi ini memanfaatkan kekuatan filtering kolaboratif untuk menentukan film yang mungkin disukai pengguna meskipun film tersebut tidak memiliki genre yang serupa dengan film yang telah ditonton sebelumnya.
 
+# %% [markdown]
+# Untuk satu pengguna, sebagian besar waktu `recommend_movies` habis untuk membangun input dengan list comprehension dan menjalankan mekanisme `model.predict` Keras. Padahal, prediksi model hanyalah dot product antara embedding pengguna dan embedding film. Oleh karena itu, kita membuat jalur cepat `recommend_movies_fast`:
+# 
+# 1. **Ekstraksi Embedding**: Bobot `user_embedding` dan `movie_embedding` diambil satu kali sebagai array NumPy.
+# 
+# 2. **Skor Semua Film**: Skor seluruh film dihitung dengan satu perkalian matriks-vektor `movie_embeddings @ user_embeddings[user_idx]`, yang menghasilkan nilai yang sama dengan `model.predict`.
+# 
+# 3. **Mengecualikan Film yang Sudah Dirating**: Indeks rating pengguna (dalam ruang indeks model) digunakan untuk menandai film yang sudah ditonton.
+# 
+# 4. **Seleksi Top-N**: Film terbaik dipilih dengan `top_n_indices` (argpartition) dan judulnya diambil dari array yang sudah diurutkan sesuai indeks model, sehingga urutan rekomendasi tetap sesuai skor.
+
+# %%
+# extract_embeddings dan recommend_movies_fast didefinisikan di recommender/collaborative.py
+from recommender.index import UserRatingIndex
+
+# Disiapkan satu kali: embedding, judul film sesuai indeks model, dan indeks rating dalam ruang indeks model
+user_embeddings, movie_embeddings = extract_embeddings(model)
+cf_movie_titles = movies_df.set_index('movieId').loc[movie_ids, 'title'].to_numpy()
+cf_rated_index = UserRatingIndex(ratings_df['userId'].to_numpy(), ratings_df['movie'].to_numpy(),
+                                 ratings_df['rating'].to_numpy())
+
+# Uji dengan pengguna 255
+recommend_movies_fast(user_id, user_to_index, user_embeddings, movie_embeddings, cf_movie_titles,
+                      rated_index=cf_rated_index)
+
+# %% [markdown]
+# ### Alternating Least Squares (ALS)
+# 
+# Selain melatih embedding dengan gradient descent di TensorFlow, faktorisasi matriks yang sama dapat diselesaikan dengan ALS menggunakan NumPy/SciPy (`recommender/als.py`). Matriks rating pengguna × film disimpan dalam format CSR. Setiap iterasi menyelesaikan least squares ber-regularisasi untuk setiap pengguna dengan faktor film tetap, lalu sebaliknya untuk setiap film. Baris dibagi ke beberapa blok yang dikerjakan paralel oleh thread pool.
+# 
+# Bias pengguna dan bias film ikut dipelajari, lalu dilipat ke dalam embedding sebagai dua dimensi tambahan. Dengan begitu, `als_model.user_embeddings` dan `als_model.movie_embeddings` dapat langsung digunakan oleh `recommend_movies_fast`.
+
+# %%
+from recommender.als import rating_matrix, train_als
+
+train_matrix = rating_matrix(x_train, y_train, num_users, num_movies)
+als_model = train_als(train_matrix, factors=50, reg=0.05, iterations=15, biases=True, verbose=True)
+
+mse_als = np.mean((als_model.predict(x_test) * 5.0 - y_test * 5.0) ** 2)
+print("MSE ALS:", mse_als)
+
+recommend_movies_fast(user_id, user_to_index, als_model.user_embeddings, als_model.movie_embeddings, cf_movie_titles,
+                      rated_index=cf_rated_index)
+
+# %% [markdown]
+# ### Pembaruan Inkremental (Fold-in)
+# 
+# Rating baru tidak harus menunggu pelatihan ulang. `OnlineCollaborative` (`recommender/online.py`) menghitung ulang embedding pengguna yang memberi rating dengan least squares terhadap embedding film yang tetap, yaitu satu langkah ALS untuk satu baris. Pengguna atau film yang belum pernah terlihat ditambahkan ke `user_to_index`/`movie_to_index` beserta baris embedding baru. Objek ini juga menyediakan `get(user_id)` seperti `UserRatingIndex`, sehingga dapat dipakai sebagai `rated_index` yang sudah mencakup rating terbaru.
+# 
+# Untuk content-based filtering, `ContentProfiles` menyimpan profil setiap pengguna sebagai total similaritas eksak film yang disukai terhadap seluruh film beserta jumlahnya. Rating baru cukup menambahkan atau mengurangi similaritas satu film tersebut, sedangkan skor tetap sama dengan rata-rata pada `recommend_for_user`.
+
+# %%
+from recommender.online import ContentProfiles, OnlineCollaborative
+
+online_cf = OnlineCollaborative(als_model, user_ids, movie_ids, rated_index=cf_rated_index)
+
+# Pengguna baru yang menyukai tiga film pertama dan tidak menyukai film keempat (rating dalam skala 0-1)
+new_user_id = max(user_ids) + 1
+for new_movie_id, new_rating in zip(movie_ids[:4], [1.0, 0.9, 0.9, 0.3]):
+    online_cf.add_rating(new_user_id, new_movie_id, new_rating)
+
+recommend_movies_fast(new_user_id, online_cf.user_to_index, online_cf.user_embeddings, online_cf.movie_embeddings,
+                      cf_movie_titles, rated_index=online_cf)
+
+# %%
+content_profiles = ContentProfiles(genre_features, user_index)
+
+# Pengguna 1 menyukai film baru; hanya tetangga film tersebut yang diperbarui pada profilnya
+content_profiles.add_rating(1, movie_id_to_row[movie_ids[0]], 5.0)
+profile_rows, profile_scores = content_profiles.recommend(1, top_n=10)
+pd.DataFrame({'Title': movie_titles[profile_rows], 'Genres': movie_genres[profile_rows],
+              'Similarity': np.round(profile_scores, 3)})
+
+# %% [markdown]
+# ### Cold Start
+# 
+# `recommend_movies` hanya dapat melayani pengguna yang ada di `user_to_index`, dan film baru belum memiliki embedding. Modul `recommender/coldstart.py` menyediakan jalur cadangan:
+# 
+# 1. **Pengguna Baru**: `PopularityRanking` menghitung *Bayesian average* dari rata-rata dan jumlah rating setiap film (`movie_stats`), sehingga film dengan sedikit rating ditarik ke rata-rata global. Daftar teratas disiapkan sekali, sehingga pengguna tanpa riwayat dilayani dalam O(1).
+# 
+# 2. **Film Baru**: `GenreSimilarity` mengubah string genre film baru menjadi vektor TF-IDF dan membandingkannya dengan katalog. Embedding awal film baru dapat diambil dari rata-rata embedding film bergenre paling mirip.
+# 
+# 3. **Campuran Bertahap**: `ColdStartRecommender` mencampur skor popularitas dan skor collaborative. Bobot collaborative naik dari 0 hingga 1 seiring bertambahnya jumlah rating pengguna (`full_history`).
+
+# %%
+from recommender.coldstart import ColdStartRecommender, GenreSimilarity, PopularityRanking
+
+popularity = PopularityRanking.from_stats(movie_stats)
+movie_title_by_id = movies_df.set_index('movieId')['title']
+
+# Pengguna yang belum pernah terlihat: langsung dari cache popularitas
+print(movie_title_by_id[popularity.recommend(10)].tolist())
+
+# Film baru yang belum ada di katalog: film paling mirip berdasarkan genre
+genre_similarity = GenreSimilarity(tfidf, tfidf_matrix, movies_df['movieId'])
+similar_ids, similar_scores = genre_similarity.similar('Animation|Children|Sci-Fi', top_n=5)
+print(movie_title_by_id[similar_ids].tolist())
+
+# Pengguna dengan sedikit riwayat: campuran popularitas dan collaborative
+cold_start = ColdStartRecommender(popularity, online_cf.user_to_index, online_cf.user_embeddings,
+                                  online_cf.movie_embeddings, online_cf.movie_ids, rated_index=online_cf)
+movie_title_by_id[cold_start.recommend(new_user_id, top_n=10)].tolist()
+
+# %% [markdown]
+# ### Rekomendasi Hybrid
+# 
+# Menyajikan `recommend_for_user` dan model collaborative secara terpisah membutuhkan dua kali penilaian seluruh film dan dua kali pengurutan. `HybridRecommender` (`recommender/hybrid.py`) menggabungkan keduanya dalam satu lintasan:
+# 
+# 1. **Kandidat Bersama**: Gabungan tetangga top-k dari film yang disukai pengguna. Skor content setiap kandidat adalah rata-rata similaritasnya terhadap film yang disukai menurut indeks top-k, sebagai pendekatan cepat untuk skor eksak `recommend_for_user`.
+# 
+# 2. **Skor Collaborative**: Dot product embedding pengguna hanya dengan embedding film kandidat.
+# 
+# 3. **Normalisasi dan Pembobotan**: Kedua skor dinormalisasi min-max ke [0, 1] lalu dijumlahkan dengan bobot `content_weight` dan `cf_weight` yang dapat diubah per permintaan.
+# 
+# 4. **Seleksi Top-N**: Satu kali `top_n_indices` atas skor gabungan.
+# 
+# Jika kandidat yang belum ditonton kurang dari top-N, misalnya karena semua rating pengguna di bawah 3,5, kandidat ditambah dari top-N collaborative atau, untuk pengguna tanpa embedding, dari film terpopuler (`popular_rows`).
+
+# %%
+from recommender.hybrid import HybridRecommender
+
+popular_rows = movie_id_to_row.reindex(popularity.recommend(100)).dropna().to_numpy()
+hybrid = HybridRecommender(cosine_sim, user_index, movie_id_to_row, user_to_index, als_model.user_embeddings,
+                           als_model.movie_embeddings, movie_ids, content_weight=0.3, cf_weight=0.7,
+                           popular_rows=popular_rows)
+
+hybrid_rows, hybrid_scores = hybrid.recommend(user_id, top_n=10)
+pd.DataFrame({'Title': movie_titles[hybrid_rows], 'Genres': movie_genres[hybrid_rows],
+              'Score': np.round(hybrid_scores, 3)})
+
+# %%
+# Bobot dapat diubah per permintaan, misalnya hanya berdasarkan genre
+hybrid_rows, hybrid_scores = hybrid.recommend(user_id, top_n=10, content_weight=1.0, cf_weight=0.0)
+pd.DataFrame({'Title': movie_titles[hybrid_rows], 'Genres': movie_genres[hybrid_rows],
+              'Score': np.round(hybrid_scores, 3)})
+
+# %% [markdown]
+# ### Item-Based Collaborative Filtering (Item-kNN)
+# 
+# Selain embedding, filtering kolaboratif juga dapat dilakukan langsung dari co-rating tanpa TensorFlow. `recommender/itemknn.py` membangun matriks pengguna × film dalam format CSR dari `user_index`, lalu menghitung similaritas antar film dengan perkalian matriks sparse per blok film:
+# 
+# 1. **Adjusted Cosine**: Rating dikurangi rata-rata pengguna sebelum dihitung cosine-nya, sehingga perbedaan kebiasaan memberi rating antar pengguna tidak memengaruhi similaritas. Alternatifnya, `method='pearson'` mengurangi rata-rata film dan hanya memakai pengguna yang merating kedua film.
+# 2. **Shrinkage**: Similaritas dikalikan n / (n + `shrinkage`), dengan n adalah jumlah pengguna yang merating kedua film, sehingga similaritas dari sedikit co-rating ditarik ke nol.
+# 3. **Top-k Tetangga**: Hanya 50 tetangga terdekat per film yang disimpan dalam matriks sparse.
+# 
+# Skor setiap film adalah jumlah similaritas × deviasi rating pengguna pada tetangganya yang sudah dirating. Fungsi `recommend_for_user_knn` memiliki antarmuka dan kolom keluaran yang sama dengan `recommend_for_user` (kolom `Similarity` berisi skor item-kNN), sehingga keduanya dapat saling menggantikan. Dengan `explain=True`, prediksi rating dan film yang paling berkontribusi pada setiap rekomendasi ikut ditampilkan sebagai penjelasan.
+
+# %%
+from recommender.itemknn import build_item_similarity, recommend_for_user_knn
+
+item_sim = build_item_similarity(user_index, len(movies_df), method='adjusted_cosine', k=50, shrinkage=100)
+print(f"Jumlah pasangan film tersimpan: {item_sim.nnz}")
+
+recommend_for_user_knn(user_id, movies_df, user_index, item_sim, movie_titles=movie_titles, movie_genres=movie_genres,
+                       explain=True)
+
+# %% [markdown]
+# Penilaian seluruh film dengan dot product masih cukup cepat untuk 9.742 film, tetapi biayanya tumbuh linear terhadap ukuran katalog. Untuk katalog yang jauh lebih besar, kita membuat indeks pencarian *approximate maximum inner product* (MIPS) berbasis IVF (Inverted File) yang ditulis dengan NumPy:
+# 
+# 1. **Transformasi MIPS ke Nearest Neighbor**: Setiap vektor film ditambah satu dimensi $\sqrt{M^2 - ||x||^2}$ (dengan $M$ adalah norma terbesar), sehingga film dengan inner product tertinggi terhadap vektor pengguna juga merupakan tetangga terdekat secara Euclidean.
+# 
+# 2. **Pengelompokan (Coarse Quantizer)**: Vektor film dikelompokkan dengan k-means menjadi sejumlah *list*. Setiap list menyimpan film-film yang berdekatan.
+# 
+# 3. **Pencarian**: Untuk sebuah vektor pengguna, hanya `n_probe` list terdekat yang diperiksa, lalu kandidat di dalamnya dinilai secara eksak dengan dot product. Parameter `n_probe` menjadi pengatur antara *recall* dan latensi: semakin besar nilainya, semakin akurat tetapi semakin lambat.
+
+# %%
+# IVFInnerProductIndex didefinisikan di recommender/ann.py
+from recommender.ranking import top_n_indices
+
+# Membangun indeks ANN atas embedding film
+ann_index = IVFInnerProductIndex(movie_embeddings)
+print(f"Jumlah list IVF: {ann_index.n_lists}")
+
+# Mengukur recall@10 terhadap pencarian eksak untuk beberapa nilai n_probe
+eval_users = np.random.default_rng(42).choice(len(user_ids), size=100, replace=False)
+exact_top = [set(top_n_indices(movie_embeddings @ user_embeddings[u], 10)) for u in eval_users]
+for n_probe in [1, 4, 16, 32]:
+    hits = [len(exact & set(ann_index.query(user_embeddings[u], k=10, n_probe=n_probe)[0]))
+            for u, exact in zip(eval_users, exact_top)]
+    print(f"n_probe={n_probe:2d} -> recall@10 = {np.mean(hits) / 10:.3f}")
+
 # %% [markdown]
 # ## 5.3 Perbandingan Pendekatan Rekomendasi
 # 
@@ -1051,43 +999,20 @@ recommend_movies(user_id_original=user_id, model=model, movie_df=movies_df)
 # Pertama, kita akan mengevaluasi model rekomendasi berbasis konten. Karena model ini menggunakan kemiripan genre untuk merekomendasikan film, kita perlu mengukur seberapa akurat model dapat memprediksi rating yang akan diberikan pengguna untuk film tertentu berdasarkan kemiripan dengan film yang sudah mereka nilai sebelumnya.
 
 # %%
-def predict_rating_content(user_id, target_movie_id, ratings, movies, cosine_sim):
-    # Get all movies rated by the user
-    user_ratings = ratings[ratings['userId'] == user_id]
-    
-    if user_ratings.empty:
-        return np.nan  # can't predict
-
-    # Get movie index
-    target_idx = movies[movies['movieId'] == target_movie_id].index[0]
-    
-    sim_scores = []
-    rating_scores = []
-    
-    for _, row in user_ratings.iterrows():
-        rated_idx = movies[movies['movieId'] == row['movieId']].index
-        if not rated_idx.empty:
-            sim = cosine_sim[target_idx, rated_idx[0]]
-            sim_scores.append(sim)
-            rating_scores.append(row['rating'] * sim)
-    
-    if np.sum(sim_scores) == 0:
-        return np.nan
-    return np.sum(rating_scores) / np.sum(sim_scores)
-
+# predict_rating_content dan evaluate_content_predictions didefinisikan di recommender/content.py
 from sklearn.metrics import mean_squared_error
 
 # Get test data
 test_data = ratings_df.sample(frac=0.2, random_state=42)
 
-y_true = []
-y_pred = []
+# ratings_df was normalized to 0-1 in section 5.2, so the rating index is rebuilt on that scale
+eval_user_index = build_user_rating_index(ratings_df, movie_id_to_row)
 
-for _, row in test_data.iterrows():
-    pred = predict_rating_content(row['userId'], row['movieId'], ratings_df, movies_df, cosine_sim)
-    if not np.isnan(pred):
-        y_true.append(row['rating'])
-        y_pred.append(pred)
+# Predict every test pair in one vectorized pass
+y_pred = evaluate_content_predictions(test_data, eval_user_index, movie_id_to_row, genre_features)
+valid = ~np.isnan(y_pred)
+y_true = test_data['rating'].to_numpy()[valid]
+y_pred = y_pred[valid]
 
 mse_content = mean_squared_error(y_true, y_pred)
 print("MSE Content-Based:", mse_content)
@@ -1103,14 +1028,15 @@ print("MSE Content-Based:", mse_content)
 # 
 # - **Pengambilan Data Uji**: Kita mengambil 20% data secara acak dari dataset rating untuk dijadikan data uji evaluasi model. Penggunaan parameter `random_state=42` memastikan bahwa hasil pengambilan sampel dapat direproduksi.
 # 
-# - **Proses Evaluasi**: Untuk setiap pasangan pengguna-film dalam data uji, kita:
-#   - Memprediksi rating menggunakan fungsi yang telah didefinisikan
-#   - Menambahkan nilai prediksi dan nilai aktual ke dalam list untuk dihitung errornya
+# - **Proses Evaluasi**: Memanggil `predict_rating_content()` untuk setiap baris data uji tetap lambat karena ada overhead Python untuk setiap baris. Oleh karena itu, fungsi `evaluate_content_predictions()` menghitung prediksi yang sama untuk seluruh data uji secara tervektorisasi:
+#   - Memetakan movieId ke indeks baris satu kali saja
+#   - Mengelompokkan data uji berdasarkan pengguna dan membangun matriks sparse rating pengguna × film
+#   - Menghitung Σ(rating × similaritas) dan Σ(similaritas) secara eksak: profil rating pengguna (matriks rating × fitur ternormalisasi) dikalikan dengan fitur film target, hanya untuk pasangan yang ada di data uji
 #   - Mengabaikan kasus di mana prediksi tidak dapat dilakukan (nilai NaN)
 # 
 # - **Penghitungan Error**: Terakhir, kita menghitung Mean Squared Error (MSE), yang mengukur rata-rata dari kuadrat selisih antara nilai prediksi dan nilai sebenarnya. Nilai MSE yang lebih rendah menunjukkan akurasi prediksi yang lebih baik.
 # 
-# Hasil evaluasi model Content-based Filtering mencapai 0,03.
+# Hasil evaluasi model Content-based Filtering mencapai sekitar 0,032 (pada skala rating 0-1).
 
 # %% [markdown]
 # ## 6.2 Evaluasi Model Filtering Kolaboratif
@@ -1139,6 +1065,50 @@ print("MSE Collaborative Filtering:", mse_collab)
 # 
 # Hasil MSE yang dicapai oleh Collaborative Filtering lebih tinggi dibandingkan Content-based Filtering, yaitu 1,39.
 
+# %% [markdown]
+# ### Evaluasi Ranking Top-N
+# 
+# MSE hanya mengukur ketepatan prediksi rating, padahal pengguna hanya melihat daftar teratas. Karena itu, keluaran batch setiap recommender berukuran (jumlah pengguna × k) juga dievaluasi terhadap interaksi held-out dengan fungsi `ranking_metrics` dari `recommender/evaluation.py`:
+# 
+# - **Precision@k dan Recall@k**: proporsi rekomendasi yang relevan dan proporsi item relevan yang berhasil direkomendasikan. Film di data uji dengan rating ≥ 3,5 dianggap relevan.
+# - **NDCG@k dan MAP@k**: memperhitungkan posisi hit di dalam daftar, sehingga hit di urutan atas bernilai lebih tinggi.
+# - **Coverage**: proporsi katalog yang pernah muncul di rekomendasi.
+# - **Novelty**: rata-rata $-\log_2$ popularitas film yang direkomendasikan; semakin tinggi, semakin jarang film tersebut ditonton.
+# 
+# Setiap pasangan (pengguna, film) dikodekan sebagai satu integer, sehingga pencocokan rekomendasi dengan item relevan untuk seluruh pengguna cukup berupa satu `searchsorted` pada array yang terurut. Parameter `n_jobs` membagi pengguna ke beberapa thread.
+
+# %%
+from recommender.evaluation import item_popularity, ranking_metrics, relevant_items
+
+# Rating dikembalikan ke skala 0,5-5 (kelipatan 0,5) agar ambang suka 3,5 tetap berlaku
+rating_scale_5 = (ratings_df['rating'] * 10).round() / 2
+train_ratings = ratings_df.drop(test_data.index).assign(rating=rating_scale_5)
+held_out = test_data.assign(rating=rating_scale_5.loc[test_data.index])
+
+# Indeks rating data latih, item relevan data uji, dan popularitas film di data latih
+train_index = build_user_rating_index(train_ratings, movie_id_to_row)
+relevant = relevant_items(held_out, threshold=3.5)
+train_popularity = item_popularity(UserRatingIndex(train_ratings['userId'].to_numpy(),
+                                                   train_ratings['movieId'].to_numpy(),
+                                                   train_ratings['rating'].to_numpy()))
+ranking_users = relevant.user_ids
+
+# Content-based: top-10 dari seluruh katalog untuk setiap pengguna
+content_recs, _ = recommend_for_users(ranking_users, movies_df, train_index, genre_features, top_n=10)
+
+# Baseline popularitas (rata-rata Bayesian dari data latih), tanpa film yang sudah ditonton
+train_stats = train_ratings.groupby('movieId')['rating'].agg(['mean', 'count']).reset_index()
+train_ranking = PopularityRanking.from_stats(train_stats)
+movie_id_array = movies_df['movieId'].to_numpy()
+popular_recs = np.stack([train_ranking.recommend(10, exclude_ids=movie_id_array[train_index.get(u)[0]].tolist())
+                         for u in ranking_users])
+
+ranking_results = pd.DataFrame({
+    name: ranking_metrics(recs, ranking_users, relevant, n_items=len(movies_df), popularity=train_popularity)
+    for name, recs in [('Content-Based', content_recs), ('Popularitas', popular_recs)]
+}).T
+ranking_results
+
 # %% [markdown]
 # ## 6.3 Perbandingan dan Kesimpulan
 # 
@@ -1155,7 +1125,7 @@ print("MSE Collaborative Filtering:", mse_collab)
 # - Meskipun sederhana, pendekatan ini mengabaikan opini kolektif dari pengguna lain.
 # 
 # **Performa:**
-# - MSE (Mean Squared Error): 0.03, menunjukkan prediksi rating yang sangat akurat secara numerik.
+# - MSE (Mean Squared Error): 0.032 pada skala rating 0-1, menunjukkan prediksi rating yang sangat akurat secara numerik.
 # 
 # 2. **Collaborative Filtering (CF)**
 # **Kelebihan:**
@@ -1186,4 +1156,52 @@ print("MSE Collaborative Filtering:", mse_collab)
 # 
 # Untuk pengembangan lebih lanjut, metriks-metriks ini dapat diimplementasikan untuk mendapatkan evaluasi yang lebih komprehensif terhadap kedua model rekomendasi.
 
+# %% [markdown]
+# # 7. Ekspor Artefak Model
+# 
+# Untuk melayani rekomendasi, menjalankan ulang seluruh notebook (membaca CSV, menghitung ulang TF-IDF dan indeks similaritas, serta melatih ulang RecommenderNet) membutuhkan waktu beberapa menit. Oleh karena itu, artefak model diekspor ke sebuah bundle berversi di disk menggunakan modul `recommender.bundle`:
+# 
+# - Pemetaan `user_to_index`/`movie_to_index`, tabel embedding, indeks similaritas top-k, fitur TF-IDF ternormalisasi (untuk skor profil pengguna yang eksak), indeks rating pengguna, serta judul dan genre film disimpan sebagai file `.npy`.
+# - File `manifest.json` mencatat versi, waktu pembuatan, serta bentuk dan tipe data setiap array. File `LATEST` menunjuk ke versi terbaru.
+# - `load_bundle` memuat array dengan `mmap_mode='r'`, sehingga proses pemuatan hanya membutuhkan waktu di bawah satu detik dan worker yang di-fork berbagi halaman memori yang sama. Modul ini hanya bergantung pada NumPy, tanpa TensorFlow dan tanpa pelatihan ulang.
+
+# %%
+from recommender.bundle import export_bundle, load_bundle
+
+bundle_path = export_bundle('artifacts', movies_df, cosine_sim, user_index, user_ids, movie_ids,
+                            user_embeddings, movie_embeddings, features=genre_features)
+print(f"Bundle disimpan di: {bundle_path}")
+
+# Memuat bundle terbaru dan melayani rekomendasi tanpa model Keras
+bundle = load_bundle('artifacts')
+print(f"Versi bundle: {bundle.version}")
+pd.DataFrame(bundle.recommend_for_user(255))
 
+
+# %% [markdown]
+# Pengguna yang sama sering meminta rekomendasi berulang kali, padahal hasilnya tidak berubah selama rating pengguna dan versi model tetap. `RecommendationCache` (`recommender/cache.py`) menyimpan hasil rekomendasi di dalam proses:
+# 
+# - **LRU dan Batas Memori**: Ukuran setiap hasil diperkirakan, lalu entri yang paling lama tidak dipakai dibuang saat total melebihi `max_bytes`.
+# - **TTL**: Entri yang lebih tua dari `ttl` detik dihitung ulang.
+# - **Invalidasi**: `OnlineCollaborative` dan `ContentProfiles` yang diberi cache memanggil `invalidate_user` setiap kali menerima rating baru. Dengan `version_source`, versi bundle dibaca pada setiap akses sehingga cache otomatis dikosongkan setelah bundle dimuat ulang.
+# - **Statistik**: Jumlah hit, miss, eviction, dan expiration tersedia di `cache.stats`.
+
+# %%
+from recommender.cache import RecommendationCache
+
+# Versi dan fungsi rekomendasi dibaca dari variabel bundle saat dipanggil, sehingga load_bundle ulang langsung berlaku
+recommendation_cache = RecommendationCache(max_bytes=64 << 20, ttl=300, version_source=lambda: bundle.version)
+cached_recommend_for_user = recommendation_cache.memoize(
+    'content_user', lambda user_id, top_n=10: bundle.recommend_for_user(user_id, top_n))
+cached_recommend_movies = recommendation_cache.memoize(
+    'collaborative', lambda user_id, top_n=10: bundle.recommend_movies(user_id, top_n))
+
+for _ in range(3):
+    cached_recommend_for_user(255)
+    cached_recommend_movies(255)
+
+# Rating baru lewat jalur fold-in menghapus hasil lama pengguna 255 dari cache
+content_profiles.cache = recommendation_cache
+content_profiles.add_rating(255, movie_id_to_row[movie_ids[0]], 5.0)
+cached_recommend_for_user(255)
+recommendation_cache.stats
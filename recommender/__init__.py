@@ -0,0 +1 @@
+"""Komponen sistem rekomendasi film MovieLens yang dapat di-import tanpa menjalankan notebook."""
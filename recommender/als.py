@@ -0,0 +1,169 @@
+"""Alternating Least Squares (ALS) untuk rating eksplisit dengan NumPy/SciPy.
+
+Matriks rating pengguna x film disimpan dalam format CSR. Setiap iterasi menyelesaikan
+least squares ber-regularisasi untuk semua pengguna dengan faktor film tetap, lalu
+sebaliknya untuk semua film. Baris dibagi ke beberapa blok yang diproses oleh thread
+pool; operasi BLAS/LAPACK NumPy melepas GIL sehingga blok berjalan paralel.
+
+Bias pengguna dan film dilipat ke dalam embedding: [p_u, b_u, 1] · [q_i, 1, mu + b_i]
+= p_u · q_i + b_u + b_i + mu. Dengan begitu, embedding hasil ALS dapat langsung dipakai
+oleh ``recommend_movies_fast``, ``IVFInnerProductIndex`` maupun bundle artefak.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def rating_matrix(x, y, n_users, n_movies):
+    # x berisi pasangan (indeks user, indeks movie) seperti x_train pada notebook
+    return sp.csr_matrix((np.asarray(y, dtype=np.float64), (x[:, 0], x[:, 1])), shape=(n_users, n_movies))
+
+
+def solve_row(design, offsets, cols, values, reg, eye=None):
+    # Least squares satu baris terhadap faktor sisi lain yang tetap (design[cols])
+    eye = np.eye(design.shape[1]) if eye is None else eye
+    fixed = design[cols]
+    target = values - offsets[cols]
+    # Weighted-lambda regularization: regularisasi sebanding dengan jumlah rating baris tersebut
+    gram = fixed.T @ fixed + reg * len(cols) * eye
+    return np.linalg.solve(gram, fixed.T @ target)
+
+
+def _solve_rows(indptr, indices, data, design, offsets, reg, start, stop, out):
+    eye = np.eye(design.shape[1])
+    for row in range(start, stop):
+        lo, hi = indptr[row], indptr[row + 1]
+        if lo == hi:
+            out[row] = 0
+            continue
+        out[row] = solve_row(design, offsets, indices[lo:hi], data[lo:hi], reg, eye)
+
+
+def _solve_all(matrix, design, offsets, reg, executor, block_size):
+    out = np.empty((matrix.shape[0], design.shape[1]))
+    futures = [executor.submit(_solve_rows, matrix.indptr, matrix.indices, matrix.data, design, offsets, reg,
+                               start, min(start + block_size, matrix.shape[0]), out)
+               for start in range(0, matrix.shape[0], block_size)]
+    for future in futures:
+        future.result()
+    return out
+
+
+class ALSModel:
+    def __init__(self, user_factors, item_factors, user_bias=None, item_bias=None, global_mean=0.0, reg=0.05):
+        self.user_factors = user_factors
+        self.item_factors = item_factors
+        self.user_bias = user_bias
+        self.item_bias = item_bias
+        self.global_mean = global_mean
+        self.reg = reg
+
+    @property
+    def biased(self):
+        return self.user_bias is not None
+
+    @property
+    def user_embeddings(self):
+        if not self.biased:
+            return self.user_factors.astype(np.float32)
+        ones = np.ones((len(self.user_factors), 1))
+        return np.hstack([self.user_factors, self.user_bias[:, None], ones]).astype(np.float32)
+
+    @property
+    def movie_embeddings(self):
+        if not self.biased:
+            return self.item_factors.astype(np.float32)
+        ones = np.ones((len(self.item_factors), 1))
+        return np.hstack([self.item_factors, ones, (self.global_mean + self.item_bias)[:, None]]).astype(np.float32)
+
+    def _fold_in(self, factors, bias, other_factors, other_bias, other_indices, ratings, reg):
+        other_indices = np.asarray(other_indices)
+        ratings = np.asarray(ratings, dtype=np.float64)
+        if len(other_indices) == 0:
+            return
+        reg = self.reg if reg is None else reg
+        if not self.biased:
+            factors[:] = solve_row(other_factors, np.zeros(len(other_factors)), other_indices, ratings, reg)
+            return
+        # Sama seperti satu langkah ALS: [faktor, bias] terhadap desain [faktor sisi lain, 1]
+        design = np.hstack([other_factors, np.ones((len(other_factors), 1))])
+        solved = solve_row(design, self.global_mean + other_bias, other_indices, ratings, reg)
+        factors[:], bias[...] = solved[:-1], solved[-1]
+
+    def fold_in_user(self, user_idx, movie_indices, ratings, reg=None):
+        # Memperbarui embedding satu pengguna dari seluruh ratingnya, dengan faktor film tetap
+        bias = self.user_bias[user_idx:user_idx + 1] if self.biased else None
+        self._fold_in(self.user_factors[user_idx], bias, self.item_factors, self.item_bias,
+                      movie_indices, ratings, reg)
+
+    def fold_in_item(self, movie_idx, user_indices, ratings, reg=None):
+        # Memperbarui embedding satu film dari ratingnya, dengan faktor pengguna tetap
+        bias = self.item_bias[movie_idx:movie_idx + 1] if self.biased else None
+        self._fold_in(self.item_factors[movie_idx], bias, self.user_factors, self.user_bias,
+                      user_indices, ratings, reg)
+
+    def add_users(self, n=1):
+        # Menambah baris embedding (nol) untuk pengguna baru; mengembalikan indeks pertama
+        start = len(self.user_factors)
+        self.user_factors = np.vstack([self.user_factors, np.zeros((n, self.user_factors.shape[1]))])
+        if self.biased:
+            self.user_bias = np.concatenate([self.user_bias, np.zeros(n)])
+        return start
+
+    def add_items(self, n=1):
+        start = len(self.item_factors)
+        self.item_factors = np.vstack([self.item_factors, np.zeros((n, self.item_factors.shape[1]))])
+        if self.biased:
+            self.item_bias = np.concatenate([self.item_bias, np.zeros(n)])
+        return start
+
+    def predict(self, x):
+        users, movies = x[:, 0], x[:, 1]
+        predictions = np.einsum('ij,ij->i', self.user_factors[users], self.item_factors[movies])
+        if self.biased:
+            predictions += self.global_mean + self.user_bias[users] + self.item_bias[movies]
+        return predictions
+
+
+def train_als(matrix, factors=50, reg=0.05, iterations=15, biases=True, n_threads=None,
+              block_size=256, seed=42, verbose=False):
+    matrix = sp.csr_matrix(matrix, dtype=np.float64)
+    matrix_t = matrix.T.tocsr()
+    n_users, n_movies = matrix.shape
+    n_threads = n_threads or os.cpu_count() or 1
+
+    rng = np.random.default_rng(seed)
+    user_factors = rng.normal(0, 0.01, (n_users, factors))
+    item_factors = rng.normal(0, 0.01, (n_movies, factors))
+    global_mean = matrix.data.mean() if biases and matrix.nnz else 0.0
+    user_bias = np.zeros(n_users)
+    item_bias = np.zeros(n_movies)
+
+    rows = np.repeat(np.arange(n_users), np.diff(matrix.indptr))
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        for iteration in range(iterations):
+            if biases:
+                # Faktor film tetap: selesaikan [p_u, b_u] terhadap desain [q_i, 1] dan target r - mu - b_i
+                design = np.hstack([item_factors, np.ones((n_movies, 1))])
+                solved = _solve_all(matrix, design, global_mean + item_bias, reg, executor, block_size)
+                user_factors, user_bias = solved[:, :factors], solved[:, factors]
+
+                # Faktor pengguna tetap: selesaikan [q_i, b_i] terhadap desain [p_u, 1] dan target r - mu - b_u
+                design = np.hstack([user_factors, np.ones((n_users, 1))])
+                solved = _solve_all(matrix_t, design, global_mean + user_bias, reg, executor, block_size)
+                item_factors, item_bias = solved[:, :factors], solved[:, factors]
+            else:
+                user_factors = _solve_all(matrix, item_factors, np.zeros(n_movies), reg, executor, block_size)
+                item_factors = _solve_all(matrix_t, user_factors, np.zeros(n_users), reg, executor, block_size)
+
+            if verbose:
+                model = ALSModel(user_factors, item_factors, user_bias if biases else None,
+                                 item_bias if biases else None, global_mean)
+                rmse = np.sqrt(np.mean((model.predict(np.c_[rows, matrix.indices]) - matrix.data) ** 2))
+                print(f"Iterasi {iteration + 1}/{iterations} - RMSE latih: {rmse:.4f}")
+
+    if not biases:
+        return ALSModel(user_factors, item_factors, reg=reg)
+    return ALSModel(user_factors, item_factors, user_bias, item_bias, global_mean, reg=reg)
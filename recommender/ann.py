@@ -0,0 +1,62 @@
+"""Indeks approximate maximum inner product (IVF) atas tabel embedding film."""
+import numpy as np
+
+from recommender.ranking import top_n_indices
+
+
+class IVFInnerProductIndex:
+    def __init__(self, item_vectors, n_lists=None, n_iter=10, seed=42):
+        item_vectors = np.asarray(item_vectors, dtype=np.float32)
+        n_items = len(item_vectors)
+        n_lists = n_lists or max(1, int(np.sqrt(n_items)))
+
+        # Transformasi MIPS -> nearest neighbor dengan satu dimensi tambahan
+        norms = np.einsum('ij,ij->i', item_vectors, item_vectors)
+        extra = np.sqrt(np.maximum(norms.max() - norms, 0))
+        augmented = np.hstack([item_vectors, extra[:, None]])
+
+        # K-means sebagai coarse quantizer
+        rng = np.random.default_rng(seed)
+        centroids = augmented[rng.choice(n_items, size=n_lists, replace=False)]
+        for _ in range(n_iter):
+            assign = self._nearest_centroid(augmented, centroids)
+            counts = np.bincount(assign, minlength=n_lists)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, augmented)
+            empty = counts == 0
+            centroids[~empty] = sums[~empty] / counts[~empty, None]
+            # List kosong diisi ulang dengan item acak
+            centroids[empty] = augmented[rng.choice(n_items, size=empty.sum(), replace=False)]
+        assign = self._nearest_centroid(augmented, centroids)
+
+        # Inverted list: item diurutkan berdasarkan list, dengan offset awal setiap list
+        order = np.argsort(assign, kind='stable')
+        self.list_ptr = np.zeros(n_lists + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assign, minlength=n_lists), out=self.list_ptr[1:])
+        self.item_ids = order.astype(np.int32)
+        self.item_vectors = item_vectors[order]
+        self.centroids = centroids
+        self.n_lists = n_lists
+
+    @staticmethod
+    def _nearest_centroid(vectors, centroids):
+        # argmin ||x - c||^2 = argmin (||c||^2 - 2 x.c)
+        centroid_norms = np.einsum('ij,ij->i', centroids, centroids)
+        return np.argmin(centroid_norms - 2 * vectors @ centroids.T, axis=1)
+
+    def query(self, user_vector, k=10, n_probe=8, exclude=None):
+        user_vector = np.asarray(user_vector, dtype=np.float32)
+
+        # Pilih n_probe list terdekat dari vektor pengguna (dimensi tambahan pengguna = 0)
+        n_probe = min(n_probe, self.n_lists)
+        centroid_dist = np.einsum('ij,ij->i', self.centroids, self.centroids) - 2 * self.centroids[:, :-1] @ user_vector
+        probe = np.argpartition(centroid_dist, n_probe - 1)[:n_probe]
+
+        # Kumpulkan kandidat dari list terpilih dan nilai secara eksak
+        candidates = np.concatenate([np.arange(self.list_ptr[i], self.list_ptr[i + 1]) for i in probe])
+        scores = self.item_vectors[candidates] @ user_vector
+        candidate_ids = self.item_ids[candidates]
+
+        mask = None if exclude is None else exclude[candidate_ids]
+        top = top_n_indices(scores, k, exclude=mask)
+        return candidate_ids[top], scores[top]
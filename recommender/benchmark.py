@@ -0,0 +1,266 @@
+"""Benchmark recommender atas dataset di ``data/``: latensi, throughput, waktu build, dan memori.
+
+Jalankan ``python -m recommender.benchmark --output hasil.json``. Latensi per permintaan
+dilaporkan sebagai p50/p99, throughput batch sebagai item per detik, lalu waktu build
+(TF-IDF, indeks similaritas, pelatihan), ukuran struktur data utama, dan peak RSS proses.
+Dataset dapat diperbesar secara sintetis dengan ``--user-scale`` dan ``--movie-scale``
+agar regresi pada katalog yang lebih besar ikut terlihat. Hasil disimpan sebagai JSON
+bersama commit git, sehingga dapat dibandingkan antar commit.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+
+def peak_rss_mb():
+    # ru_maxrss dalam KB di Linux dan dalam byte di macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+def nbytes_mb(*arrays):
+    return sum(array.nbytes for array in arrays) / 1024 ** 2
+
+
+def sparse_mb(matrix):
+    return nbytes_mb(matrix.data, matrix.indices, matrix.indptr)
+
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def measure_latency(func, inputs, warmup=5):
+    # Fungsi rekomendasi mencetak preferensi pengguna; output tersebut tidak ikut diukur
+    with contextlib.redirect_stdout(io.StringIO()):
+        for value in inputs[:warmup]:
+            func(value)
+        samples = np.empty(len(inputs))
+        for i, value in enumerate(inputs):
+            start = time.perf_counter()
+            func(value)
+            samples[i] = time.perf_counter() - start
+    samples *= 1000
+    return {
+        'p50_ms': float(np.percentile(samples, 50)),
+        'p99_ms': float(np.percentile(samples, 99)),
+        'mean_ms': float(samples.mean()),
+        'requests': len(samples),
+    }
+
+
+def measure_throughput(func, n_items):
+    with contextlib.redirect_stdout(io.StringIO()):
+        _, seconds = timed(func)
+    return {'items': n_items, 'seconds': seconds, 'items_per_s': n_items / seconds if seconds else float('inf')}
+
+
+def upscale(movies, ratings, user_scale=1, movie_scale=1, seed=42):
+    # Salinan ke-c dari setiap pengguna merating salinan film ke-(c mod movie_scale) dengan sedikit
+    # gangguan acak, sehingga jumlah rating bertambah sebanding dengan user_scale
+    rng = np.random.default_rng(seed)
+    movie_offset = int(movies['movieId'].max()) + 1
+    user_offset = int(ratings['userId'].max()) + 1
+
+    movie_copies = []
+    for c in range(movie_scale):
+        copy = movies.copy()
+        copy['movieId'] = copy['movieId'] + c * movie_offset
+        if c:
+            copy['title'] = copy['title'] + f" [{c}]"
+        movie_copies.append(copy)
+
+    rating_copies = []
+    for c in range(user_scale):
+        copy = ratings.copy()
+        copy['userId'] = copy['userId'] + c * user_offset
+        copy['movieId'] = copy['movieId'] + (c % movie_scale) * movie_offset
+        if c:
+            noise = rng.choice([-0.5, 0.0, 0.5], size=len(copy))
+            copy['rating'] = np.clip(copy['rating'] + noise, 0.5, 5.0).astype(copy['rating'].dtype)
+        rating_copies.append(copy)
+
+    movies = pd.concat(movie_copies, ignore_index=True)
+    movies['genres'] = movies['genres'].astype('category')
+    return movies, pd.concat(rating_copies, ignore_index=True)
+
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(data_dir=None, user_scale=1, movie_scale=1, n_requests=200, n_jobs=1, train_keras=False, seed=42):
+    from recommender.als import rating_matrix, train_als
+    from recommender.collaborative import recommend_movies_fast
+    from recommender.content import (evaluate_content_predictions, predict_rating_content, recommend_content,
+                                     recommend_for_user, recommend_for_users)
+    from recommender.data import DATA_DIR, load_movies, load_ratings
+    from recommender.features import build_tfidf
+    from recommender.index import UserRatingIndex, build_movie_id_to_row, build_user_rating_index
+    from recommender.itemknn import build_item_similarity, recommend_for_user_knn
+    from recommender.similarity import NeighborTable, build_topk_similarity, normalize_features
+
+    # Import scikit-learn lebih dulu agar waktu import tidak terhitung sebagai waktu build TF-IDF
+    import sklearn.feature_extraction.text  # noqa: F401
+
+    data_dir = data_dir or DATA_DIR
+    rng = np.random.default_rng(seed)
+    build, latency, throughput, memory = {}, {}, {}, {}
+
+    movies, build['load_movies_s'] = timed(load_movies, os.path.join(data_dir, 'movies.csv'))
+    ratings, build['load_ratings_s'] = timed(load_ratings, os.path.join(data_dir, 'ratings.csv'))
+    if user_scale > 1 or movie_scale > 1:
+        movies, ratings = upscale(movies, ratings, user_scale, movie_scale, seed)
+
+    movie_id_to_row = build_movie_id_to_row(movies)
+    movie_indices = pd.Series(movies.index, index=movies['title'])
+    movie_titles = movies['title'].to_numpy()
+    movie_genres = movies['genres'].to_numpy()
+
+    (tfidf, tfidf_matrix), build['tfidf_s'] = timed(build_tfidf, movies['genres'])
+    cosine_sim, build['similarity_s'] = timed(build_topk_similarity, tfidf_matrix, k=100, n_jobs=n_jobs)
+    features, build['normalize_features_s'] = timed(normalize_features, tfidf_matrix)
+    neighbor_table, build['neighbor_table_s'] = timed(NeighborTable(cosine_sim, k=50).warm)
+    user_index, build['user_index_s'] = timed(build_user_rating_index, ratings, movie_id_to_row)
+    item_sim, build['item_knn_s'] = timed(build_item_similarity, user_index, len(movies))
+
+    # Ruang indeks model collaborative, sama seperti notebook
+    user_ids = ratings['userId'].unique()
+    movie_ids = ratings['movieId'].unique()
+    user_to_index = {user_id: i for i, user_id in enumerate(user_ids.tolist())}
+    users = pd.Index(user_ids).get_indexer(ratings['userId'])
+    cf_movies = pd.Index(movie_ids).get_indexer(ratings['movieId'])
+    x = np.c_[users, cf_movies]
+    y = ratings['rating'].to_numpy(np.float64) / 5.0
+    als_model, build['train_als_s'] = timed(train_als, rating_matrix(x, y, len(user_ids), len(movie_ids)),
+                                            iterations=10)
+    user_embeddings, movie_embeddings = als_model.user_embeddings, als_model.movie_embeddings
+    cf_rated_index = UserRatingIndex(ratings['userId'].to_numpy(), cf_movies, y)
+    cf_movie_titles = movies.set_index('movieId').loc[movie_ids, 'title'].to_numpy()
+
+    sample_users = rng.choice(user_index.user_ids, size=n_requests)
+    sample_titles = movie_titles[rng.choice(len(movies), size=n_requests)]
+    sample_movies = movies['movieId'].to_numpy()[rng.choice(len(movies), size=n_requests)]
+
+    latency['recommend_content'] = measure_latency(
+        lambda title: recommend_content(title, movies, cosine_sim, movie_indices, movie_titles, movie_genres),
+        sample_titles)
+    latency['recommend_content_neighbors'] = measure_latency(
+        lambda title: recommend_content(title, movies, cosine_sim, movie_indices, movie_titles, movie_genres,
+                                        neighbors=neighbor_table),
+        sample_titles)
+    latency['recommend_for_user'] = measure_latency(
+        lambda user_id: recommend_for_user(user_id, movies, user_index, features, movie_titles=movie_titles,
+                                           movie_genres=movie_genres),
+        sample_users)
+    latency['recommend_for_user_knn'] = measure_latency(
+        lambda user_id: recommend_for_user_knn(user_id, movies, user_index, item_sim, movie_titles=movie_titles,
+                                               movie_genres=movie_genres),
+        sample_users)
+    latency['predict_rating_content'] = measure_latency(
+        lambda pair: predict_rating_content(pair[0], pair[1], user_index, movie_id_to_row, features),
+        list(zip(sample_users.tolist(), sample_movies.tolist())))
+    latency['recommend_movies_fast'] = measure_latency(
+        lambda user_id: recommend_movies_fast(user_id, user_to_index, user_embeddings, movie_embeddings,
+                                              cf_movie_titles, rated_index=cf_rated_index),
+        sample_users)
+
+    all_users = user_index.user_ids
+    throughput['recommend_for_users'] = measure_throughput(
+        lambda: recommend_for_users(all_users, movies, user_index, features), len(all_users))
+    test_data = ratings.sample(frac=0.2, random_state=seed)
+    throughput['evaluate_content_predictions'] = measure_throughput(
+        lambda: evaluate_content_predictions(test_data, user_index, movie_id_to_row, features), len(test_data))
+
+    if train_keras:
+        latency.update(_keras_benchmark(x, y, len(user_ids), len(movie_ids), movies, user_to_index,
+                                        movie_ids.tolist(), sample_users, build))
+
+    memory['ratings_df_mb'] = float(ratings.memory_usage(deep=True).sum() / 1024 ** 2)
+    memory['movies_df_mb'] = float(movies.memory_usage(deep=True).sum() / 1024 ** 2)
+    memory['cosine_sim_mb'] = sparse_mb(cosine_sim)
+    memory['features_mb'] = sparse_mb(features)
+    memory['neighbor_table_mb'] = nbytes_mb(neighbor_table.indices, neighbor_table.scores)
+    memory['item_sim_mb'] = sparse_mb(item_sim)
+    memory['user_index_mb'] = nbytes_mb(user_index.indptr, user_index.items, user_index.values)
+    memory['embeddings_mb'] = nbytes_mb(user_embeddings, movie_embeddings)
+
+    return {
+        'meta': {
+            'commit': git_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'cpu_count': os.cpu_count(),
+            'user_scale': user_scale,
+            'movie_scale': movie_scale,
+            'n_movies': len(movies),
+            'n_users': len(user_index),
+            'n_ratings': len(ratings),
+            'n_requests': n_requests,
+            'n_jobs': n_jobs,
+        },
+        'build': build,
+        'latency': latency,
+        'throughput': throughput,
+        'memory': memory,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def _keras_benchmark(x, y, n_users, n_movies, movies, user_to_index, movie_ids, sample_users, build):
+    from recommender.collaborative import recommend_movies
+    from recommender.net import RecommenderNet
+    from recommender.training import train_recommender, write_shards
+
+    with tempfile.TemporaryDirectory() as directory:
+        files = write_shards(x, y, directory)
+        model = RecommenderNet(n_users, n_movies, 50)
+        _, build['train_keras_epoch_s'] = timed(train_recommender, model, files, epochs=1, verbose=0)
+
+    # model.predict Keras lambat, sehingga cukup sebagian kecil permintaan
+    return {'recommend_movies': measure_latency(
+        lambda user_id: recommend_movies(user_id, model, movies, user_to_index, movie_ids),
+        sample_users[:20], warmup=2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark latensi, throughput, dan memori recommender")
+    parser.add_argument('--data-dir', default=None)
+    parser.add_argument('--output', default=None, help="file JSON hasil benchmark")
+    parser.add_argument('--user-scale', type=int, default=1)
+    parser.add_argument('--movie-scale', type=int, default=1)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--n-jobs', type=int, default=1)
+    parser.add_argument('--keras', action='store_true', help="ikut melatih RecommenderNet satu epoch")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    results = run_benchmark(args.data_dir, args.user_scale, args.movie_scale, args.requests, args.n_jobs,
+                            args.keras, args.seed)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    print(text)
+
+
+if __name__ == '__main__':
+    main()
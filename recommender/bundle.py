@@ -0,0 +1,191 @@
+"""Ekspor dan pemuatan artefak model dalam bentuk bundle berversi di disk.
+
+Setiap bundle adalah satu direktori ``<root>/<version>/`` berisi ``manifest.json``
+dan array ``.npy`` yang dapat dimuat dengan ``mmap_mode`` sehingga worker yang
+di-fork berbagi halaman memori yang sama. Modul ini hanya membutuhkan NumPy,
+sehingga rekomendasi dapat dilayani tanpa TensorFlow maupun pelatihan ulang. Bila matriks
+fitur ternormalisasi ikut diekspor, ``recommend_for_user`` menghitung skor profil secara
+eksak seperti ``content.recommend_for_user``; bundle tanpa fitur memakai rata-rata baris
+indeks top-k.
+"""
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+from recommender.ranking import top_n_indices
+
+BUNDLE_FORMAT = 1
+LATEST_FILE = 'LATEST'
+
+
+def export_bundle(root, movies, cosine_sim, user_index, user_ids, movie_ids,
+                  user_embeddings, movie_embeddings, version=None, features=None):
+    version = version or time.strftime('%Y%m%d%H%M%S')
+    target = os.path.join(root, version)
+    if os.path.exists(target):
+        raise FileExistsError(f"Bundle versi {version} sudah ada di {root}")
+
+    catalog_movie_ids = movies['movieId'].to_numpy().astype(np.int64)
+    catalog_row = {movie_id: row for row, movie_id in enumerate(catalog_movie_ids.tolist())}
+
+    # Pemetaan indeks film model (collaborative) <-> baris katalog (content-based)
+    cf_to_catalog = np.array([catalog_row.get(movie_id, -1) for movie_id in movie_ids], dtype=np.int32)
+    catalog_to_cf = np.full(len(catalog_movie_ids), -1, dtype=np.int32)
+    catalog_to_cf[cf_to_catalog[cf_to_catalog >= 0]] = np.flatnonzero(cf_to_catalog >= 0)
+
+    arrays = {
+        # Katalog film (urutan baris movies_df)
+        'catalog_movie_ids': catalog_movie_ids,
+        'catalog_titles': np.array(movies['title'].to_numpy(), dtype=str),
+        'catalog_genres': np.array(movies['genres'].to_numpy(), dtype=str),
+        # Indeks similaritas top-k dalam format CSR
+        'similarity_indptr': np.asarray(cosine_sim.indptr, dtype=np.int64),
+        'similarity_indices': np.asarray(cosine_sim.indices, dtype=np.int32),
+        'similarity_data': np.asarray(cosine_sim.data, dtype=np.float32),
+        # Indeks rating pengguna (film sebagai baris katalog)
+        'rating_user_ids': np.asarray(user_index.user_ids, dtype=np.int64),
+        'rating_indptr': np.asarray(user_index.indptr, dtype=np.int64),
+        'rating_items': np.asarray(user_index.items, dtype=np.int32),
+        'rating_values': np.asarray(user_index.values, dtype=np.float32),
+        # Pemetaan user_to_index / movie_to_index dan tabel embedding
+        'cf_user_ids': np.asarray(user_ids, dtype=np.int64),
+        'cf_movie_ids': np.asarray(movie_ids, dtype=np.int64),
+        'cf_to_catalog': cf_to_catalog,
+        'catalog_to_cf': catalog_to_cf,
+        'user_embeddings': np.asarray(user_embeddings, dtype=np.float32),
+        'movie_embeddings': np.asarray(movie_embeddings, dtype=np.float32),
+    }
+    if features is not None:
+        # Matriks fitur film ternormalisasi L2 (CSR) untuk skor profil yang eksak
+        features = features.tocsr()
+        arrays['feature_shape'] = np.asarray(features.shape, dtype=np.int64)
+        arrays['feature_indptr'] = np.asarray(features.indptr, dtype=np.int64)
+        arrays['feature_indices'] = np.asarray(features.indices, dtype=np.int32)
+        arrays['feature_data'] = np.asarray(features.data, dtype=np.float32)
+
+    # Tulis ke direktori sementara lalu rename, sehingga pembaca tidak pernah melihat bundle setengah jadi
+    os.makedirs(root, exist_ok=True)
+    staging = os.path.join(root, f".{version}.tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    for name, array in arrays.items():
+        np.save(os.path.join(staging, f"{name}.npy"), array)
+
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'version': version,
+        'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'arrays': {name: {'shape': list(array.shape), 'dtype': array.dtype.str} for name, array in arrays.items()},
+    }
+    with open(os.path.join(staging, 'manifest.json'), 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(staging, target)
+
+    # Penanda versi terbaru
+    latest_tmp = os.path.join(root, f".{LATEST_FILE}.tmp")
+    with open(latest_tmp, 'w') as f:
+        f.write(version)
+    os.replace(latest_tmp, os.path.join(root, LATEST_FILE))
+    return target
+
+
+def load_bundle(root, version=None, mmap_mode='r'):
+    if version is None:
+        with open(os.path.join(root, LATEST_FILE)) as f:
+            version = f.read().strip()
+    return ModelBundle(os.path.join(root, version), mmap_mode=mmap_mode)
+
+
+class ModelBundle:
+    def __init__(self, path, mmap_mode='r'):
+        with open(os.path.join(path, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+        if self.manifest['format'] != BUNDLE_FORMAT:
+            raise ValueError(f"Format bundle {self.manifest['format']} tidak didukung")
+        self.path = path
+        self.version = self.manifest['version']
+
+        for name in self.manifest['arrays']:
+            setattr(self, name, np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode))
+
+        # Dictionary pencarian dibangun sekali saat bundle dimuat
+        # Untuk judul duplikat, baris pertama yang dipakai (sama seperti content.resolve_title)
+        self.title_to_row = {}
+        for row, title in enumerate(self.catalog_titles.tolist()):
+            self.title_to_row.setdefault(title, row)
+        self.rating_user_pos = {user_id: pos for pos, user_id in enumerate(self.rating_user_ids.tolist())}
+        self.cf_user_pos = {user_id: pos for pos, user_id in enumerate(self.cf_user_ids.tolist())}
+        if 'feature_indptr' in self.manifest['arrays']:
+            # Baris katalog untuk setiap entri fitur, agar Xn @ profil cukup berupa satu bincount
+            self.feature_rows = np.repeat(np.arange(len(self.feature_indptr) - 1, dtype=np.int32),
+                                          np.diff(self.feature_indptr))
+
+    def user_ratings(self, user_id):
+        # Mengembalikan (baris katalog, rating) milik satu pengguna
+        pos = self.rating_user_pos.get(user_id)
+        if pos is None:
+            return self.rating_items[:0], self.rating_values[:0]
+        start, stop = self.rating_indptr[pos], self.rating_indptr[pos + 1]
+        return self.rating_items[start:stop], self.rating_values[start:stop]
+
+    def _results(self, rows, scores):
+        return [{'Title': str(self.catalog_titles[row]), 'Genres': str(self.catalog_genres[row]),
+                 'Similarity': round(float(score), 3)} for row, score in zip(rows, scores)]
+
+    def recommend_content(self, title, top_n=10):
+        idx = self.title_to_row[title]
+        start, stop = self.similarity_indptr[idx], self.similarity_indptr[idx + 1]
+        candidates = self.similarity_indices[start:stop]
+        scores = self.similarity_data[start:stop]
+        top = top_n_indices(scores, top_n, exclude=candidates == idx)
+        return self._results(candidates[top], scores[top])
+
+    @staticmethod
+    def _csr_entries(indptr, rows):
+        # Posisi seluruh entri CSR milik baris-baris yang diminta
+        starts = indptr[rows]
+        counts = indptr[rows + 1] - starts
+        return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+    def recommend_for_user(self, user_id, top_n=10):
+        rated_rows, ratings = self.user_ratings(user_id)
+        liked = rated_rows[ratings >= 3.5]
+        if len(liked) == 0:
+            return []
+
+        if hasattr(self, 'feature_rows'):
+            # Profil = rata-rata fitur film yang disukai; skor = Xn @ profil, langsung dari array CSR
+            profile = np.zeros(int(self.feature_shape[1]), dtype=np.float64)
+            entries = self._csr_entries(self.feature_indptr, liked)
+            np.add.at(profile, self.feature_indices[entries], self.feature_data[entries])
+            profile /= len(liked)
+            scores = np.bincount(self.feature_rows, weights=self.feature_data * profile[self.feature_indices],
+                                 minlength=len(self.catalog_movie_ids)).astype(np.float32)
+        else:
+            # Bundle lama tanpa fitur: rata-rata baris similaritas top-k film yang disukai
+            entries = self._csr_entries(self.similarity_indptr, liked)
+            scores = np.zeros(len(self.catalog_movie_ids), dtype=np.float32)
+            np.add.at(scores, self.similarity_indices[entries], self.similarity_data[entries])
+            scores /= len(liked)
+
+        watched = np.zeros(len(scores), dtype=bool)
+        watched[rated_rows] = True
+        top = top_n_indices(scores, top_n, exclude=watched)
+        return self._results(top, scores[top])
+
+    def recommend_movies(self, user_id, top_n=10, exclude_rated=True):
+        user_idx = self.cf_user_pos[user_id]
+        predicted_ratings = self.movie_embeddings @ self.user_embeddings[user_idx]
+
+        exclude = None
+        if exclude_rated:
+            exclude = np.zeros(len(predicted_ratings), dtype=bool)
+            rated_cf = self.catalog_to_cf[self.user_ratings(user_id)[0]]
+            exclude[rated_cf[rated_cf >= 0]] = True
+
+        top = top_n_indices(predicted_ratings, top_n, exclude=exclude)
+        catalog_rows = self.cf_to_catalog[top]
+        return [str(self.catalog_titles[row]) for row in catalog_rows if row >= 0]
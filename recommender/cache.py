@@ -0,0 +1,208 @@
+"""Cache hasil rekomendasi di dalam proses dengan LRU, TTL, dan batas memori.
+
+Entri dikunci oleh pengguna, jenis rekomendasi, argumen (skalar menurut nilai, objek seperti
+matriks similaritas menurut identitas), dan versi model. Entri paling lama tidak dipakai
+dibuang saat jumlah byte melebihi ``max_bytes``, dan entri yang lebih tua dari ``ttl`` detik
+dianggap tidak ada. Perubahan rating pengguna menghapus semua entri pengguna tersebut
+(``OnlineCollaborative`` dan ``ContentProfiles`` memanggilnya otomatis bila diberi cache),
+sedangkan pergantian versi bundle mengosongkan seluruh cache. Dengan
+``version_source``, versi dibaca ulang pada setiap akses sehingga reload bundle tidak perlu
+diikuti pemanggilan ``set_model_version`` secara manual.
+"""
+import inspect
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+SCALARS = (int, float, str, bool, type(None), np.integer, np.floating)
+
+
+class _Identity:
+    # Argumen non-skalar (DataFrame, matriks similaritas, indeks rating) dikunci berdasarkan identitas
+    # objek. Kunci menyimpan referensi ke objek, sehingga id-nya tidak dapat dipakai ulang oleh objek
+    # lain selama entri masih ada. Perubahan isi objek di tempat tetap ditangani lewat versi model
+    __slots__ = ('obj',)
+
+    def __init__(self, obj):
+        self.obj = obj
+
+    def __hash__(self):
+        return id(self.obj)
+
+    def __eq__(self, other):
+        return isinstance(other, _Identity) and other.obj is self.obj
+
+
+def _value_key(value):
+    if isinstance(value, SCALARS):
+        return value
+    if isinstance(value, tuple):
+        return tuple(_value_key(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((name, _value_key(item)) for name, item in value.items()))
+    return _Identity(value)
+
+
+def argument_key(func):
+    # Argumen diikat ke signature fungsi beserta nilai default-nya, sehingga f(u, 5), f(u, top_n=5),
+    # dan (bila default top_n=5) f(u) menghasilkan kunci yang sama
+    try:
+        signature = inspect.signature(func)
+    except (TypeError, ValueError):
+        signature = None
+
+    def key(args, kwargs):
+        if signature is None:
+            return _value_key(args) + _value_key(kwargs)
+        bound = signature.bind(None, *args, **kwargs)
+        bound.apply_defaults()
+        arguments = list(bound.arguments.items())[1:]
+        return tuple((name, _value_key(value)) for name, value in arguments)
+    return key
+
+
+def estimate_size(value):
+    # Perkiraan byte yang ditempati hasil rekomendasi (array, DataFrame, atau list/dict hasil bundle)
+    if isinstance(value, np.ndarray):
+        return sys.getsizeof(value) + (0 if value.base is None else value.nbytes)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(np.sum(value.memory_usage(deep=True)))
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(estimate_size(item) for item in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_size(k) + estimate_size(v) for k, v in value.items())
+    return sys.getsizeof(value)
+
+
+class RecommendationCache:
+    def __init__(self, max_bytes=64 << 20, ttl=300.0, model_version=None, clock=time.monotonic, version_source=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.model_version = model_version
+        self.clock = clock
+        # Fungsi tanpa argumen yang mengembalikan versi model saat ini, misalnya lambda: bundle.version
+        self.version_source = version_source
+
+        # key -> (nilai, ukuran, waktu kedaluwarsa); urutan OrderedDict adalah urutan LRU
+        self.entries = OrderedDict()
+        self.user_keys = {}
+        self.bytes = 0
+        self.lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    @property
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / total if total else 0.0,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'entries': len(self.entries),
+            'bytes': self.bytes,
+        }
+
+    def _remove(self, key):
+        _, size, _ = self.entries.pop(key)
+        self.bytes -= size
+        keys = self.user_keys.get(key[1])
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self.user_keys[key[1]]
+
+    def _sync_version(self):
+        # Dipanggil dengan lock; versi baru dari version_source membuat semua hasil lama tidak berlaku
+        if self.version_source is None:
+            return
+        version = self.version_source()
+        if version != self.model_version:
+            self.model_version = version
+            self._clear()
+
+    def get(self, user_id, name, args=()):
+        with self.lock:
+            self._sync_version()
+            key = (self.model_version, user_id, name, args)
+            entry = self.entries.get(key)
+            if entry is not None and entry[2] < self.clock():
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, user_id, name, args, value):
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            return
+        with self.lock:
+            self._sync_version()
+            key = (self.model_version, user_id, name, args)
+            if key in self.entries:
+                self._remove(key)
+            self.entries[key] = (value, size, self.clock() + self.ttl)
+            self.user_keys.setdefault(user_id, set()).add(key)
+            self.bytes += size
+
+            # Buang entri yang paling lama tidak dipakai hingga kembali di bawah batas memori
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def get_or_compute(self, user_id, name, compute, args=()):
+        # Hasil cache dipakai bersama oleh semua pemanggil, sehingga tidak boleh diubah di tempat
+        value = self.get(user_id, name, args)
+        if value is None:
+            value = compute()
+            self.put(user_id, name, args, value)
+        return value
+
+    def memoize(self, name, func, key=None):
+        # Membungkus fungsi rekomendasi dengan argumen pertama user_id; key(args, kwargs) menentukan
+        # bagian kunci dari argumen lainnya dan harus menghasilkan nilai yang hashable
+        key = argument_key(func) if key is None else key
+
+        def cached(user_id, *args, **kwargs):
+            return self.get_or_compute(user_id, name, lambda: func(user_id, *args, **kwargs), key(args, kwargs))
+        return cached
+
+    def invalidate_user(self, user_id):
+        # Dipanggil saat rating pengguna berubah
+        with self.lock:
+            for key in list(self.user_keys.get(user_id, ())):
+                self._remove(key)
+
+    def set_model_version(self, version):
+        # Versi bundle baru: semua hasil lama tidak berlaku lagi
+        with self.lock:
+            if version == self.model_version:
+                return
+            self.model_version = version
+            self._clear()
+
+    def clear(self):
+        with self.lock:
+            self._clear()
+
+    def _clear(self):
+        self.entries.clear()
+        self.user_keys.clear()
+        self.bytes = 0
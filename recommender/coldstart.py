@@ -0,0 +1,127 @@
+"""Penanganan cold start untuk pengguna dan film yang belum dikenal model.
+
+Pengguna baru dilayani dari peringkat popularitas (Bayesian average) yang dihitung sekali
+dari rata-rata dan jumlah rating per film, sehingga permintaan tanpa riwayat cukup
+mengembalikan potongan array yang sudah disiapkan. Film baru dilayani dari vektor TF-IDF
+genre. Begitu pengguna memiliki riwayat, skor popularitas dicampur dengan skor
+collaborative dengan bobot yang bergeser ke collaborative seiring bertambahnya rating.
+"""
+import numpy as np
+
+from recommender.ranking import normalize_scores, top_n_indices
+
+
+def bayesian_average(mean, count, prior_mean=None, prior_count=None):
+    mean = np.nan_to_num(np.asarray(mean, dtype=np.float64))
+    count = np.asarray(count, dtype=np.float64)
+    if prior_mean is None:
+        # Rata-rata seluruh rating sebagai prior
+        prior_mean = np.sum(mean * count) / max(count.sum(), 1)
+    if prior_count is None:
+        # Seperti peringkat IMDb: film ditarik ke prior seolah memiliki rating sebanyak persentil ke-90
+        prior_count = np.percentile(count[count > 0], 90) if (count > 0).any() else 1.0
+    return (prior_count * prior_mean + count * mean) / (prior_count + count)
+
+
+def collaborative_weight(n_ratings, full_history=20):
+    # 0 untuk pengguna tanpa riwayat, naik linear hingga 1 setelah full_history rating
+    return min(n_ratings / full_history, 1.0) if full_history > 0 else 1.0
+
+
+class PopularityRanking:
+    def __init__(self, movie_ids, mean, count, prior_mean=None, prior_count=None, cache_size=100):
+        self.movie_ids = np.asarray(movie_ids)
+        self.scores = bayesian_average(mean, count, prior_mean, prior_count)
+        self.order = np.argsort(-self.scores, kind='stable')
+        self.position = {movie_id: i for i, movie_id in enumerate(self.movie_ids.tolist())}
+        # Daftar teratas disiapkan sekali; pengguna baru hanya menerima potongannya
+        self.top_movie_ids = self.movie_ids[self.order[:cache_size]]
+
+    @classmethod
+    def from_stats(cls, movie_stats, **kwargs):
+        # movie_stats berisi kolom movieId, mean, dan count (lihat eda.prepare_eda_data)
+        return cls(movie_stats['movieId'].to_numpy(), movie_stats['mean'].to_numpy(),
+                   movie_stats['count'].to_numpy(), **kwargs)
+
+    def recommend(self, top_n=10, exclude_ids=None):
+        if (exclude_ids is None or len(exclude_ids) == 0) and top_n <= len(self.top_movie_ids):
+            return self.top_movie_ids[:top_n]
+
+        # Pengguna dengan sedikit riwayat: lewati film yang sudah ditonton sambil menelusuri urutan
+        exclude_ids = set() if exclude_ids is None else set(exclude_ids)
+        result = []
+        for movie_id in self.movie_ids[self.order].tolist():
+            if movie_id not in exclude_ids:
+                result.append(movie_id)
+                if len(result) == top_n:
+                    break
+        return np.array(result, dtype=self.movie_ids.dtype)
+
+    def scores_for(self, movie_ids):
+        # Skor popularitas untuk urutan film lain (misalnya indeks model); film tak dikenal bernilai NaN
+        pos = np.array([self.position.get(movie_id, -1) for movie_id in movie_ids], dtype=np.int64)
+        return np.where(pos >= 0, self.scores[pos], np.nan)
+
+
+class GenreSimilarity:
+    # Film baru cukup memiliki string genre untuk dibandingkan dengan katalog melalui TF-IDF
+    def __init__(self, tfidf, tfidf_matrix, movie_ids):
+        self.tfidf = tfidf
+        self.tfidf_matrix = tfidf_matrix.tocsr()
+        self.movie_ids = np.asarray(movie_ids)
+
+    def scores(self, genres):
+        # Vektor TF-IDF sudah dinormalisasi L2, sehingga perkalian titik adalah cosine similarity
+        vector = self.tfidf.transform([genres])
+        return (self.tfidf_matrix @ vector.T).toarray().ravel()
+
+    def similar(self, genres, top_n=10, exclude_ids=None):
+        scores = self.scores(genres)
+        exclude = None if exclude_ids is None else np.isin(self.movie_ids, list(exclude_ids))
+        top = top_n_indices(scores, top_n, exclude=exclude)
+        return self.movie_ids[top], scores[top]
+
+    def embed(self, genres, movie_to_index, movie_embeddings, k=20):
+        # Embedding awal film baru: rata-rata embedding k film bergenre paling mirip, dibobot similaritas
+        movie_ids, weights = self.similar(genres, top_n=k)
+        known = [i for i, movie_id in enumerate(movie_ids.tolist()) if movie_id in movie_to_index]
+        if not known or weights[known].sum() <= 0:
+            return np.zeros(movie_embeddings.shape[1], dtype=movie_embeddings.dtype)
+        rows = [movie_to_index[movie_ids[i]] for i in known]
+        return (weights[known] @ movie_embeddings[rows] / weights[known].sum()).astype(movie_embeddings.dtype)
+
+
+class ColdStartRecommender:
+    def __init__(self, popularity, user_to_index, user_embeddings, movie_embeddings, movie_ids,
+                 rated_index=None, full_history=20):
+        self.popularity = popularity
+        self.user_to_index = user_to_index
+        self.user_embeddings = user_embeddings
+        self.movie_embeddings = movie_embeddings
+        # movie_ids mengikuti urutan indeks model (movie_to_index)
+        self.movie_ids = np.asarray(movie_ids)
+        self.rated_index = rated_index
+        self.full_history = full_history
+        self.popularity_scores = normalize_scores(popularity.scores_for(self.movie_ids))
+
+    def recommend(self, user_id, top_n=10):
+        user_idx = self.user_to_index.get(user_id)
+        if self.rated_index is None:
+            # Tanpa indeks rating, pengguna yang dikenal model dianggap memiliki riwayat penuh
+            rated = np.zeros(0, dtype=np.int32)
+            weight = 0.0 if user_idx is None else 1.0
+        else:
+            rated = self.rated_index.get(user_id)[0]
+            weight = collaborative_weight(len(rated), self.full_history)
+
+        # Tanpa riwayat atau tanpa embedding: langsung dari cache popularitas
+        if user_idx is None or weight == 0:
+            return self.popularity.recommend(top_n, exclude_ids=self.movie_ids[rated].tolist())
+
+        watched = np.zeros(len(self.movie_ids), dtype=bool)
+        watched[rated] = True
+        scores = self.movie_embeddings @ self.user_embeddings[user_idx]
+        if weight < 1.0:
+            scores = weight * normalize_scores(scores, watched) + (1.0 - weight) * self.popularity_scores
+        top = top_n_indices(scores, top_n, exclude=watched)
+        return self.movie_ids[top]
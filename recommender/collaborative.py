@@ -0,0 +1,51 @@
+"""Collaborative filtering: rekomendasi dari embedding RecommenderNet."""
+import numpy as np
+
+from recommender.ranking import top_n_indices
+
+
+# Membuat rekomendasi untuk pengguna
+def recommend_movies(user_id_original, model, movie_df, user_to_index, movie_ids, top_n=10):
+    user_idx = user_to_index[user_id_original]
+
+    # Dapatkan semua indeks film
+    movie_indices = np.arange(len(movie_ids))
+
+    # Buat kombinasi input antara pengguna dengan semua film
+    user_input = np.array([[user_idx, movie] for movie in movie_indices])
+
+    # Prediksi rating
+    predicted_ratings = model.predict(user_input).flatten()
+
+    # Urutkan berdasarkan rating
+    top_indices = predicted_ratings.argsort()[-top_n:][::-1]
+    top_movie_ids = [movie_ids[i] for i in top_indices]
+
+    # Dapatkan judul film
+    recommended_titles = movie_df[movie_df['movieId'].isin(top_movie_ids)]['title'].tolist()
+    return recommended_titles
+
+
+# Mengambil bobot embedding model sebagai array NumPy
+def extract_embeddings(model):
+    user_embeddings = model.user_embedding.get_weights()[0]
+    movie_embeddings = model.movie_embedding.get_weights()[0]
+    return user_embeddings, movie_embeddings
+
+
+def recommend_movies_fast(user_id_original, user_to_index, user_embeddings, movie_embeddings, movie_titles,
+                          rated_index=None, top_n=10):
+    user_idx = user_to_index[user_id_original]
+
+    # Prediksi rating semua film dengan satu perkalian matriks-vektor
+    predicted_ratings = movie_embeddings @ user_embeddings[user_idx]
+
+    # Kecualikan film yang sudah dirating pengguna
+    exclude = None
+    if rated_index is not None:
+        exclude = np.zeros(len(predicted_ratings), dtype=bool)
+        exclude[rated_index.get(user_id_original)[0]] = True
+
+    # Pilih top_n film dengan prediksi rating tertinggi
+    top_indices = top_n_indices(predicted_ratings, top_n, exclude=exclude)
+    return movie_titles[top_indices].tolist()
@@ -0,0 +1,208 @@
+"""Content-based filtering: rekomendasi dan prediksi rating berbasis similaritas genre.
+
+``recommend_content`` memakai indeks similaritas top-k. Skor profil pengguna dan prediksi
+rating dihitung secara eksak dari matriks fitur yang sudah dinormalisasi L2
+(``similarity.normalize_features``): rata-rata cosine terhadap film yang disukai sama dengan
+``mean(Xn[liked]) @ Xn.T``, sehingga tidak bergantung pada tetangga mana yang tersimpan di
+indeks top-k dan tetap tidak membentuk matriks film x film yang padat.
+"""
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from recommender.ranking import top_n_indices, top_n_rows
+
+
+def resolve_title(movie_indices, title):
+    # Judul duplikat membuat movie_indices[title] mengembalikan Series; gunakan kemunculan pertama
+    idx = movie_indices[title]
+    if isinstance(idx, pd.Series):
+        idx = idx.iloc[0]
+    return int(idx)
+
+
+def recommend_content(title, movies, cosine_sim, movie_indices, movie_titles=None, movie_genres=None, top_n=10,
+                      neighbors=None):
+    # Array judul dan genre dapat disiapkan sekali oleh pemanggil agar tidak dibuat ulang setiap panggilan
+    movie_titles = movies['title'].to_numpy() if movie_titles is None else movie_titles
+    movie_genres = movies['genres'].to_numpy() if movie_genres is None else movie_genres
+
+    # Ambil index film input
+    idx = resolve_title(movie_indices, title)
+
+    # Ambil info genre film input
+    input_genre = movies.iloc[idx]['genres']
+
+    # Tampilkan informasi film input
+    print(f"\nFilm input  : {title}")
+    print(f"Genre input : {input_genre}\n")
+
+    if neighbors is not None and top_n <= neighbors.k:
+        # Daftar tetangga (NeighborTable) sudah terurut, cukup ambil top_n pertama
+        top_movies, top_scores = neighbors.get(idx)
+        top_movies, top_scores = top_movies[:top_n], top_scores[:top_n]
+    else:
+        # Hitung kemiripan dari daftar tetangga film input
+        row = cosine_sim[idx]
+        candidates = row.indices
+        scores = row.data
+
+        # 10 teratas (selain dirinya sendiri)
+        top = top_n_indices(scores, top_n, exclude=candidates == idx, ids=candidates)
+        top_movies, top_scores = candidates[top], scores[top]
+
+    # Tampilkan sebagai DataFrame
+    return pd.DataFrame({
+        "Title": movie_titles[top_movies],
+        "Genres": movie_genres[top_movies],
+        "Similarity": np.round(top_scores.astype(np.float64), 3)
+    })
+
+
+def recommend_for_user(user_id, movies, user_index, features, top_n=10, movie_titles=None, movie_genres=None):
+    movie_titles = movies['title'].to_numpy() if movie_titles is None else movie_titles
+    movie_genres = movies['genres'].to_numpy() if movie_genres is None else movie_genres
+
+    # Ambil film yang sudah dirating user dari indeks rating
+    user_movie_rows, user_ratings = user_index.get(user_id)
+
+    # Ambil indeks movie yang disukai user (rating tinggi)
+    liked_movie_indices = user_movie_rows[user_ratings >= 3.5]
+
+    if len(liked_movie_indices) == 0:
+        print("User belum memiliki rating cukup untuk rekomendasi.")
+        return pd.DataFrame()
+
+    # Ambil genre dari film yang disukai user
+    liked_genres = movie_genres[liked_movie_indices]
+    all_genres = '|'.join(liked_genres)
+    genre_list = all_genres.split('|')
+
+    # Hitung genre yang paling sering muncul
+    genre_count = Counter(genre_list)
+    top_genres = genre_count.most_common(5)
+
+    # Tampilkan preferensi genre user
+    print(f"\nUser {user_id} menyukai genre:")
+    for genre, count in top_genres:
+        print(f"- {genre} ({count} film)")
+
+    # Kemiripan rata-rata antara film yang disukai user dengan semua film: profil (rata-rata fitur
+    # ternormalisasi film yang disukai) dikalikan dengan fitur seluruh film
+    profile = np.asarray(features[liked_movie_indices].mean(axis=0)).ravel()
+    sim_scores = features @ profile
+
+    # Tandai film yang sudah ditonton user agar tidak direkomendasikan lagi
+    watched = np.zeros(len(movies), dtype=bool)
+    watched[user_movie_rows] = True
+
+    # Pilih top_n film dengan skor similarity tertinggi
+    top = top_n_indices(sim_scores, top_n, exclude=watched)
+
+    return pd.DataFrame({
+        'Title': movie_titles[top],
+        'Genres': movie_genres[top],
+        'Similarity': np.round(sim_scores[top].astype(np.float64), 3)
+    })
+
+
+def recommend_for_users(user_ids, movies, user_index, features, top_n=10, batch_size=1024):
+    user_ids = np.asarray(user_ids)
+    n_users, n_movies = len(user_ids), len(movies)
+
+    # Ambil rating seluruh pengguna dari indeks (baris = posisi di user_ids, kolom = indeks film)
+    rows, cols, user_ratings = user_index.gather(user_ids)
+
+    # Matriks film yang sudah ditonton setiap pengguna
+    watched = sp.csr_matrix((np.ones(len(rows), dtype=bool), (rows, cols)), shape=(n_users, n_movies))
+
+    # Matriks pengguna x film yang disukai, dinormalisasi agar perkalian menghasilkan rata-rata similaritas
+    liked = user_ratings >= 3.5
+    liked_matrix = sp.csr_matrix((np.ones(liked.sum(), dtype=np.float32), (rows[liked], cols[liked])),
+                                 shape=(n_users, n_movies))
+    liked_count = np.asarray(liked_matrix.sum(axis=1)).ravel()
+    inv_count = np.divide(1.0, liked_count, out=np.zeros_like(liked_count), where=liked_count > 0)
+    liked_matrix = sp.diags(inv_count.astype(np.float32)) @ liked_matrix
+
+    top_n = min(top_n, n_movies)
+    rec_movie_ids = np.full((n_users, top_n), -1, dtype=np.int64)
+    rec_scores = np.full((n_users, top_n), np.nan, dtype=np.float32)
+    movie_id_array = movies['movieId'].to_numpy()
+
+    # Pengguna diproses per batch agar matriks skor padat tetap kecil
+    for start in range(0, n_users, batch_size):
+        stop = min(start + batch_size, n_users)
+        # Profil pengguna (pengguna x fitur) lalu skor eksak terhadap seluruh film
+        profiles = liked_matrix[start:stop] @ features
+        scores = (profiles @ features.T).toarray().astype(np.float32)
+        scores[watched[start:stop].toarray()] = -np.inf
+        scores[liked_count[start:stop] == 0] = -np.inf
+
+        # Seleksi top-N untuk setiap baris sekaligus, seri diputus seperti recommend_for_user
+        top, top_scores = top_n_rows(scores, top_n)
+
+        valid = np.isfinite(top_scores)
+        rec_movie_ids[start:stop][valid] = movie_id_array[top[valid]]
+        rec_scores[start:stop][valid] = top_scores[valid]
+
+    return rec_movie_ids, rec_scores
+
+
+def predict_rating_content(user_id, target_movie_id, user_index, movie_id_to_row, features):
+    # Get all movies rated by the user
+    rated_rows, rated_scores = user_index.get(user_id)
+
+    if len(rated_rows) == 0:
+        return np.nan  # can't predict
+
+    # Get movie index
+    target_idx = movie_id_to_row[target_movie_id]
+
+    # Similarity between the target movie and every rated movie, from the normalized features
+    sim_scores = (features[rated_rows] @ features[target_idx].T).toarray().ravel()
+
+    if np.sum(sim_scores) == 0:
+        return np.nan
+    return np.sum(rated_scores * sim_scores) / np.sum(sim_scores)
+
+
+def evaluate_content_predictions(test_data, user_index, movie_id_to_row, features, batch_size=256):
+    # Map movieId to row index once
+    target_cols = movie_id_to_row.reindex(test_data['movieId'].to_numpy()).to_numpy(dtype=np.float64)
+
+    # Group the test set by user
+    test_users, test_codes = np.unique(test_data['userId'].to_numpy(), return_inverse=True)
+
+    # Sparse user x movie rating matrix (and its 0/1 mask) for the users being evaluated
+    rows, cols, values = user_index.gather(test_users)
+    shape = (len(test_users), features.shape[0])
+    rating_matrix = sp.csr_matrix((values.astype(np.float64), (rows, cols)), shape=shape)
+    rated_matrix = sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=shape)
+
+    # sim(t, j) = Xn[t] . Xn[j], so sum_j rating(u, j) * sim(t, j) = (R @ Xn)[u] . Xn[t]
+    weighted_profiles = (rating_matrix @ features).tocsr()
+    rated_profiles = (rated_matrix @ features).tocsr()
+
+    predictions = np.full(len(test_data), np.nan)
+    order = np.argsort(test_codes, kind='stable')
+    sorted_codes = test_codes[order]
+
+    for start in range(0, len(test_users), batch_size):
+        stop = min(start + batch_size, len(test_users))
+        lo, hi = np.searchsorted(sorted_codes, [start, stop])
+        batch_rows = order[lo:hi]
+        batch_rows = batch_rows[~np.isnan(target_cols[batch_rows])]
+
+        # Similarity-weighted sums only for the (user, movie) pairs in this batch of users
+        pair_users = test_codes[batch_rows]
+        target = features[target_cols[batch_rows].astype(np.int64)]
+        numerator = np.asarray(weighted_profiles[pair_users].multiply(target).sum(axis=1)).ravel()
+        denominator = np.asarray(rated_profiles[pair_users].multiply(target).sum(axis=1)).ravel()
+
+        # Same as predict_rating_content: no prediction when the similarity sum is zero
+        with np.errstate(divide='ignore', invalid='ignore'):
+            predictions[batch_rows] = np.where(denominator != 0, numerator / denominator, np.nan)
+
+    return predictions
@@ -0,0 +1,181 @@
+"""Pemuatan dataset MovieLens (movies.csv, ratings.csv, dan tags.csv).
+
+CSV hanya di-parse sekali, lalu setiap kolom disimpan sebagai array ``.npy`` dengan tipe
+data ringkas di ``<direktori csv>/.cache/<nama file>/``. Pemanggilan berikutnya memuat
+array tersebut secara langsung. Cache dibangun ulang jika ukuran, mtime, dan hash CSV
+berubah, atau jika skema tipe data berubah. Lokasi cache dapat dipindahkan dengan
+``cache_dir`` (misalnya saat direktori data read-only); jika cache tidak dapat ditulis,
+DataFrame hasil parsing tetap dikembalikan.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data')
+CACHE_DIR_NAME = '.cache'
+CACHE_FORMAT = 1
+
+# userId dan movieId muat dalam int32 dan rating dalam float32, sehingga memori kira-kira separuh dari default int64/float64
+RATINGS_DTYPES = {'userId': 'int32', 'movieId': 'int32', 'rating': 'float32', 'timestamp': 'int64'}
+# Kombinasi genre jauh lebih sedikit daripada jumlah film, sehingga disimpan sebagai kategori
+MOVIES_DTYPES = {'movieId': 'int32', 'genres': 'category'}
+TAGS_DTYPES = {'userId': 'int32', 'movieId': 'int32', 'timestamp': 'int64'}
+
+
+def load_movies(path=None, cache=True, cache_dir=None):
+    return load_csv(path or os.path.join(DATA_DIR, 'movies.csv'), MOVIES_DTYPES, cache=cache, cache_dir=cache_dir)
+
+
+def load_ratings(path=None, cache=True, cache_dir=None):
+    return load_csv(path or os.path.join(DATA_DIR, 'ratings.csv'), RATINGS_DTYPES, cache=cache, cache_dir=cache_dir)
+
+
+def load_tags(path=None, cache=True, cache_dir=None):
+    return load_csv(path or os.path.join(DATA_DIR, 'tags.csv'), TAGS_DTYPES, cache=cache, cache_dir=cache_dir)
+
+
+def load_csv(path, dtypes, cache=True, cache_dir=None):
+    if not cache:
+        return pd.read_csv(path, dtype=dtypes)
+
+    target = cache_path(path, cache_dir)
+    manifest = _read_manifest(target)
+    if manifest is not None and _cache_is_valid(target, manifest, path, dtypes):
+        try:
+            return _load_columns(target, manifest)
+        except (OSError, ValueError):
+            # Cache sedang diganti oleh proses lain atau rusak: parse ulang CSV
+            pass
+
+    df = pd.read_csv(path, dtype=dtypes)
+    try:
+        _save_columns(df, target, path, dtypes)
+    except OSError:
+        # Direktori cache tidak dapat ditulis (misalnya /kaggle/input): lanjut tanpa cache
+        pass
+    return df
+
+
+def cache_path(path, cache_dir=None):
+    # Default <direktori csv>/.cache/<nama file>; cache_dir mengganti <direktori csv>/.cache
+    path = os.path.abspath(path)
+    name = os.path.splitext(os.path.basename(path))[0]
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(path), CACHE_DIR_NAME)
+    return os.path.join(cache_dir, name)
+
+
+def _file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _source_stat(path):
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def _read_manifest(cache_dir):
+    try:
+        with open(os.path.join(cache_dir, 'manifest.json')) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(cache_dir, manifest):
+    tmp = os.path.join(cache_dir, f".manifest.json.{os.getpid()}.tmp")
+    with open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(cache_dir, 'manifest.json'))
+
+
+def _cache_is_valid(cache_dir, manifest, path, dtypes):
+    if manifest.get('format') != CACHE_FORMAT or manifest.get('dtypes') != dtypes:
+        return False
+
+    stat = _source_stat(path)
+    if stat == manifest['source']:
+        return True
+    if stat['size'] != manifest['source']['size']:
+        return False
+
+    # mtime berubah tetapi ukuran sama (misalnya file disalin ulang): bandingkan isi dengan hash
+    if _file_digest(path) != manifest['sha256']:
+        return False
+    manifest['source'] = stat
+    try:
+        _write_manifest(cache_dir, manifest)
+    except OSError:
+        # Cache read-only tetap dapat dipakai; hash akan dihitung ulang pada pemanggilan berikutnya
+        pass
+    return True
+
+
+def _save_columns(df, cache_dir, path, dtypes):
+    # Tulis ke direktori sementara milik proses ini lalu rename, sehingga pembaca tidak pernah melihat
+    # cache setengah jadi dan dua proses yang membangun cache bersamaan tidak saling menimpa
+    parent = os.path.dirname(cache_dir)
+    os.makedirs(parent, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=f".{os.path.basename(cache_dir)}.", suffix='.tmp', dir=parent)
+    try:
+        _write_columns(df, staging, path, dtypes)
+        shutil.rmtree(cache_dir, ignore_errors=True)
+        os.replace(staging, cache_dir)
+    except OSError:
+        shutil.rmtree(staging, ignore_errors=True)
+        # Proses lain sudah lebih dulu memasang cache yang lengkap
+        if os.path.isdir(cache_dir):
+            return
+        raise
+
+
+def _write_columns(df, staging, path, dtypes):
+
+    columns = {}
+    for name in df.columns:
+        column = df[name]
+        if isinstance(column.dtype, pd.CategoricalDtype):
+            # Kolom kategori disimpan sebagai kode integer dan daftar kategori
+            np.save(os.path.join(staging, f"{name}.codes.npy"), column.cat.codes.to_numpy())
+            np.save(os.path.join(staging, f"{name}.categories.npy"),
+                    np.array(column.cat.categories.to_numpy(), dtype=str))
+            columns[name] = 'category'
+        elif column.dtype == object or pd.api.types.is_string_dtype(column.dtype):
+            np.save(os.path.join(staging, f"{name}.npy"), np.array(column.to_numpy(), dtype=str))
+            columns[name] = 'str'
+        else:
+            np.save(os.path.join(staging, f"{name}.npy"), column.to_numpy())
+            columns[name] = column.dtype.str
+
+    manifest = {
+        'format': CACHE_FORMAT,
+        'source': _source_stat(path),
+        'sha256': _file_digest(path),
+        'dtypes': dtypes,
+        'rows': len(df),
+        'columns': columns,
+    }
+    _write_manifest(staging, manifest)
+
+
+def _load_columns(cache_dir, manifest):
+    data = {}
+    for name, kind in manifest['columns'].items():
+        if kind == 'category':
+            codes = np.load(os.path.join(cache_dir, f"{name}.codes.npy"))
+            categories = np.load(os.path.join(cache_dir, f"{name}.categories.npy")).astype(object)
+            data[name] = pd.Categorical.from_codes(codes, categories=categories)
+        elif kind == 'str':
+            data[name] = np.load(os.path.join(cache_dir, f"{name}.npy")).astype(object)
+        else:
+            data[name] = np.load(os.path.join(cache_dir, f"{name}.npy"))
+    return pd.DataFrame(data)
@@ -0,0 +1,412 @@
+"""Exploratory Data Analysis dataset MovieLens.
+
+Fungsi ``*_table`` hanya menghitung tabel tanpa menggambar grafik, sedangkan fungsi ``plot_*``
+menggambar grafiknya. Agregasi per genre dihitung sebagai perkalian matriks sparse
+dengan matriks insiden film x genre (``genre_matrix``), bukan pencarian substring
+``str.contains`` per genre. matplotlib dan seaborn baru di-import saat grafik pertama
+dibuat, sehingga modul ini aman di-import oleh kode serving.
+
+Jalankan seluruh EDA dengan ``python -m recommender.eda``.
+"""
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from recommender.features import build_genre_matrix, build_movie_features, movie_rating_stats
+
+
+def _pyplot():
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    return plt, sns
+
+
+def prepare_eda_data(movies, ratings, movie_id_to_row=None):
+    # Tidak ada DataFrame gabungan rating x film: fitur dihitung per film lalu di-join melalui indeks baris film
+    if movie_id_to_row is None:
+        movie_id_to_row = pd.Series(np.arange(len(movies)), index=movies['movieId'].to_numpy())
+    rating_rows = movie_id_to_row.reindex(ratings['movieId'].to_numpy()).to_numpy()
+    if np.isnan(rating_rows.astype(np.float64)).any():
+        raise ValueError("ratings berisi movieId yang tidak ada di movies")
+    rating_rows = rating_rows.astype(np.int64)
+
+    # Langkah 1 dan 3: tahun rilis (str.extract) dan jumlah genre (matriks multi-hot) per film
+    genre_names, genre_matrix = build_genre_matrix(movies['genres'])
+    movie_stats = build_movie_features(movies, genre_matrix)
+
+    # Langkah 2: jumlah dan rating rata-rata per film
+    rating_stats = movie_rating_stats(rating_rows, ratings['rating'].to_numpy(np.float64), len(movies))
+    movie_stats['mean'] = rating_stats['mean'].to_numpy()
+    movie_stats['count'] = rating_stats['count'].to_numpy()
+
+    # Langkah 4: frekuensi genre di seluruh baris rating (setiap film dibobot dengan jumlah ratingnya)
+    genre_totals = genre_matrix.T @ movie_stats['count'].to_numpy(np.float32)
+    genres_count = Counter({genre: int(total) for genre, total in zip(genre_names, genre_totals) if total > 0})
+    return movie_stats, rating_rows, genre_names, genre_matrix, genres_count
+
+
+def _genre_columns(genre_names, genre_matrix, genres):
+    # Kolom matriks insiden untuk genre yang diminta, dicocokkan secara persis dengan nama genre
+    position = {genre: i for i, genre in enumerate(genre_names)}
+    genres = list(genres)
+    return genres, genre_matrix[:, [position[genre] for genre in genres]]
+
+
+def _movie_rating_sums(movie_stats):
+    # Total dan jumlah rating per film (film tanpa rating bernilai 0)
+    count = movie_stats['count'].to_numpy(np.float64)
+    return np.nan_to_num(movie_stats['mean'].to_numpy(np.float64)) * count, count
+
+
+def _year_incidence(movie_stats, start_year, end_year):
+    # Matriks one-hot film x tahun untuk film yang dirilis dalam rentang tahun
+    years = movie_stats['year'].to_numpy()
+    keep = np.flatnonzero((years >= start_year) & (years <= end_year))
+    year_values = np.arange(start_year, end_year + 1)
+    year_matrix = sp.csr_matrix((np.ones(len(keep)), (keep, (years[keep] - start_year).astype(np.int64))),
+                                shape=(len(years), len(year_values)))
+    return year_values, year_matrix
+
+
+def _long_table(index_name, index_values, genres, columns, present):
+    # Mengubah matriks (baris x genre) menjadi tabel panjang, hanya untuk sel yang memiliki data
+    rows, cols = np.nonzero(present)
+    table = pd.DataFrame({index_name: index_values[rows], 'genre': np.asarray(genres, dtype=object)[cols]})
+    for name, values in columns.items():
+        table[name] = values[rows, cols]
+    return table
+
+
+def set_style():
+    plt, sns = _pyplot()
+    plt.style.use('ggplot')
+    sns.set(style="whitegrid")
+
+
+def plot_rating_distribution(ratings):
+    plt, sns = _pyplot()
+    plt.figure(figsize=(10, 6))
+    sns.histplot(ratings['rating'], bins=10, kde=True)
+    plt.title('Distribusi Rating Film', fontsize=16)
+    plt.xlabel('Rating', fontsize=12)
+    plt.ylabel('Frekuensi', fontsize=12)
+    plt.xticks([0.5, 1, 1.5, 2, 2.5, 3, 3.5, 4, 4.5, 5])
+    plt.show()
+
+    # Statistik ringkasan untuk rating
+    print("Statistik Ringkasan Peringkat:")
+    print(ratings['rating'].describe())
+
+
+def genre_frequency_table(genres_count):
+    top_genres = dict(sorted(genres_count.items(), key=lambda x: x[1], reverse=True))
+    return pd.DataFrame({'genre': list(top_genres.keys()), 'count': list(top_genres.values())})
+
+
+def plot_genre_distribution(genre_df, movie_stats):
+    plt, sns = _pyplot()
+
+    # Visualisasi 15 genre teratas
+    plt.figure(figsize=(12, 8))
+    sns.barplot(x='count', y='genre', data=genre_df.head(15), palette='viridis')
+    plt.title('15 Genre Film Teratas', fontsize=16)
+    plt.xlabel('Jumlah Film', fontsize=12)
+    plt.ylabel('Genre', fontsize=12)
+    plt.tight_layout()
+    plt.show()
+
+    # Distribusi jumlah genre per film
+    movie_with_genre_count = movie_stats[movie_stats['count'] > 0]
+
+    plt.figure(figsize=(10, 6))
+    sns.countplot(x='genre_count', data=movie_with_genre_count, palette='viridis')
+    plt.title('Jumlah Genre per Film', fontsize=16)
+    plt.xlabel('Jumlah Genre', fontsize=12)
+    plt.ylabel('Jumlah Film', fontsize=12)
+    plt.show()
+
+
+def plot_release_year_distribution(movie_stats):
+    plt, sns = _pyplot()
+    # Setiap film dibobot dengan jumlah ratingnya, sama seperti histogram di atas baris rating
+    rated = movie_stats[(movie_stats['count'] > 0) & movie_stats['year'].notna()]
+    plt.figure(figsize=(14, 6))
+    sns.histplot(x=rated['year'], weights=rated['count'], bins=30, kde=True)
+    plt.title('Distribusi Tahun Rilis Film', fontsize=16)
+    plt.xlabel('Tahun Rilis', fontsize=12)
+    plt.ylabel('Jumlah Film', fontsize=12)
+    plt.xticks(rotation=45)
+    plt.grid(True, alpha=0.3)
+    plt.show()
+
+    # Statistik ringkasan untuk tahun rilis
+    print("Statistik Ringkasan Tahun Rilis:")
+    print(movie_stats['year'].describe())
+
+
+def plot_activity_distribution(ratings):
+    plt, sns = _pyplot()
+
+    # Distribusi aktivitas pengguna
+    user_activity = ratings.groupby('userId').size().reset_index(name='ratings_count')
+
+    plt.figure(figsize=(12, 6))
+    sns.histplot(user_activity['ratings_count'], bins=30, kde=True)
+    plt.title('Distribusi Peringkat per Pengguna', fontsize=16)
+    plt.xlabel('Jumlah Rating', fontsize=12)
+    plt.ylabel('Jumlah User', fontsize=12)
+    plt.grid(True, alpha=0.3)
+    plt.show()
+
+    # Distribusi popularitas film
+    movie_popularity = ratings.groupby('movieId').size().reset_index(name='ratings_count')
+
+    plt.figure(figsize=(12, 6))
+    sns.histplot(movie_popularity['ratings_count'], bins=30, kde=True)
+    plt.title('Distribusi Rating per Film', fontsize=16)
+    plt.xlabel('Jumlah Rating', fontsize=12)
+    plt.ylabel('Jumlah Film', fontsize=12)
+    plt.grid(True, alpha=0.3)
+    plt.show()
+
+    print("Ringkasan Aktivitas User:")
+    print(user_activity['ratings_count'].describe())
+
+    print("\nRingkasan Popularitas Film:")
+    print(movie_popularity['ratings_count'].describe())
+
+
+def genre_rating_table(movie_stats, genre_names, genre_matrix, genres=None):
+    genres, incidence = _genre_columns(genre_names, genre_matrix, genre_names if genres is None else genres)
+    sums, counts = _movie_rating_sums(movie_stats)
+
+    # Rating rata-rata semua rating pada film-film dalam genre tersebut
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_rating = (incidence.T @ sums) / (incidence.T @ counts)
+    genre_ratings_df = pd.DataFrame({'genre': genres, 'avg_rating': avg_rating,
+                                     'movie_count': incidence.getnnz(axis=0)})
+    return genre_ratings_df.sort_values(by='avg_rating', ascending=False)
+
+
+def plot_genre_ratings(genre_ratings_df):
+    plt, sns = _pyplot()
+    plt.figure(figsize=(12, 8))
+    sns.barplot(x='avg_rating', y='genre', data=genre_ratings_df, palette='viridis')
+    plt.title('Rating Rata-rata berdasarkan Genre', fontsize=16)
+    plt.xlabel('Rating Rata-rata', fontsize=12)
+    plt.ylabel('Genre', fontsize=12)
+    plt.xlim(3, 4.5)  # Fokus pada rentang di mana sebagian besar nilai berada
+    plt.grid(True, alpha=0.3)
+    plt.show()
+
+
+def year_rating_table(ratings, movie_stats, rating_rows, min_count=10):
+    # Tahun rilis setiap rating diambil dari fitur film melalui indeks baris film
+    rating_years = movie_stats['year'].to_numpy()[rating_rows]
+    year_ratings = ratings['rating'].groupby(rating_years).agg(['mean', 'count'])
+    year_ratings = year_ratings.rename_axis('year').reset_index()
+    # Memfilter tahun yang memiliki setidaknya min_count rating untuk hasil yang lebih andal
+    return year_ratings[year_ratings['count'] >= min_count]
+
+
+def plot_year_ratings(year_ratings_filtered):
+    plt, sns = _pyplot()
+    plt.figure(figsize=(14, 6))
+    sns.lineplot(x='year', y='mean', data=year_ratings_filtered)
+    plt.title('Rating Rata-rata berdasarkan Tahun Rilis', fontsize=16)
+    plt.xlabel('Tahun Rilis', fontsize=12)
+    plt.ylabel('Rating Rata-rata', fontsize=12)
+    plt.grid(True, alpha=0.3)
+    plt.show()
+
+
+def weighted_corr(x, y, weights):
+    cov = np.cov(x, y, aweights=weights)
+    return cov[0, 1] / np.sqrt(cov[0, 0] * cov[1, 1])
+
+
+def plot_popularity_vs_rating(movie_stats, ratings):
+    plt, sns = _pyplot()
+
+    # Hubungan antara popularitas film dan rating rata-rata
+    rated = movie_stats[movie_stats['count'] > 0]
+    plt.figure(figsize=(10, 6))
+    sns.scatterplot(x='count', y='mean', data=rated, alpha=0.5)
+    plt.title('Popularitas Film vs Rating Rata-rata', fontsize=16)
+    plt.xlabel('Jumlah Rating (Popularitas)', fontsize=12)
+    plt.ylabel('Rating Rata-rata', fontsize=12)
+    plt.xscale('log')  # Menggunakan skala logaritmik untuk visualisasi yang lebih baik
+    plt.grid(True, alpha=0.3)
+    plt.show()
+
+    # Korelasi di atas baris rating: setiap film dibobot dengan jumlah ratingnya
+    correlation = weighted_corr(rated['count'], rated['mean'], rated['count'])
+    print(f"Korelasi antara jumlah rating dan rating rata-rata: {correlation:.4f}")
+
+    # Hubungan antara aktivitas pengguna dan rating rata-rata yang diberikan
+    user_avg_rating = ratings.groupby('userId').agg({'rating': ['mean', 'count']}).reset_index()
+    user_avg_rating.columns = ['userId', 'avg_rating', 'num_ratings']
+
+    plt.figure(figsize=(10, 6))
+    sns.scatterplot(x='num_ratings', y='avg_rating', data=user_avg_rating, alpha=0.5)
+    plt.title('Aktivitas Pengguna vs Rating Rata-rata yang Diberikan', fontsize=16)
+    plt.xlabel('Jumlah Rating oleh Pengguna', fontsize=12)
+    plt.ylabel('Rating Rata-rata yang Diberikan', fontsize=12)
+    plt.xscale('log')  # Menggunakan skala logaritmik untuk visualisasi yang lebih baik
+    plt.grid(True, alpha=0.3)
+    plt.show()
+
+    corr_user = user_avg_rating['num_ratings'].corr(user_avg_rating['avg_rating'])
+    print(f"Korelasi antara aktivitas pengguna dan rating rata-rata yang diberikan: {corr_user:.4f}")
+
+
+def genre_year_table(movie_stats, genre_names, genre_matrix, genres, start_year=1980, end_year=2000):
+    genres, incidence = _genre_columns(genre_names, genre_matrix, genres)
+    year_values, year_matrix = _year_incidence(movie_stats, start_year, end_year)
+
+    # Jumlah film per (tahun, genre)
+    counts = (year_matrix.T @ incidence).toarray()
+    table = _long_table('year', year_values.astype(np.float64), genres, {'count': counts.astype(np.int64)}, counts > 0)
+    return table[['year', 'count', 'genre']]
+
+
+def plot_genre_trend(genre_year_df):
+    plt, sns = _pyplot()
+    plt.figure(figsize=(14, 8))
+    sns.lineplot(x='year', y='count', hue='genre', data=genre_year_df)
+    plt.title('Tren 5 Genre Teratas Sepanjang Waktu', fontsize=16)
+    plt.xlabel('Tahun Rilis', fontsize=12)
+    plt.ylabel('Jumlah Film', fontsize=12)
+    plt.legend(title='Genre')
+    plt.grid(True, alpha=0.3)
+    plt.show()
+
+
+def genre_rating_year_table(movie_stats, genre_names, genre_matrix, genres, start_year=1980, end_year=2000):
+    genres, incidence = _genre_columns(genre_names, genre_matrix, genres)
+    year_values, year_matrix = _year_incidence(movie_stats, start_year, end_year)
+    sums, counts = _movie_rating_sums(movie_stats)
+
+    # Total dan jumlah rating per (tahun, genre), lalu rata-ratanya
+    rating_sums = (year_matrix.T @ sp.diags(sums) @ incidence).toarray()
+    rating_counts = (year_matrix.T @ sp.diags(counts) @ incidence).toarray()
+    present = rating_counts > 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rating = rating_sums / rating_counts
+    table = _long_table('year', year_values.astype(np.float64), genres, {'rating': rating}, present)
+    return table[['year', 'rating', 'genre']]
+
+
+def plot_genre_rating_trend(genre_rating_year_df):
+    plt, sns = _pyplot()
+    plt.figure(figsize=(14, 8))
+    sns.lineplot(x='year', y='rating', hue='genre', data=genre_rating_year_df)
+    plt.title('Rating Rata-rata 5 Genre Teratas Sepanjang Waktu', fontsize=16)
+    plt.xlabel('Tahun Rilis', fontsize=12)
+    plt.ylabel('Rating Rata-rata', fontsize=12)
+    plt.legend(title='Genre')
+    plt.grid(True, alpha=0.3)
+    plt.show()
+
+
+def user_genre_table(user_index, genre_names, genre_matrix, user_ids, genres):
+    genres, incidence = _genre_columns(genre_names, genre_matrix, genres)
+    user_ids = np.asarray(user_ids)
+
+    # Matriks rating pengguna x film untuk pengguna yang diminta
+    rows, cols, values = user_index.gather(user_ids)
+    shape = (len(user_ids), genre_matrix.shape[0])
+    rating_matrix = sp.csr_matrix((values.astype(np.float64), (rows, cols)), shape=shape)
+    rated_matrix = sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=shape)
+
+    # Total dan jumlah rating setiap pengguna per genre
+    rating_sums = (rating_matrix @ incidence).toarray()
+    num_ratings = (rated_matrix @ incidence).toarray()
+    with np.errstate(divide='ignore', invalid='ignore'):
+        avg_rating = rating_sums / num_ratings
+    return _long_table('userId', user_ids, genres,
+                       {'avg_rating': avg_rating, 'num_ratings': num_ratings.astype(np.int64)}, num_ratings > 0)
+
+
+def plot_user_genre_heatmap(user_genre_df):
+    plt, sns = _pyplot()
+
+    # Membuat heatmap preferensi pengguna-genre
+    pivot_df = user_genre_df.pivot(index='userId', columns='genre', values='avg_rating')
+
+    plt.figure(figsize=(12, 10))
+    sns.heatmap(pivot_df, annot=True, cmap='viridis', fmt='.1f', cbar_kws={'label': 'Rating Rata-rata'})
+    plt.title(f'Heatmap Preferensi Genre Pengguna (Sampel {len(pivot_df)} Pengguna)', fontsize=16)
+    plt.ylabel('ID Pengguna', fontsize=12)
+    plt.xlabel('Genre', fontsize=12)
+    plt.tight_layout()
+    plt.show()
+
+
+def genre_combo_table(movies, movie_stats, top=10):
+    # Kombinasi genre yang paling umum, berdasarkan jumlah film
+    combo_values = pd.Series(movies['genres'].to_numpy(dtype=object))
+    genre_combos = combo_values.value_counts().head(top).rename_axis('genre_combo').reset_index(name='count')
+
+    # Total dan jumlah rating per kombinasi dihitung sekali dengan groupby, bukan isin per kombinasi
+    sums, counts = _movie_rating_sums(movie_stats)
+    combo_ratings = pd.DataFrame({'rating_sum': sums, 'num_ratings': counts}).groupby(combo_values).sum()
+    combo_ratings = combo_ratings.reindex(genre_combos['genre_combo'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        genre_combos['avg_rating'] = np.where(combo_ratings['num_ratings'] > 0,
+                                              combo_ratings['rating_sum'] / combo_ratings['num_ratings'], np.nan)
+    genre_combos['num_ratings'] = combo_ratings['num_ratings'].to_numpy()
+
+    # Urutkan berdasarkan rating rata-rata
+    return genre_combos.sort_values(by='avg_rating', ascending=False)
+
+
+def plot_genre_combos(genre_combos):
+    plt, sns = _pyplot()
+    plt.figure(figsize=(14, 8))
+    sns.barplot(x='avg_rating', y='genre_combo', data=genre_combos, palette='viridis')
+    plt.title(f'Rating Rata-rata berdasarkan {len(genre_combos)} Kombinasi Genre Teratas', fontsize=16)
+    plt.xlabel('Rating Rata-rata', fontsize=12)
+    plt.ylabel('Kombinasi Genre', fontsize=12)
+    plt.grid(True, alpha=0.3)
+    plt.tight_layout()
+    plt.show()
+
+
+def main():
+    from recommender.data import load_movies, load_ratings
+    from recommender.index import build_movie_id_to_row, build_user_rating_index
+
+    movies_df = load_movies()
+    ratings_df = load_ratings()
+    movie_id_to_row = build_movie_id_to_row(movies_df)
+    movie_stats, rating_rows, genre_names, genre_matrix, genres_count = prepare_eda_data(movies_df, ratings_df, movie_id_to_row)
+    user_index = build_user_rating_index(ratings_df, movie_id_to_row)
+
+    set_style()
+
+    # Analisis univariat
+    plot_rating_distribution(ratings_df)
+    genre_df = genre_frequency_table(genres_count)
+    plot_genre_distribution(genre_df, movie_stats)
+    plot_release_year_distribution(movie_stats)
+    plot_activity_distribution(ratings_df)
+
+    # Analisis bivariat
+    plot_genre_ratings(genre_rating_table(movie_stats, genre_names, genre_matrix, genres_count.keys()))
+    plot_year_ratings(year_rating_table(ratings_df, movie_stats, rating_rows))
+    plot_popularity_vs_rating(movie_stats, ratings_df)
+
+    # Analisis multivariat
+    top_5_genres = list(genre_df.head(5)['genre'])
+    plot_genre_trend(genre_year_table(movie_stats, genre_names, genre_matrix, top_5_genres))
+    plot_genre_rating_trend(genre_rating_year_table(movie_stats, genre_names, genre_matrix, top_5_genres))
+    sample_users = np.random.choice(ratings_df['userId'].unique(), size=20, replace=False)
+    plot_user_genre_heatmap(user_genre_table(user_index, genre_names, genre_matrix, sample_users, top_5_genres))
+    plot_genre_combos(genre_combo_table(movies_df, movie_stats))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""Evaluasi ranking top-N: precision@k, recall@k, NDCG, MAP, coverage, dan novelty.
+
+Input berupa keluaran batch recommender berukuran (n_users, k) berisi id film (nilai
+negatif sebagai padding, seperti ``recommend_for_users``) dan indeks interaksi held-out per
+pengguna. Setiap pasangan (pengguna, film) dikodekan menjadi satu kunci integer, sehingga
+irisan rekomendasi dengan item relevan cukup berupa ``searchsorted`` pada array kunci yang
+terurut. Pengguna dapat dibagi ke beberapa thread karena operasi NumPy melepas GIL.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from recommender.index import UserRatingIndex
+
+
+def relevant_items(test_data, threshold=3.5, item_column='movieId'):
+    # Interaksi held-out dengan rating >= threshold dianggap relevan
+    relevant = test_data[test_data['rating'] >= threshold]
+    return UserRatingIndex(relevant['userId'].to_numpy(), relevant[item_column].to_numpy(),
+                           relevant['rating'].to_numpy())
+
+
+def item_popularity(user_index):
+    # Proporsi pengguna yang berinteraksi dengan setiap item, untuk menghitung novelty
+    items, counts = np.unique(user_index.items, return_counts=True)
+    return pd.Series(counts / max(len(user_index), 1), index=items)
+
+
+def _hits(recommended, user_ids, relevant):
+    # Kunci (posisi pengguna, item) dari item relevan, diurutkan sekali
+    rows, items, _ = relevant.gather(user_ids)
+    n_relevant = np.bincount(rows, minlength=len(user_ids))
+    offset = int(max(items.max(initial=0), recommended.max(initial=0))) + 1
+    relevant_keys = np.sort(rows.astype(np.int64) * offset + items)
+
+    # Rekomendasi valid (bukan padding) dicari di antara kunci relevan
+    valid = recommended >= 0
+    if len(relevant_keys) == 0:
+        return np.zeros_like(valid), n_relevant
+    keys = np.arange(len(user_ids), dtype=np.int64)[:, None] * offset + np.where(valid, recommended, 0)
+    pos = np.minimum(np.searchsorted(relevant_keys, keys), len(relevant_keys) - 1)
+    return valid & (relevant_keys[pos] == keys), n_relevant
+
+
+def _user_metrics(recommended, user_ids, relevant):
+    k = recommended.shape[1]
+    hits, n_relevant = _hits(recommended, user_ids, relevant)
+    n_hits = hits.sum(axis=1)
+
+    # Diskon posisi 1 / log2(rank + 1) untuk DCG dan IDCG
+    discounts = 1.0 / np.log2(np.arange(2, k + 2))
+    dcg = hits @ discounts
+    ideal = np.concatenate([[0.0], np.cumsum(discounts)])[np.minimum(n_relevant, k)]
+
+    # Average precision: precision pada setiap posisi yang merupakan hit
+    precision_at = np.cumsum(hits, axis=1) / np.arange(1, k + 1)
+    ap_denominator = np.minimum(n_relevant, k)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return pd.DataFrame({
+            'userId': user_ids,
+            'n_relevant': n_relevant,
+            'hits': n_hits,
+            'precision': n_hits / k,
+            'recall': np.where(n_relevant > 0, n_hits / n_relevant, np.nan),
+            'ndcg': np.where(n_relevant > 0, dcg / ideal, np.nan),
+            'ap': np.where(n_relevant > 0, (precision_at * hits).sum(axis=1) / ap_denominator, np.nan),
+        })
+
+
+def user_ranking_metrics(recommended, user_ids, relevant, n_jobs=1, batch_size=4096):
+    recommended = np.asarray(recommended, dtype=np.int64)
+    user_ids = np.asarray(user_ids)
+    bounds = [(start, min(start + batch_size, len(user_ids))) for start in range(0, len(user_ids), batch_size)]
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+
+    if n_jobs > 1 and len(bounds) > 1:
+        with ThreadPoolExecutor(max_workers=n_jobs) as executor:
+            parts = list(executor.map(lambda b: _user_metrics(recommended[b[0]:b[1]], user_ids[b[0]:b[1]], relevant),
+                                      bounds))
+    else:
+        parts = [_user_metrics(recommended[start:stop], user_ids[start:stop], relevant) for start, stop in bounds]
+    return pd.concat(parts, ignore_index=True) if parts else _user_metrics(recommended, user_ids, relevant)
+
+
+def ranking_metrics(recommended, user_ids, relevant, n_items=None, popularity=None, n_jobs=1, batch_size=4096):
+    recommended = np.asarray(recommended, dtype=np.int64)
+    per_user = user_ranking_metrics(recommended, user_ids, relevant, n_jobs, batch_size)
+
+    # Pengguna tanpa item relevan di data uji tidak ikut dirata-ratakan
+    evaluated = per_user[per_user['n_relevant'] > 0]
+    k = recommended.shape[1]
+    results = {
+        f'precision@{k}': float(evaluated['precision'].mean()),
+        f'recall@{k}': float(evaluated['recall'].mean()),
+        f'ndcg@{k}': float(evaluated['ndcg'].mean()),
+        f'map@{k}': float(evaluated['ap'].mean()),
+        'users_evaluated': len(evaluated),
+    }
+
+    shown = recommended[recommended >= 0]
+    if n_items is not None:
+        # Proporsi katalog yang muncul setidaknya sekali di rekomendasi
+        results['coverage'] = len(np.unique(shown)) / n_items
+    if popularity is not None:
+        # Novelty: rata-rata -log2(popularitas) item yang direkomendasikan; item tanpa interaksi
+        # dianggap seolah memiliki satu interaksi
+        floor = popularity[popularity > 0].min() if (popularity > 0).any() else 1.0
+        probabilities = popularity.reindex(shown).fillna(floor).clip(lower=floor).to_numpy()
+        results['novelty'] = float(np.mean(-np.log2(probabilities))) if len(shown) else float('nan')
+    return results
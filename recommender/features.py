@@ -0,0 +1,112 @@
+"""Feature engineering film.
+
+Tahun rilis, matriks genre, vektor TF-IDF genre, serta fitur hashing yang
+menggabungkan genre, tag pengguna, dan tahun rilis.
+"""
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+
+def build_tfidf(genres):
+    from sklearn.feature_extraction.text import TfidfVectorizer
+
+    tfidf = TfidfVectorizer(token_pattern=r'[^|]+')  # karena genre dipisahkan dengan karakter "|"
+    tfidf_matrix = tfidf.fit_transform(genres)
+    return tfidf, tfidf_matrix
+
+
+def extract_years(titles):
+    # Tahun rilis dalam format (YYYY) di judul untuk seluruh kolom sekaligus; NaN jika tidak ditemukan
+    years = pd.Series(titles).str.rstrip().str.extract(r'\((\d{4})\)', expand=False)
+    return pd.to_numeric(years).astype(np.float64)
+
+
+def build_genre_matrix(genres):
+    # Matriks multi-hot film x genre; string genre hanya dipecah sekali untuk setiap kombinasi unik
+    combos = pd.Series(genres).astype('category')
+    dummies = combos.cat.categories.to_series().str.get_dummies('|')
+    matrix = sp.csr_matrix(dummies.to_numpy(dtype=np.float32))[combos.cat.codes.to_numpy()]
+    return list(dummies.columns), matrix
+
+
+def build_movie_features(movies, genre_matrix=None):
+    # Fitur tingkat film dihitung sekali per film, bukan per baris rating
+    if genre_matrix is None:
+        genre_matrix = build_genre_matrix(movies['genres'])[1]
+    return pd.DataFrame({
+        'movieId': movies['movieId'].to_numpy(),
+        'year': extract_years(movies['title']).to_numpy(),
+        'genre_count': np.diff(genre_matrix.indptr),
+    })
+
+
+def movie_rating_stats(rating_rows, ratings, n_movies):
+    # Jumlah dan rata-rata rating per baris film, di-join melalui indeks integer dengan bincount
+    count = np.bincount(rating_rows, minlength=n_movies)
+    total = np.bincount(rating_rows, weights=ratings, minlength=n_movies)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = total / count
+    return pd.DataFrame({'mean': mean, 'count': count})
+
+
+def _hash_tokens(token_lists, n_features):
+    from sklearn.feature_extraction import FeatureHasher
+
+    # Tanpa alternate_sign agar bobot token tetap positif dan cosine similarity tidak negatif
+    hasher = FeatureHasher(n_features=n_features, input_type='string', alternate_sign=False)
+    return hasher.transform(token_lists).tocsr().astype(np.float32)
+
+
+def _normalize_rows(matrix):
+    norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    inv = np.divide(1.0, norms, out=np.zeros_like(norms), where=norms > 0)
+    return sp.diags(inv.astype(np.float32)) @ matrix
+
+
+class ContentFeatureBuilder:
+    # Fitur konten berbasis hashing: genre, tag pengguna, serta tahun dan dekade rilis.
+    # Jumlah kolom tetap n_features berapa pun banyaknya tag unik, sehingga tag baru
+    # cukup ditambahkan ke matriks hitungan tanpa membangun ulang kosakata.
+    def __init__(self, movies, n_features=1 << 18, genre_weight=1.0, tag_weight=1.0, year_weight=0.5):
+        self.n_features = n_features
+        self.genre_weight = genre_weight
+        self.tag_weight = tag_weight
+        self.year_weight = year_weight
+        self.movie_id_to_row = pd.Series(np.arange(len(movies)), index=movies['movieId'].to_numpy())
+
+        genres = [[f"genre={genre}" for genre in value.split('|')] for value in movies['genres'].astype(str)]
+        self.genre_matrix = _hash_tokens(genres, n_features)
+
+        years = extract_years(movies['title'])
+        year_tokens = [[] if np.isnan(year) else [f"year={int(year)}", f"decade={int(year) // 10 * 10}"]
+                       for year in years]
+        self.year_matrix = _hash_tokens(year_tokens, n_features)
+
+        # Jumlah pengguna yang memberi setiap tag pada setiap film
+        self.tag_counts = sp.csr_matrix((len(movies), n_features), dtype=np.float32)
+
+    def add_tags(self, movie_ids, tags):
+        # Dapat dipanggil berulang kali saat tag baru masuk; mengembalikan baris film yang berubah
+        rows = self.movie_id_to_row.reindex(np.asarray(movie_ids)).to_numpy()
+        known = ~np.isnan(rows)
+        rows = rows[known].astype(np.int64)
+        tokens = [[f"tag={str(tag).strip().lower()}"] for tag in np.asarray(tags, dtype=object)[known]]
+        if not tokens:
+            return rows
+
+        hashed = _hash_tokens(tokens, self.n_features)
+        counts = np.diff(hashed.indptr)
+        update = sp.csr_matrix((hashed.data, (np.repeat(rows, counts), hashed.indices)), shape=self.tag_counts.shape)
+        self.tag_counts = self.tag_counts + update
+        return np.unique(rows)
+
+    def matrix(self):
+        # Setiap kelompok fitur dinormalisasi L2 lalu diberi bobot, sehingga banyaknya tag
+        # tidak menenggelamkan genre; hitungan tag diredam dengan log1p
+        tag_matrix = self.tag_counts.copy()
+        tag_matrix.data = np.log1p(tag_matrix.data)
+        combined = (self.genre_weight * _normalize_rows(self.genre_matrix)
+                    + self.tag_weight * _normalize_rows(tag_matrix)
+                    + self.year_weight * _normalize_rows(self.year_matrix))
+        return _normalize_rows(sp.csr_matrix(combined))
@@ -0,0 +1,97 @@
+"""Recommender hybrid: skor content-based dan collaborative dalam satu lintasan.
+
+Kandidat diambil dari tetangga (top-k cosine similarity) film yang disukai pengguna,
+ditambah kandidat opsional dari luar (misalnya hasil ``IVFInnerProductIndex``). Kedua skor
+hanya dihitung untuk kandidat tersebut, dinormalisasi ke [0, 1], dijumlahkan dengan bobot
+yang dapat diatur per permintaan, lalu diseleksi top-N satu kali. Bila kandidat yang belum
+ditonton kurang dari top-N (misalnya semua rating pengguna di bawah ambang suka), kandidat
+ditambah dari top-N collaborative, atau dari film terpopuler bila pengguna tidak memiliki
+embedding; untuk pengguna tersebut peringkat popularitas juga menggantikan skor collaborative.
+"""
+import numpy as np
+
+from recommender.ranking import normalize_scores, top_n_indices
+
+
+class HybridRecommender:
+    def __init__(self, cosine_sim, user_index, movie_id_to_row, user_to_index, user_embeddings, movie_embeddings,
+                 cf_movie_ids, content_weight=0.5, cf_weight=0.5, like_threshold=3.5, popular_rows=None):
+        self.cosine_sim = cosine_sim.tocsr()
+        # user_index memakai posisi baris movies_df, sama seperti recommend_for_user
+        self.user_index = user_index
+        self.user_to_index = user_to_index
+        self.user_embeddings = user_embeddings
+        self.movie_embeddings = movie_embeddings
+        self.content_weight = content_weight
+        self.cf_weight = cf_weight
+        self.like_threshold = like_threshold
+        # Baris movies_df terurut dari yang paling populer, cadangan untuk pengguna tanpa embedding
+        self.popular_rows = np.asarray([] if popular_rows is None else popular_rows, dtype=np.int64)
+        self.popular_scores = np.full(self.cosine_sim.shape[0], np.nan, dtype=np.float32)
+        self.popular_scores[self.popular_rows] = np.arange(len(self.popular_rows), 0, -1)
+
+        # Pemetaan baris movies_df -> indeks model; -1 untuk film tanpa embedding
+        cf_rows = movie_id_to_row.reindex(np.asarray(cf_movie_ids)).to_numpy()
+        known = ~np.isnan(cf_rows)
+        self.row_to_cf = np.full(self.cosine_sim.shape[0], -1, dtype=np.int64)
+        self.row_to_cf[cf_rows[known].astype(np.int64)] = np.flatnonzero(known)
+        # Kebalikannya, indeks model -> baris movies_df; -1 untuk film di luar katalog
+        self.cf_to_row = np.nan_to_num(cf_rows, nan=-1).astype(np.int64)
+
+    def candidates(self, liked_rows, extra_rows=None):
+        # Gabungan tetangga film yang disukai; skor content adalah rata-rata similaritas terhadapnya
+        neighbors = self.cosine_sim[liked_rows]
+        rows = neighbors.indices
+        sims = neighbors.data.astype(np.float64)
+        if extra_rows is not None:
+            extra_rows = np.asarray(extra_rows, dtype=rows.dtype)
+            rows = np.concatenate([rows, extra_rows])
+            sims = np.concatenate([sims, np.zeros(len(extra_rows))])
+        candidates, inverse = np.unique(rows, return_inverse=True)
+        content = np.bincount(inverse, weights=sims, minlength=len(candidates)) / max(len(liked_rows), 1)
+        return candidates, content
+
+    def collaborative_scores(self, user_id, candidates):
+        scores = np.full(len(candidates), np.nan, dtype=np.float32)
+        user_idx = self.user_to_index.get(user_id)
+        if user_idx is None:
+            # Pengguna tanpa embedding: peringkat popularitas menggantikan skor collaborative
+            return self.popular_scores[candidates]
+        cf_index = self.row_to_cf[candidates]
+        known = cf_index >= 0
+        scores[known] = self.movie_embeddings[cf_index[known]] @ self.user_embeddings[user_idx]
+        return scores
+
+    def fallback_candidates(self, user_id, n, rated_rows):
+        # Top-N collaborative di luar film yang sudah ditonton; tanpa embedding, film terpopuler
+        user_idx = self.user_to_index.get(user_id)
+        if user_idx is None:
+            return self.popular_rows[~np.isin(self.popular_rows, rated_rows)][:n]
+        scores = self.movie_embeddings @ self.user_embeddings[user_idx]
+        exclude = (self.cf_to_row < 0) | np.isin(self.cf_to_row, rated_rows)
+        return self.cf_to_row[top_n_indices(scores, n, exclude=exclude)]
+
+    def recommend(self, user_id, top_n=10, content_weight=None, cf_weight=None, extra_rows=None):
+        content_weight = self.content_weight if content_weight is None else content_weight
+        cf_weight = self.cf_weight if cf_weight is None else cf_weight
+
+        rated_rows, ratings = self.user_index.get(user_id)
+        liked_rows = rated_rows[ratings >= self.like_threshold]
+        candidates, content = self.candidates(liked_rows, extra_rows)
+
+        # Film yang sudah ditonton tidak ikut normalisasi maupun seleksi
+        watched = np.isin(candidates, rated_rows)
+        if len(candidates) - watched.sum() < top_n:
+            fallback = self.fallback_candidates(user_id, top_n, rated_rows)
+            extra_rows = fallback if extra_rows is None else np.concatenate([np.asarray(extra_rows), fallback])
+            candidates, content = self.candidates(liked_rows, extra_rows)
+            watched = np.isin(candidates, rated_rows)
+        if len(candidates) == 0:
+            return candidates, np.zeros(0, dtype=np.float32)
+
+        scores = content_weight * normalize_scores(content, watched)
+        if cf_weight:
+            scores = scores + cf_weight * normalize_scores(self.collaborative_scores(user_id, candidates), watched)
+
+        top = top_n_indices(scores, top_n, exclude=watched)
+        return candidates[top], scores[top]
@@ -0,0 +1,57 @@
+"""Indeks rating per pengguna dalam format CSR."""
+import numpy as np
+import pandas as pd
+
+
+class UserRatingIndex:
+    def __init__(self, user_ids, items, values):
+        user_ids = np.asarray(user_ids)
+        order = np.argsort(user_ids, kind='stable')
+
+        # userId unik beserta jumlah rating masing-masing
+        self.user_ids, counts = np.unique(user_ids[order], return_counts=True)
+        self.indptr = np.zeros(len(self.user_ids) + 1, dtype=np.int64)
+        np.cumsum(counts, out=self.indptr[1:])
+
+        # Indeks film dan rating yang sudah terurut berdasarkan userId
+        self.items = np.asarray(items)[order].astype(np.int32)
+        self.values = np.asarray(values)[order].astype(np.float32)
+        self.user_pos = {user_id: pos for pos, user_id in enumerate(self.user_ids.tolist())}
+
+    def __contains__(self, user_id):
+        return user_id in self.user_pos
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def get(self, user_id):
+        # Mengembalikan (indeks film, rating) milik satu pengguna
+        pos = self.user_pos.get(user_id)
+        if pos is None:
+            return self.items[:0], self.values[:0]
+        start, stop = self.indptr[pos], self.indptr[pos + 1]
+        return self.items[start:stop], self.values[start:stop]
+
+    def gather(self, user_ids):
+        # Mengembalikan (posisi pengguna dalam user_ids, indeks film, rating) untuk banyak pengguna sekaligus
+        pos = np.array([self.user_pos.get(user_id, -1) for user_id in user_ids], dtype=np.int64)
+        found = np.flatnonzero(pos >= 0)
+        starts = self.indptr[pos[found]]
+        counts = self.indptr[pos[found] + 1] - starts
+
+        rows = np.repeat(found, counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        entries = np.repeat(starts, counts) + offsets
+        return rows, self.items[entries], self.values[entries]
+
+
+# Pemetaan movieId -> posisi baris di movies_df
+def build_movie_id_to_row(movies):
+    return pd.Series(np.arange(len(movies)), index=movies['movieId'].to_numpy())
+
+
+# Membangun indeks rating pengguna dengan film direpresentasikan sebagai posisi baris di movies_df
+def build_user_rating_index(ratings, movie_id_to_row):
+    ratings = ratings[ratings['movieId'].isin(movie_id_to_row.index)]
+    movie_rows = movie_id_to_row.loc[ratings['movieId']].to_numpy()
+    return UserRatingIndex(ratings['userId'].to_numpy(), movie_rows, ratings['rating'].to_numpy())
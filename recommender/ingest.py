@@ -0,0 +1,195 @@
+"""Ingest rating secara streaming untuk data yang lebih besar dari memori.
+
+``ratings.csv`` dibaca per chunk. Setiap chunk langsung dipetakan ke indeks pengguna dan
+film, lalu disimpan sebagai triplet ringkas (int32, int32, float32). Agregat per pengguna
+dan per film diperbarui dengan ``np.bincount``. DataFrame rating utuh maupun gabungan
+dengan ``movies.csv`` tidak pernah dibuat, dan matriks CSR diisi langsung dari triplet per
+chunk, sehingga memori hanya sebanding dengan jumlah rating yang disimpan dalam matriks sparse.
+Jika satu pasangan (pengguna, film) dirating lebih dari sekali, hanya rating terakhir sesuai
+urutan ingest yang disimpan, baik di matriks maupun di agregat.
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from recommender.data import DATA_DIR
+from recommender.index import UserRatingIndex
+
+RATING_COLUMNS = {'userId': 'int32', 'movieId': 'int32', 'rating': 'float32'}
+
+
+def _grow(array, size):
+    if len(array) >= size:
+        return array
+    grown = np.zeros(max(size, 2 * len(array)), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+class IdMap:
+    # Pemetaan id asli -> indeks berurutan sesuai urutan kemunculan pertama (sama seperti .unique())
+    def __init__(self):
+        self.index = pd.Index([], dtype=np.int64)
+
+    def __len__(self):
+        return len(self.index)
+
+    @property
+    def ids(self):
+        return self.index.to_numpy()
+
+    def to_index(self, ids):
+        codes = self.index.get_indexer(ids)
+        new = codes < 0
+        if new.any():
+            self.index = self.index.append(pd.Index(pd.unique(ids[new]), dtype=np.int64))
+            codes[new] = self.index.get_indexer(ids[new])
+        return codes.astype(np.int32)
+
+
+class InteractionBuilder:
+    def __init__(self):
+        self.users = IdMap()
+        self.movies = IdMap()
+        self.rows, self.cols, self.values = [], [], []
+        self.n_ratings = 0
+
+        # Jumlah, total, dan total kuadrat rating per pengguna dan per film
+        self.user_count = np.zeros(0, dtype=np.int64)
+        self.user_sum = np.zeros(0, dtype=np.float64)
+        self.user_sq = np.zeros(0, dtype=np.float64)
+        self.movie_count = np.zeros(0, dtype=np.int64)
+        self.movie_sum = np.zeros(0, dtype=np.float64)
+        self.movie_sq = np.zeros(0, dtype=np.float64)
+
+    def add(self, user_ids, movie_ids, ratings):
+        rows = self.users.to_index(np.asarray(user_ids))
+        cols = self.movies.to_index(np.asarray(movie_ids))
+        values = np.asarray(ratings, dtype=np.float32)
+        n_users, n_movies = len(self.users), len(self.movies)
+
+        self.user_count = _grow(self.user_count, n_users)
+        self.user_sum = _grow(self.user_sum, n_users)
+        self.user_sq = _grow(self.user_sq, n_users)
+        self.movie_count = _grow(self.movie_count, n_movies)
+        self.movie_sum = _grow(self.movie_sum, n_movies)
+        self.movie_sq = _grow(self.movie_sq, n_movies)
+
+        squares = values.astype(np.float64) ** 2
+        self.user_count[:n_users] += np.bincount(rows, minlength=n_users)
+        self.user_sum[:n_users] += np.bincount(rows, weights=values, minlength=n_users)
+        self.user_sq[:n_users] += np.bincount(rows, weights=squares, minlength=n_users)
+        self.movie_count[:n_movies] += np.bincount(cols, minlength=n_movies)
+        self.movie_sum[:n_movies] += np.bincount(cols, weights=values, minlength=n_movies)
+        self.movie_sq[:n_movies] += np.bincount(cols, weights=squares, minlength=n_movies)
+
+        self.rows.append(rows)
+        self.cols.append(cols)
+        self.values.append(values)
+        self.n_ratings += len(values)
+
+    def _discard(self, rows, cols, values, n_users, n_movies):
+        squares = values.astype(np.float64) ** 2
+        self.user_count[:n_users] -= np.bincount(rows, minlength=n_users)
+        self.user_sum[:n_users] -= np.bincount(rows, weights=values, minlength=n_users)
+        self.user_sq[:n_users] -= np.bincount(rows, weights=squares, minlength=n_users)
+        self.movie_count[:n_movies] -= np.bincount(cols, minlength=n_movies)
+        self.movie_sum[:n_movies] -= np.bincount(cols, weights=values, minlength=n_movies)
+        self.movie_sq[:n_movies] -= np.bincount(cols, weights=squares, minlength=n_movies)
+
+    def build(self):
+        n_users, n_movies = len(self.users), len(self.movies)
+
+        # indptr langsung dari jumlah rating per pengguna; setiap chunk ditulis ke slotnya di array
+        # CSR lalu dilepas, sehingga tidak ada gabungan triplet maupun matriks COO perantara
+        indptr = np.zeros(n_users + 1, dtype=np.int64)
+        np.cumsum(self.user_count[:n_users], out=indptr[1:])
+        indices = np.empty(self.n_ratings, dtype=np.int32)
+        data = np.empty(self.n_ratings, dtype=np.float32)
+        fill = indptr[:-1].copy()
+        while self.rows:
+            rows, cols, values = self.rows.pop(0), self.cols.pop(0), self.values.pop(0)
+            order = np.argsort(rows, kind='stable')
+            rows = rows[order]
+            counts = np.bincount(rows, minlength=n_users)
+            starts = np.cumsum(counts) - counts
+            slots = fill[rows] + np.arange(len(rows)) - starts[rows]
+            indices[slots] = cols[order]
+            data[slots] = values[order]
+            fill += counts
+        self.cols, self.values = [], []
+
+        # Kolom per baris diurutkan; lexsort stabil menjaga urutan ingest di antara rating duplikat
+        # untuk pasangan (pengguna, film) yang sama, sehingga hanya rating terakhir yang dipertahankan
+        rows = np.repeat(np.arange(n_users, dtype=np.int32), np.diff(indptr))
+        order = np.lexsort((indices, rows))
+        rows, indices, data = rows[order], indices[order], data[order]
+        last = np.ones(len(rows), dtype=bool)
+        last[:-1] = (rows[1:] != rows[:-1]) | (indices[1:] != indices[:-1])
+        if not last.all():
+            # Rating yang tertimpa dikeluarkan juga dari agregat, sehingga count/mean/std sesuai matriks
+            self._discard(rows[~last], indices[~last], data[~last], n_users, n_movies)
+            rows, indices, data = rows[last], indices[last], data[last]
+            indptr[1:] = np.cumsum(np.bincount(rows, minlength=n_users))
+        self.n_ratings = len(data)
+
+        # Matriks pengguna x film dalam ruang indeks model (user_to_index, movie_to_index)
+        matrix = sp.csr_matrix((data, indices, indptr), shape=(n_users, n_movies))
+        return Interactions(
+            self.users.ids, self.movies.ids, matrix,
+            self.user_count[:n_users], self.user_sum[:n_users], self.user_sq[:n_users],
+            self.movie_count[:n_movies], self.movie_sum[:n_movies], self.movie_sq[:n_movies],
+        )
+
+
+class Interactions:
+    def __init__(self, user_ids, movie_ids, matrix, user_count, user_sum, user_sq,
+                 movie_count, movie_sum, movie_sq):
+        self.user_ids = user_ids
+        self.movie_ids = movie_ids
+        self.matrix = matrix
+        self.user_count, self.user_sum, self.user_sq = user_count, user_sum, user_sq
+        self.movie_count, self.movie_sum, self.movie_sq = movie_count, movie_sum, movie_sq
+
+    @property
+    def user_to_index(self):
+        return {user_id: i for i, user_id in enumerate(self.user_ids.tolist())}
+
+    @property
+    def movie_to_index(self):
+        return {movie_id: i for i, movie_id in enumerate(self.movie_ids.tolist())}
+
+    @staticmethod
+    def _stats(ids, count, total, sq, id_column):
+        with np.errstate(divide='ignore', invalid='ignore'):
+            mean = total / count
+            std = np.sqrt(np.maximum(sq / count - mean ** 2, 0))
+        return pd.DataFrame({id_column: ids, 'count': count, 'mean': mean, 'std': std})
+
+    def user_stats(self):
+        return self._stats(self.user_ids, self.user_count, self.user_sum, self.user_sq, 'userId')
+
+    def movie_stats(self):
+        return self._stats(self.movie_ids, self.movie_count, self.movie_sum, self.movie_sq, 'movieId')
+
+    def user_rating_index(self, movie_id_to_row=None):
+        # Tanpa movie_id_to_row, film direpresentasikan dengan indeks model (movie_to_index)
+        counts = np.diff(self.matrix.indptr)
+        items = self.matrix.indices
+        values = self.matrix.data
+        user_ids = np.repeat(self.user_ids, counts)
+        if movie_id_to_row is not None:
+            rows = movie_id_to_row.reindex(self.movie_ids).to_numpy()
+            known = ~np.isnan(rows)[items]
+            items, values, user_ids = rows[items[known]].astype(np.int32), values[known], user_ids[known]
+        return UserRatingIndex(user_ids, items, values)
+
+
+def ingest_ratings(path=None, chunksize=1_000_000):
+    path = path or os.path.join(DATA_DIR, 'ratings.csv')
+    builder = InteractionBuilder()
+    for chunk in pd.read_csv(path, usecols=list(RATING_COLUMNS), dtype=RATING_COLUMNS, chunksize=chunksize):
+        builder.add(chunk['userId'].to_numpy(), chunk['movieId'].to_numpy(), chunk['rating'].to_numpy())
+    return builder.build()
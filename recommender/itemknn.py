@@ -0,0 +1,169 @@
+"""Item-based collaborative filtering (item-kNN) atas matriks rating sparse.
+
+Similaritas antar film dihitung dari co-rating pengguna dengan perkalian matriks sparse per
+blok film: adjusted cosine (rating dikurangi rata-rata pengguna) atau Pearson (rating
+dikurangi rata-rata film) dengan shrinkage terhadap jumlah pengguna yang merating kedua
+film. Hanya k tetangga terdekat dengan similaritas positif per film yang disimpan, sehingga
+jumlah |similaritas| cukup dihitung dari matriks itu sendiri. Prediksi dan ranking memakai
+baseline rata-rata pengguna ditambah rata-rata tertimbang deviasi rating pada tetangga.
+"""
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from recommender.ranking import top_n_indices
+from recommender.similarity import select_topk
+
+
+def rating_matrix(user_index, n_movies):
+    # Matriks pengguna x film (posisi baris movies_df) langsung dari array CSR UserRatingIndex
+    return sp.csr_matrix((user_index.values.astype(np.float64), user_index.items, user_index.indptr),
+                         shape=(len(user_index), n_movies))
+
+
+def user_means(user_index):
+    counts = np.diff(user_index.indptr)
+    sums = np.bincount(np.repeat(np.arange(len(counts)), counts), weights=user_index.values, minlength=len(counts))
+    return np.divide(sums, counts, out=np.zeros(len(counts)), where=counts > 0)
+
+
+def build_item_similarity(user_index, n_movies, method='adjusted_cosine', k=50, shrinkage=100, block_size=512):
+    from sklearn.utils.extmath import safe_sparse_dot
+
+    matrix = rating_matrix(user_index, n_movies)
+    binary = matrix.copy()
+    binary.data[:] = 1.0
+
+    centered = matrix.copy()
+    if method == 'adjusted_cosine':
+        centered.data -= np.repeat(user_means(user_index), np.diff(matrix.indptr))
+    elif method == 'pearson':
+        item_count = np.asarray(binary.sum(axis=0)).ravel()
+        item_sum = np.asarray(matrix.sum(axis=0)).ravel()
+        item_mean = np.divide(item_sum, item_count, out=np.zeros(n_movies), where=item_count > 0)
+        centered.data -= item_mean[matrix.indices]
+    else:
+        raise ValueError(f"method tidak dikenal: {method}")
+
+    items = centered.T.tocsr()
+    items_binary = binary.T.tocsr()
+    squared = centered.multiply(centered).tocsr()
+    squared_items = squared.T.tocsr()
+    norms = np.sqrt(np.asarray(squared.sum(axis=0)).ravel())
+    k = min(k, n_movies - 1)
+
+    rows, cols, vals = [], [], []
+    for start in range(0, n_movies, block_size):
+        stop = min(start + block_size, n_movies)
+        dot = safe_sparse_dot(items[start:stop], centered, dense_output=True)
+
+        if method == 'pearson':
+            # Pearson hanya atas pengguna yang merating kedua film
+            left = safe_sparse_dot(squared_items[start:stop], binary, dense_output=True)
+            right = safe_sparse_dot(items_binary[start:stop], squared, dense_output=True)
+            denominator = np.sqrt(left * right)
+        else:
+            denominator = np.outer(norms[start:stop], norms)
+        block = np.divide(dot, denominator, out=np.zeros_like(dot), where=denominator > 0)
+
+        # Shrinkage: similaritas dari sedikit co-rating ditarik ke nol
+        if shrinkage:
+            support = safe_sparse_dot(items_binary[start:stop], binary, dense_output=True)
+            block *= support / (support + shrinkage)
+
+        # Film tidak menjadi tetangga dirinya sendiri; select_topk hanya menyimpan similaritas positif
+        local = np.arange(stop - start)
+        block[local, start + local] = 0
+        block_rows, block_cols, block_vals = select_topk(block.astype(np.float32), start, k)
+        rows.append(block_rows)
+        cols.append(block_cols)
+        vals.append(block_vals)
+
+    return sp.csr_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                         shape=(n_movies, n_movies))
+
+
+def _user_scores(user_id, user_index, item_sim):
+    rated_rows, ratings = user_index.get(user_id)
+    n_movies = item_sim.shape[0]
+    mean = ratings.mean() if len(ratings) else 0.0
+
+    # Vektor deviasi rating pengguna dan indikator film yang dirating
+    deviation = np.zeros(n_movies)
+    deviation[rated_rows] = ratings - mean
+    rated = np.zeros(n_movies)
+    rated[rated_rows] = 1.0
+
+    # (S @ d)[i] = jumlah similaritas x deviasi atas tetangga film i yang sudah dirating pengguna
+    numerator = item_sim @ deviation
+    # Similaritas yang disimpan selalu positif, sehingga item_sim sudah sama dengan |item_sim|
+    support = item_sim @ rated
+    return rated_rows, ratings, mean, numerator, support
+
+
+def recommend_for_user_knn(user_id, movies, user_index, item_sim, top_n=10, movie_titles=None, movie_genres=None,
+                           explain=False):
+    movie_titles = movies['title'].to_numpy() if movie_titles is None else movie_titles
+    movie_genres = movies['genres'].to_numpy() if movie_genres is None else movie_genres
+
+    rated_rows, ratings, mean, numerator, support = _user_scores(user_id, user_index, item_sim)
+    if len(rated_rows) == 0:
+        print("User belum memiliki rating cukup untuk rekomendasi.")
+        return pd.DataFrame()
+
+    # Skor ranking: bukti dari tetangga yang dirating di atas rata-rata pengguna
+    watched = np.zeros(len(numerator), dtype=bool)
+    watched[rated_rows] = True
+    top = top_n_indices(numerator, top_n, exclude=watched | (numerator <= 0))
+
+    # Kolom sama dengan recommend_for_user; Similarity berisi skor ranking item-kNN
+    result = pd.DataFrame({
+        'Title': movie_titles[top],
+        'Genres': movie_genres[top],
+        'Similarity': np.round(numerator[top].astype(np.float64), 3),
+    })
+    if explain:
+        # Penjelasan: film yang sudah dirating dengan kontribusi terbesar pada setiap rekomendasi
+        contributions = item_sim[top][:, rated_rows].toarray() * (ratings - mean)
+        because = rated_rows[np.argmax(contributions, axis=1)] if len(top) else rated_rows[:0]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result['Predicted Rating'] = np.round(mean + numerator[top] / support[top], 2)
+        result['Because You Rated'] = movie_titles[because]
+    return result
+
+
+def predict_ratings_knn(user_ids, movie_rows, user_index, item_sim, batch_size=256):
+    # Prediksi untuk banyak pasangan (pengguna, baris film) sekaligus, dikelompokkan per pengguna
+    user_ids = np.asarray(user_ids)
+    movie_rows = np.asarray(movie_rows, dtype=np.float64)
+    test_users, codes = np.unique(user_ids, return_inverse=True)
+
+    rows, cols, values = user_index.gather(test_users)
+    counts = np.bincount(rows, minlength=len(test_users))
+    sums = np.bincount(rows, weights=values, minlength=len(test_users))
+    means = np.divide(sums, counts, out=np.full(len(test_users), np.nan), where=counts > 0)
+
+    shape = (len(test_users), item_sim.shape[0])
+    deviation = sp.csr_matrix((values - means[rows], (rows, cols)), shape=shape)
+    rated = sp.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=shape)
+    sim_t = item_sim.T.tocsr()
+
+    predictions = np.full(len(user_ids), np.nan)
+    order = np.argsort(codes, kind='stable')
+    sorted_codes = codes[order]
+    for start in range(0, len(test_users), batch_size):
+        stop = min(start + batch_size, len(test_users))
+        lo, hi = np.searchsorted(sorted_codes, [start, stop])
+        batch = order[lo:hi]
+        batch = batch[~np.isnan(movie_rows[batch])]
+
+        local_users = codes[batch] - start
+        local_movies = movie_rows[batch].astype(np.int64)
+        numerator = np.asarray((deviation[start:stop] @ sim_t)[local_users, local_movies]).ravel()
+        support = np.asarray((rated[start:stop] @ sim_t)[local_users, local_movies]).ravel()
+
+        # Tanpa tetangga yang dirating, prediksi kembali ke rata-rata pengguna
+        with np.errstate(divide='ignore', invalid='ignore'):
+            offset = np.where(support > 0, numerator / support, 0.0)
+        predictions[batch] = means[codes[batch]] + offset
+    return predictions
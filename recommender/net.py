@@ -0,0 +1,20 @@
+"""Model RecommenderNet (TensorFlow Keras).
+
+Modul ini mengimpor TensorFlow saat di-import, sehingga hanya dimuat oleh jalur
+pelatihan; jalur serving cukup memakai embedding yang sudah diekstrak.
+"""
+import tensorflow as tf
+
+
+# Membangun Model RecommenderNet
+class RecommenderNet(tf.keras.Model):
+    def __init__(self, num_users, num_movies, embedding_size=50, **kwargs):
+        super(RecommenderNet, self).__init__(**kwargs)
+        self.user_embedding = tf.keras.layers.Embedding(num_users, embedding_size)
+        self.movie_embedding = tf.keras.layers.Embedding(num_movies, embedding_size)
+        self.dot = tf.keras.layers.Dot(axes=1)
+
+    def call(self, inputs):
+        user_vector = self.user_embedding(inputs[:, 0])
+        movie_vector = self.movie_embedding(inputs[:, 1])
+        return self.dot([user_vector, movie_vector])
@@ -0,0 +1,165 @@
+"""Pembaruan inkremental (fold-in) tanpa melatih ulang model.
+
+Saat rating baru masuk, hanya embedding pengguna (atau film baru) yang bersangkutan yang
+dihitung ulang dengan least squares terhadap embedding sisi lain yang tetap, persis satu
+langkah ALS untuk satu baris. Pengguna dan film yang belum pernah terlihat ditambahkan ke
+``user_to_index``/``movie_to_index``. Profil konten pengguna disimpan sebagai total
+similaritas eksak terhadap seluruh film beserta jumlah film yang disukai, sehingga rating
+baru cukup menambahkan atau mengurangi satu perkalian ``Xn @ Xn[film]`` tanpa menghitung
+ulang seluruh profil. Bila diberi ``RecommendationCache``, setiap rating
+baru menghapus hasil rekomendasi pengguna tersebut dari cache.
+"""
+import numpy as np
+
+from recommender.ranking import top_n_indices
+
+
+def extend_index(id_to_index, ids, new_id):
+    # Mengembalikan indeks id yang sudah ada, atau menambahkan id baru di akhir
+    idx = id_to_index.get(new_id)
+    if idx is None:
+        idx = len(ids)
+        id_to_index[new_id] = idx
+        ids.append(new_id)
+    return idx
+
+
+def _merge_ratings(items, values, new_items, new_values):
+    # Rating baru menggantikan rating lama untuk film yang sama
+    items = np.concatenate([items, np.asarray(new_items, dtype=np.int32)])
+    values = np.concatenate([values, np.asarray(new_values, dtype=np.float32)])
+    _, last = np.unique(items[::-1], return_index=True)
+    keep = np.sort(len(items) - 1 - last)
+    return items[keep], values[keep]
+
+
+class OnlineCollaborative:
+    # model adalah ALSModel; embedding RecommenderNet dapat dibungkus sebagai ALSModel(user_emb, movie_emb)
+    def __init__(self, model, user_ids, movie_ids, rated_index=None, cache=None):
+        self.model = model
+        self.cache = cache
+        self.user_ids = list(user_ids)
+        self.movie_ids = list(movie_ids)
+        self.user_to_index = {user_id: i for i, user_id in enumerate(self.user_ids)}
+        self.movie_to_index = {movie_id: i for i, movie_id in enumerate(self.movie_ids)}
+        # rated_index: UserRatingIndex dengan film sebagai indeks model (movie_to_index)
+        self.rated_index = rated_index
+        self.n_base_movies = len(self.movie_ids)
+        self.user_ratings = {}
+        self.movie_ratings = {}
+
+    def get(self, user_id):
+        # Antarmuka yang sama dengan UserRatingIndex.get, termasuk rating yang masuk setelah pelatihan
+        items = np.zeros(0, dtype=np.int32)
+        values = np.zeros(0, dtype=np.float32)
+        if self.rated_index is not None:
+            items, values = self.rated_index.get(user_id)
+        new = self.user_ratings.get(user_id)
+        if new is None:
+            return items, values
+        return _merge_ratings(items, values, *new)
+
+    def _user_index(self, user_id):
+        n_users = len(self.user_ids)
+        idx = extend_index(self.user_to_index, self.user_ids, user_id)
+        if idx == n_users:
+            self.model.add_users()
+        return idx
+
+    def _movie_index(self, movie_id):
+        n_movies = len(self.movie_ids)
+        idx = extend_index(self.movie_to_index, self.movie_ids, movie_id)
+        if idx == n_movies:
+            self.model.add_items()
+        return idx
+
+    def add_rating(self, user_id, movie_id, rating):
+        user_idx = self._user_index(user_id)
+        movie_idx = self._movie_index(movie_id)
+
+        items, values = self.user_ratings.setdefault(user_id, ([], []))
+        items.append(movie_idx)
+        values.append(rating)
+
+        # Embedding pengguna dihitung ulang dari seluruh ratingnya terhadap embedding film yang tetap
+        self.model.fold_in_user(user_idx, *self.get(user_id))
+
+        # Film yang belum ada saat pelatihan dihitung dari rating yang diterimanya sejauh ini
+        if movie_idx >= self.n_base_movies:
+            raters = self.movie_ratings.setdefault(movie_idx, {})
+            raters[user_idx] = rating
+            self.model.fold_in_item(movie_idx, list(raters), list(raters.values()))
+
+        # Hasil rekomendasi lama pengguna ini tidak berlaku lagi
+        if self.cache is not None:
+            self.cache.invalidate_user(user_id)
+        return user_idx
+
+    @property
+    def user_embeddings(self):
+        return self.model.user_embeddings
+
+    @property
+    def movie_embeddings(self):
+        return self.model.movie_embeddings
+
+
+class ContentProfiles:
+    def __init__(self, features, user_index, like_threshold=3.5, cache=None):
+        # features: matriks fitur film yang sudah dinormalisasi L2 (similarity.normalize_features)
+        self.features = features.tocsr()
+        self.user_index = user_index
+        self.like_threshold = like_threshold
+        self.cache = cache
+        self.profiles = {}
+
+    def _profile(self, user_id):
+        profile = self.profiles.get(user_id)
+        if profile is None:
+            # Dibangun sekali dari indeks rating; selanjutnya hanya diperbarui secara inkremental
+            rows, ratings = self.user_index.get(user_id)
+            liked = rows[ratings >= self.like_threshold]
+            total = self._similarities(self.features[liked].sum(axis=0))
+            profile = {
+                'total': total,
+                'liked': set(liked.tolist()),
+                'watched': set(rows.tolist()),
+            }
+            self.profiles[user_id] = profile
+        return profile
+
+    def _similarities(self, vector):
+        # Cosine eksak seluruh film terhadap vektor fitur (atau jumlah vektor fitur) film yang disukai
+        return np.asarray(self.features @ np.asarray(vector, dtype=np.float64).ravel()).ravel()
+
+    def add_rating(self, user_id, movie_row, rating):
+        profile = self._profile(user_id)
+        profile['watched'].add(movie_row)
+
+        # Total diperbarui dengan similaritas film ini terhadap seluruh film: O(nnz fitur) per rating
+        if rating >= self.like_threshold and movie_row not in profile['liked']:
+            profile['liked'].add(movie_row)
+            profile['total'] += self._similarities(self.features[movie_row].toarray())
+        elif rating < self.like_threshold and movie_row in profile['liked']:
+            profile['liked'].remove(movie_row)
+            profile['total'] -= self._similarities(self.features[movie_row].toarray())
+
+        if self.cache is not None:
+            self.cache.invalidate_user(user_id)
+
+    def scores(self, user_id):
+        # Rata-rata similaritas terhadap film yang disukai, sama dengan recommend_for_user
+        profile = self._profile(user_id)
+        if not profile['liked']:
+            return np.zeros_like(profile['total'])
+        return profile['total'] / len(profile['liked'])
+
+    def recommend(self, user_id, top_n=10):
+        profile = self._profile(user_id)
+        if not profile['liked']:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        scores = self.scores(user_id)
+        watched = np.zeros(len(scores), dtype=bool)
+        watched[list(profile['watched'])] = True
+        top = top_n_indices(scores, top_n, exclude=watched)
+        return top, scores[top]
@@ -0,0 +1,54 @@
+"""Seleksi top-N berbasis argpartition dan normalisasi skor yang dipakai oleh semua recommender."""
+import numpy as np
+
+
+def top_n_indices(scores, top_n, exclude=None, ids=None):
+    scores = np.asarray(scores, dtype=np.float32)
+    if exclude is not None:
+        scores = np.where(exclude, -np.inf, scores)
+
+    top_n = min(top_n, scores.size)
+    if top_n <= 0:
+        return np.empty(0, dtype=np.int64)
+
+    # partition mencari skor ke-N dalam O(n); semua kandidat dengan skor >= skor tersebut (termasuk
+    # yang seri) diurutkan berdasarkan skor lalu id terkecil, sehingga hasil tidak bergantung pada
+    # urutan masukan. Tanpa ids, posisi dalam scores dipakai sebagai id
+    kth = np.partition(-scores, top_n - 1)[top_n - 1]
+    top = np.flatnonzero(-scores <= kth) if np.isfinite(kth) else np.flatnonzero(np.isfinite(scores))
+    tie_ids = top if ids is None else np.asarray(ids)[top]
+    top = top[np.lexsort((tie_ids, -scores[top]))[:top_n]]
+
+    # Kandidat yang dikecualikan tidak ikut dikembalikan
+    return top[np.isfinite(scores[top])]
+
+
+def top_n_rows(scores, top_n):
+    # Versi per baris dari top_n_indices untuk matriks skor (pengguna x item). Kolom yang seri dengan
+    # skor ke-N diambil mulai dari indeks terkecil, lalu hasil diurutkan berdasarkan skor dan kolom,
+    # sehingga setiap baris sama dengan top_n_indices pada baris tersebut. Kolom dengan skor -inf
+    # tetap dikembalikan sebagai pengisi dan perlu disaring oleh pemanggil
+    scores = np.asarray(scores, dtype=np.float32)
+    kth = -np.partition(-scores, top_n - 1, axis=1)[:, top_n - 1:top_n]
+    above = scores > kth
+    ties = scores == kth
+    needed = top_n - above.sum(axis=1, keepdims=True)
+    keep = above | (ties & (np.cumsum(ties, axis=1, dtype=np.int32) <= needed))
+    top = np.nonzero(keep)[1].reshape(len(scores), top_n)
+    top_scores = np.take_along_axis(scores, top, axis=1)
+
+    # nonzero menghasilkan kolom terurut naik, sehingga argsort stabil memutus seri dengan kolom terkecil
+    order = np.argsort(-top_scores, axis=1, kind='stable')
+    return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+
+def normalize_scores(scores, exclude=None):
+    # Min-max ke [0, 1] agar skor dari model berbeda dapat dijumlahkan dengan bobot
+    scores = np.asarray(scores, dtype=np.float32)
+    valid = np.isfinite(scores) if exclude is None else np.isfinite(scores) & ~exclude
+    if not valid.any():
+        return np.zeros_like(scores)
+    low, high = scores[valid].min(), scores[valid].max()
+    if high == low:
+        return np.where(valid, 1.0, 0.0).astype(np.float32)
+    return np.where(valid, (scores - low) / (high - low), 0.0).astype(np.float32)
@@ -0,0 +1,183 @@
+"""Indeks similaritas kosinus top-k antar film dan daftar tetangga terurut per film.
+
+Similaritas dihitung per blok baris. Dengan ``n_jobs > 1``, blok dibagi ke process pool;
+matriks fitur dibagikan lewat shared memory dan setiap worker langsung mereduksi bloknya
+menjadi top-k, sehingga memori puncak worker dibatasi oleh ``block_size x n_items``.
+Worker dimulai dengan metode spawn yang mengimpor ulang modul ``__main__``, sehingga skrip
+yang memanggil ``build_topk_similarity`` dengan ``n_jobs != 1`` wajib membungkus pemanggilan
+tersebut dengan ``if __name__ == "__main__":``.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def normalize_features(feature_matrix):
+    from sklearn.preprocessing import normalize
+
+    # Setelah normalisasi L2, cosine similarity cukup berupa perkalian titik
+    return normalize(sp.csr_matrix(feature_matrix, dtype=np.float32), norm='l2', copy=True).tocsr()
+
+
+def select_topk(block, start, k):
+    # block berisi similaritas baris start..start+len(block) terhadap seluruh film
+    local = np.arange(len(block))
+
+    # Similaritas film dengan dirinya sendiri disimpan terpisah agar tidak memakan slot tetangga
+    self_sim = block[local, start + local].copy()
+    block[local, start + local] = -np.inf
+
+    # Skor ke-k per baris tanpa mengurutkan seluruh baris. Semua kolom dengan skor lebih besar diambil,
+    # sisanya diisi dari kolom yang seri dengan skor ke-k mulai dari indeks terkecil, sehingga tetangga
+    # yang tersimpan tidak bergantung pada urutan internal argpartition (TF-IDF genre memiliki ribuan
+    # similaritas 1.0 yang seri)
+    kth = -np.partition(-block, k - 1, axis=1)[:, k - 1:k]
+    above = block > kth
+    ties = block == kth
+    needed = k - above.sum(axis=1, keepdims=True)
+    keep = above | (ties & (np.cumsum(ties, axis=1, dtype=np.int32) <= needed))
+    top = np.nonzero(keep)[1].reshape(len(block), k)
+    top_scores = np.take_along_axis(block, top, axis=1)
+
+    rows = np.concatenate([np.repeat(start + local, k), start + local])
+    cols = np.concatenate([top.ravel(), start + local])
+    vals = np.concatenate([top_scores.ravel(), self_sim]).astype(np.float32)
+
+    # Hanya similaritas positif yang disimpan, sehingga yang dikembalikan sebanding dengan block_size x k
+    keep = vals > 0
+    return rows[keep].astype(np.int32), cols[keep].astype(np.int32), vals[keep]
+
+
+def _topk_block(normalized, start, stop, k):
+    from sklearn.utils.extmath import safe_sparse_dot
+
+    # Similaritas satu blok film terhadap seluruh film (block_size x n_items), langsung sebagai array padat
+    block = safe_sparse_dot(normalized[start:stop], normalized.T, dense_output=True)
+    return select_topk(block, start, k)
+
+
+# State worker: matriks fitur yang dibaca langsung dari shared memory milik proses induk
+_worker = {}
+
+
+def _share(array):
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _attach(specs, shape, k):
+    arrays = []
+    for name, array_shape, dtype in specs:
+        # Worker spawn memakai resource tracker proses induk, sehingga segmen tetap dihapus sekali oleh induk
+        shm = shared_memory.SharedMemory(name=name)
+        _worker.setdefault('segments', []).append(shm)
+        arrays.append(np.ndarray(array_shape, dtype=dtype, buffer=shm.buf))
+    data, indices, indptr = arrays
+    _worker['matrix'] = sp.csr_matrix((data, indices, indptr), shape=shape, copy=False)
+    _worker['k'] = k
+
+
+def _worker_block(start, stop):
+    return _topk_block(_worker['matrix'], start, stop, _worker['k'])
+
+
+def _parallel_blocks(normalized, bounds, k, n_jobs):
+    segments, specs = [], []
+    try:
+        for array in (normalized.data, normalized.indices, normalized.indptr):
+            shm, spec = _share(array)
+            segments.append(shm)
+            specs.append(spec)
+
+        # spawn: worker tidak mewarisi thread proses induk (misalnya TensorFlow) dan membaca input
+        # hanya dari shared memory, bukan salinan hasil fork
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=n_jobs, mp_context=context, initializer=_attach,
+                                 initargs=(specs, normalized.shape, k)) as executor:
+            futures = [executor.submit(_worker_block, start, stop) for start, stop in bounds]
+            return [future.result() for future in futures]
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+
+# Membangun indeks similaritas top-k secara bertahap per blok baris
+def build_topk_similarity(feature_matrix, k=100, block_size=512, n_jobs=1):
+    normalized = normalize_features(feature_matrix)
+    n_items = normalized.shape[0]
+    k = min(k, n_items - 1)
+    bounds = [(start, min(start + block_size, n_items)) for start in range(0, n_items, block_size)]
+
+    # n_jobs > 1 membagi blok ke beberapa proses; -1 memakai semua core. Worker spawn mengimpor
+    # ulang __main__, jadi skrip pemanggil dengan n_jobs != 1 perlu guard if __name__ == "__main__"
+    if n_jobs == -1:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs > 1 and len(bounds) > 1:
+        parts = _parallel_blocks(normalized, bounds, k, min(n_jobs, len(bounds)))
+    else:
+        parts = [_topk_block(normalized, start, stop, k) for start, stop in bounds]
+
+    rows = np.concatenate([part[0] for part in parts])
+    cols = np.concatenate([part[1] for part in parts])
+    vals = np.concatenate([part[2] for part in parts])
+    return sp.csr_matrix((vals, (rows, cols)), shape=(n_items, n_items))
+
+
+class NeighborTable:
+    # Daftar k tetangga terurut per film dalam array ringkas int32/float32, diisi saat pertama diminta
+    # atau sekaligus dengan warm(). Urutan sama dengan top_n_indices: skor menurun, lalu id film terkecil
+    def __init__(self, similarity, k=50):
+        self.similarity = sp.csr_matrix(similarity)
+        n_items = self.similarity.shape[0]
+        self.k = k
+        self.indices = np.full((n_items, k), -1, dtype=np.int32)
+        self.scores = np.zeros((n_items, k), dtype=np.float32)
+        self.filled = np.zeros(n_items, dtype=bool)
+
+    def _fill(self, rows):
+        block = self.similarity[rows]
+        counts = np.diff(block.indptr)
+        width = max(int(counts.max()), 1)
+
+        # Baris CSR dipadatkan menjadi matriks (len(rows) x width) agar dapat diurutkan sekaligus
+        local = np.repeat(np.arange(len(rows)), counts)
+        position = np.arange(block.nnz) - np.repeat(block.indptr[:-1], counts)
+        cols = np.full((len(rows), width), -1, dtype=np.int64)
+        vals = np.full((len(rows), width), -np.inf, dtype=np.float32)
+        cols[local, position] = block.indices
+        vals[local, position] = block.data
+
+        # Film itu sendiri tidak termasuk tetangga
+        vals[cols == rows[:, None]] = -np.inf
+
+        k = min(self.k, width)
+        order = np.lexsort((cols, -vals), axis=1)[:, :k]
+        top_cols = np.take_along_axis(cols, order, axis=1)
+        top_vals = np.take_along_axis(vals, order, axis=1)
+        valid = np.isfinite(top_vals)
+
+        self.indices[rows, :k] = np.where(valid, top_cols, -1)
+        self.scores[rows, :k] = np.where(valid, top_vals, 0)
+        self.filled[rows] = True
+
+    def warm(self, rows=None, block_size=4096):
+        # Mengisi daftar tetangga di awal (misalnya saat startup) untuk semua film atau film populer
+        rows = np.arange(len(self.filled)) if rows is None else np.asarray(rows, dtype=np.int64)
+        rows = np.unique(rows[~self.filled[rows]])
+        for start in range(0, len(rows), block_size):
+            self._fill(rows[start:start + block_size])
+        return self
+
+    def get(self, row):
+        # Mengembalikan (indeks film, similarity) tetangga yang sudah terurut dari yang paling mirip
+        if not self.filled[row]:
+            self._fill(np.array([row], dtype=np.int64))
+        indices = self.indices[row]
+        n_valid = np.count_nonzero(indices >= 0)
+        return indices[:n_valid], self.scores[row, :n_valid]